@@ -1,4 +1,9 @@
+import ast
+import copy
+import json
+import re
 import time
+from functools import lru_cache
 from typing import Optional
 import datetime
 
@@ -38,6 +43,16 @@ OPTIONAL_RETURN_ADDRESS_FIELDS = {
     'country',
 }
 
+FIXED_COUNTRY = {
+    # US fixes
+    'USA': 'US', 'UNITED STATES': 'US', 'UNITED STATES OF AMERICA': 'US', 'THE UNITED STATES OF AMERICA': 'US', 'AMERICA': 'US',
+    # GB fixes
+    'ENGLAND': 'GB',
+}
+
+# Shipping address fields identifying a recipient when detecting duplicate sends
+RECIPIENT_FIELDS = ('first_name', 'last_name', 'organization', 'address_line_1', 'address_line_2', 'city', 'state', 'postal_code', 'third_party_contact_id')
+
 def current_timestamp() -> int:
     return int(time.time() * 1000)
 
@@ -51,6 +66,33 @@ def to_datetime(datetime_str: Optional[str]) -> Optional[datetime.datetime]:
     if datetime_str is None:
         return None
 
+    iso_str = _normalize_datetime(datetime_str)
+    if iso_str is not None:
+        try:
+            return datetime.datetime.fromisoformat(iso_str)
+        except ValueError:
+            pass
+    return _strptime_datetime(datetime_str)
+
+def _normalize_datetime(datetime_str: str) -> Optional[str]:
+    # Rewrites the layouts AMcards emits, "YYYY-MM-DD" then "T", " " or nothing then "HH:MM:SS" and an optional
+    # fraction, as "YYYY-MM-DDTHH:MM:SS.ffffff" for fromisoformat. Anything else is left to strptime.
+    if len(datetime_str) < 18 or datetime_str[4] != '-' or datetime_str[7] != '-' or not datetime_str.isascii():
+        return None
+    date, time_ = datetime_str[:10], datetime_str[10:]
+    if time_[0] in 'T ':
+        time_ = time_[1:]
+    time_, dot, fraction = time_.partition('.')
+    if len(time_) != 8 or time_[2] != ':' or time_[5] != ':':
+        return None
+    if not dot:
+        return f'{date}T{time_}'
+    if not 1 <= len(fraction) <= 6 or not fraction.isdigit():
+        return None
+    # strptime's %f pads the fraction on the right, fromisoformat before 3.11 only accepts 3 or 6 digits
+    return f'{date}T{time_}.{fraction.ljust(6, "0")}'
+
+def _strptime_datetime(datetime_str: str) -> datetime.datetime:
     if 'T' in datetime_str:
         if '.' in datetime_str:
             return datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S.%f')
@@ -108,6 +150,39 @@ def sanitize_extra_data(extra_data: dict) -> Optional[dict]:
     if not isinstance(extra_data, dict): return None
     return {k: v for k, v in extra_data.items() if isinstance(k, str) and isinstance(v, str)}
 
+# Python repr of a dict of str to str, strings with escapes are left to ast.literal_eval
+_REPR_STR = r"""(?:'[^'\\\n]*'|"[^"\\\n]*")"""
+_REPR_PAIR = rf'({_REPR_STR})\s*:\s*({_REPR_STR})'
+_REPR_STR_DICT = re.compile(rf'\{{\s*(?:{_REPR_PAIR}(?:\s*,\s*{_REPR_PAIR})*\s*,?)?\s*\}}')
+_REPR_STR_PAIR = re.compile(_REPR_PAIR)
+# JSON strings without escapes, and the JSON names ast.literal_eval rejects
+_JSON_STR = re.compile(r'"[^"]*"')
+_JSON_NAME = re.compile(r'true|false|null|NaN|Infinity')
+
+def parse_extra_data(extra_data: Optional[str]) -> dict:
+    if not extra_data: return {}
+    parsed, flat = _parse_extra_data(extra_data)
+    # Copy so callers mutating a card's extra_data do not change the cached value, nested values are copied too
+    return parsed.copy() if flat else copy.deepcopy(parsed)
+
+@lru_cache(maxsize=4096)
+def _parse_extra_data(extra_data: str) -> tuple:
+    # Accepts exactly what ast.literal_eval accepts. AMcards returns extra_data either as JSON or as the Python
+    # repr of a dict, JSON with escapes or names Python does not have is left to ast.literal_eval
+    parsed = None
+    if extra_data[0] == '{':
+        if '\\' not in extra_data and not (_JSON_NAME.search(extra_data) and _JSON_NAME.search(_JSON_STR.sub('', extra_data))):
+            try:
+                parsed = json.loads(extra_data)
+            except ValueError:
+                pass
+        if not isinstance(parsed, dict) and _REPR_STR_DICT.fullmatch(extra_data):
+            parsed = {key[1:-1]: value[1:-1] for key, value in _REPR_STR_PAIR.findall(extra_data)}
+    if not isinstance(parsed, dict):
+        parsed = ast.literal_eval(extra_data)
+    flat = isinstance(parsed, dict) and all(isinstance(value, (str, int, float, type(None))) for value in parsed.values())
+    return parsed, flat
+
 def sanitize_shipping_address_for_card_send(shipping_address: dict) -> dict:
     sanitized_shipping_address = {field: shipping_address[field] for field in REQUIRED_SHIPPING_ADDRESS_FIELDS}
     for optional in CARD_OPTIONAL_SHIPPING_ADDRESS_FIELDS:
@@ -129,10 +204,35 @@ def sanitize_return_address(return_address: dict) -> dict:
         sanitized_return_address[optional] = return_address[optional]
     return sanitized_return_address
 
+def fix_country(country: str) -> str:
+    if not isinstance(country, str): return ''
+    country = country.upper()
+    return FIXED_COUNTRY.get(country, country)
+
+def normalize_recipient(shipping_address: dict) -> dict:
+    recipient = {field: ' '.join(str(shipping_address.get(field) or '').split()).lower() for field in RECIPIENT_FIELDS}
+    recipient['country'] = fix_country(shipping_address.get('country'))
+    return recipient
+
 def repr(cls):
     props = [(prop, getattr(cls, prop)) for prop in dir(cls) if not prop.startswith('_')]
     return '(' + ', '.join([f'{k}={v}' for k, v in props]) + ')'
 
+def lazy_model(cls, json: dict):
+    # A model whose fields are decoded from json on first access, see hydrate
+    model = cls.__new__(cls)
+    model._json = json
+    return model
+
+def hydrate(model, name: str, decoders: dict):
+    decode = decoders.get(name[1:]) if name.startswith('_') else None
+    json = model._json if decode is not None else None
+    if json is None:
+        raise AttributeError(f"'{type(model).__name__}' object has no attribute '{name}'")
+    value = decode(json)
+    setattr(model, name, value)
+    return value
+
 def parse_shipping_address(json: dict) -> dict:
     shipping_address = {}
     for key, value in json.items():
@@ -1 +1,5 @@
-from .amcards import AMcardsClient
\ No newline at end of file
+from .amcards import AMcardsClient
+from .aio import AsyncAMcardsClient
+from .transport import Transport, AsyncTransport
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter, TokenBucket, FileTokenBucket
@@ -0,0 +1,789 @@
+import asyncio
+import time
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import List, Optional, Callable, Any, AsyncIterator, Awaitable, Iterable, Iterator, TextIO, Tuple
+
+
+from .transport import AsyncTransport, shared_async_transport
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .cache import ResponseCache
+from .contacts import ContactIndex
+from .dedupe import DuplicateIndex
+from .export import Column, Columns, CARD_COLUMNS, CONTACT_COLUMNS, write_csv
+from .models import User, Template, Campaign, CardResponse, CardsResponse, CampaignResponse, Card, Contact, Mailing, CreditTransaction, BatchCost, ChunkedCardsResponse, ContactImportResult, ContactImportStatus, CardSendResult
+from . import exceptions
+from . import __helpers as helpers
+from .amcards import (
+    DOMAIN,
+    _listing_params,
+    _count_params,
+    _build_contact_body,
+    _prepare_contact_import,
+    _earlier_contact_attempts,
+    _add_contact_attempt,
+    _any_contact_created,
+    _validate_shipping_address,
+    _validate_send_date,
+    _prefix_return_address,
+    _prepare_card_cost,
+    _card_cost,
+    _build_card_send_body,
+    _build_card_stream_body,
+    _reserve_send,
+    _release_send,
+    _build_campaign_cost_body,
+    _build_campaign_cost_bodies,
+    _build_campaign_send_body,
+    _build_cards_send_body,
+    _chunk_cards_send_body,
+    _chunk_idempotency_key,
+    _chunked_cards_response,
+    _coalescing_key,
+    _export_writer,
+    _token_refresh_payload,
+    _handle_user_response,
+    _handle_objects_response,
+    _handle_listing_response,
+    _handle_contacts_response,
+    _handle_count_response,
+    _handle_detail_response,
+    _handle_create_contact_response,
+    _handle_delete_contact_response,
+    _handle_card_send_response,
+    _handle_campaign_cost_response,
+    _handle_campaign_send_response,
+    _handle_cards_send_response,
+    _handle_token_refresh_response,
+    _raise_for_transient_status,
+)
+
+
+class AsyncAMcardsClient:
+    """Asyncio client for AMcards API.
+
+    Every method mirrors the :py:class:`AMcardsClient <amcards.amcards.AMcardsClient>` method of the same name, takes the same arguments, returns the same :py:mod:`models <amcards.models>` and raises the same :py:mod:`exceptions <amcards.exceptions>`.
+
+        .. code-block::
+
+            >>> import asyncio
+            >>> from amcards import AsyncAMcardsClient
+            >>> async def main():
+            ...     client = AsyncAMcardsClient('youraccesstoken', max_concurrency=200)
+            ...     return await asyncio.gather(*(client.card(id) for id in (1522873, 1522874)))
+            >>> asyncio.run(main())
+    """
+    def __init__(
+        self,
+        access_token: str,
+        oauth_config: Optional[dict] = None,
+        callback: Optional[Callable[[str, str, int], Any]] = None,
+        domain: str = DOMAIN,
+        transport: Optional[AsyncTransport] = None,
+        max_concurrency: Optional[int] = None,
+        user_cache_ttl: float = 300.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        refresh_margin: float = 60.0,
+        lazy_models: bool = False,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        duplicate_index: Optional[DuplicateIndex] = None,
+    ) -> None:
+        """Asyncio client for AMcards API.
+
+        :param str access_token: Your AMcards access token. Generate one `here <https://amcards.com/user/generate-access-token/>`_.
+        :param Optional[dict] oauth_config: Your OAuth configuration, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`.
+        :param Optional[Callable[[str, str, int], Any]] callback: Called after the client refreshes the ``access_token``, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`.
+        :param str domain: Defaults to ``"https://amcards.com"``. Scheme and host the client sends its requests to.
+        :param Optional[AsyncTransport] transport: Defaults to ``None``. The :py:class:`async transport <amcards.transport.AsyncTransport>` used to send requests. If not specified, the client uses the transport shared by all async clients with the same ``domain`` on the running event loop.
+        :param Optional[int] max_concurrency: Defaults to ``None``. Max number of requests this client has in flight at once. ``None`` leaves only the transport's connection limit in place.
+        :param float user_cache_ttl: Defaults to ``300.0``. Seconds the client's :py:class:`user <amcards.models.User>` is cached for by :py:meth:`cached_user` and :py:meth:`send_card_cost`. ``0`` disables caching.
+        :param Optional[RetryPolicy] retry_policy: Defaults to ``None``. The :py:class:`retry policy <amcards.retry.RetryPolicy>` for transient failures, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. Backoffs are awaited without holding a ``max_concurrency`` slot.
+        :param Optional[RateLimiter] rate_limiter: Defaults to ``None``. The :py:class:`rate limiter <amcards.ratelimit.RateLimiter>` every request awaits before it is sent, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. Tokens are awaited without holding a ``max_concurrency`` slot.
+        :param float refresh_margin: Defaults to ``60.0``. Seconds before the ``expiration`` in ``oauth_config`` the client starts refreshing the ``access_token``, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. Only one refresh runs at a time, however many tasks share the client.
+        :param bool lazy_models: Defaults to ``False``. If True, listed cards and contacts decode each field the first time it is read, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`.
+        :param Optional[ResponseCache] cache: Defaults to ``None``. The :py:class:`read-through cache <amcards.cache.ResponseCache>` for single object lookups, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. May be shared with sync clients of the same account.
+        :param bool coalesce_requests: Defaults to ``True``. If True, identical ``GET`` requests awaited by several tasks at once share a single request and its response, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. Cancelling one of the tasks does not cancel the shared request for the others.
+        :param Optional[DuplicateIndex] duplicate_index: Defaults to ``None``. The :py:class:`index <amcards.dedupe.DuplicateIndex>` of the sends made by the client, checked before any request is sent, see :py:meth:`AMcardsClient <amcards.amcards.AMcardsClient.__init__>`. May be shared with sync clients.
+
+        """
+        self._access_token = access_token
+        self._oauth_config = oauth_config
+        self._callback = callback
+        self._domain = domain
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        self._user_cache_ttl = user_cache_ttl
+        self._user_cache = None
+        self._owner = None
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._refresh_margin = refresh_margin
+        self._lazy_models = lazy_models
+        self._cache = cache
+        self._coalesce_requests = coalesce_requests
+        self._duplicate_index = duplicate_index
+        self._in_flight = {}
+        self._refresh_lock = asyncio.Lock()
+
+    def _get_transport(self) -> AsyncTransport:
+        if self._transport is None:
+            return shared_async_transport(self._domain)
+        return self._transport
+
+    def _token_expired(self, margin: float = 0.0) -> bool:
+        return self._oauth_config is not None and helpers.current_timestamp() >= self._oauth_config['expiration'] - margin * 1000
+
+    async def _refresh_token(self) -> None:
+        # Refresh the tokens
+        res = await self._get_transport().request('POST', f'{self._domain}/oauth2/token/', data=_token_refresh_payload(self._oauth_config))
+        res_json = _handle_token_refresh_response(res)
+
+        # Update the access_token, refresh_token, and expiration, the owner is resolved again for the new token
+        self._access_token = res_json['access_token']
+        self._owner = None
+        self._oauth_config['refresh_token'] = res_json['refresh_token']
+        self._oauth_config['expiration'] = helpers.current_timestamp() + res_json['expires_in'] * 1000
+
+        # If specified, call the callback
+        if self._callback is not None:
+            self._callback(
+                access_token=self._access_token,
+                refresh_token=self._oauth_config['refresh_token'],
+                expiration=self._oauth_config['expiration'],
+            )
+
+    async def _ensure_token(self) -> None:
+        if not self._token_expired(self._refresh_margin):
+            return
+        if self._token_expired():
+            # The token is no longer valid, wait for whoever is refreshing it
+            async with self._refresh_lock:
+                if self._token_expired(self._refresh_margin):
+                    await self._refresh_token()
+        elif not self._refresh_lock.locked():
+            # The token is still valid, refresh it early while the other tasks keep using it, a failed early refresh is tried again by the next request
+            async with self._refresh_lock:
+                try:
+                    if self._token_expired(self._refresh_margin):
+                        await self._refresh_token()
+                except (exceptions.OAuthTokenRefreshError, exceptions.NetworkError):
+                    pass
+
+    async def _headers(self) -> dict:
+        await self._ensure_token()
+
+        return {
+            'Authorization': f'Bearer {self._access_token}',
+        }
+
+    async def _send(self, method: str, path: str, idempotency_key: Optional[str], extra_headers: Optional[dict], **kwargs):
+        headers = await self._headers()
+        if idempotency_key is not None:
+            headers['Idempotency-Key'] = idempotency_key
+        if extra_headers:
+            headers.update(extra_headers)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async(method, path)
+        if self._semaphore is None:
+            return await self._get_transport().request(method, f'{self._domain}{path}', headers=headers, **kwargs)
+        async with self._semaphore:
+            return await self._get_transport().request(method, f'{self._domain}{path}', headers=headers, **kwargs)
+
+    async def _request(self, method: str, path: str, idempotency_key: Optional[str] = None, headers: Optional[dict] = None, **kwargs):
+        if method != 'GET' or not self._coalesce_requests:
+            return await self._retrying_request(method, path, idempotency_key, headers, **kwargs)
+
+        key = _coalescing_key(self._access_token, path, headers, kwargs)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(self._retrying_request(method, path, idempotency_key, headers, **kwargs))
+            task.add_done_callback(partial(self._request_done, key))
+        # Shielded so a cancelled caller leaves the request running for the others
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: str, task: asyncio.Future) -> None:
+        del self._in_flight[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved when every caller was cancelled
+            task.exception()
+
+    async def _retrying_request(self, method: str, path: str, idempotency_key: Optional[str] = None, headers: Optional[dict] = None, **kwargs):
+        # Backoff happens outside of _send so a waiting retry does not hold a max_concurrency slot
+        idempotent = idempotency_key is not None
+        attempt = 1
+        while True:
+            try:
+                res = await self._send(method, path, idempotency_key, headers, **kwargs)
+            except exceptions.NetworkError:
+                if not self._retry_policy.should_retry(method, attempt, idempotent):
+                    raise
+                delay = self._retry_policy.delay(attempt)
+            else:
+                if not self._retry_policy.should_retry(method, attempt, idempotent, res.status_code):
+                    break
+                delay = self._retry_policy.delay(attempt, res.headers.get('Retry-After'))
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        _raise_for_transient_status(res)
+        return res
+
+    async def _detail(self, resource: str, path: str, model: type, forbidden_error: type, resource_name: str):
+        if self._cache is None or not self._cache.caches(resource):
+            res = await self._request('GET', path)
+            return _handle_detail_response(res, model, forbidden_error, resource_name)
+
+        key = f'{self._domain}{path}'
+        body, entry, headers = self._cache._lookup(key)
+        if body is None:
+            res = await self._request('GET', path, headers=headers)
+            body = self._cache._update(resource, key, entry, res)
+            if body is None and res.status_code == 304:
+                # No entry to confirm, the validators came from one that is gone: a miss, fetched again in full
+                res = await self._request('GET', path)
+                body = self._cache._update(resource, key, None, res)
+            if body is None:
+                return _handle_detail_response(res, model, forbidden_error, resource_name)
+        return model._from_json(body)
+
+    async def _iter_pages(self, fetch_page: Callable[..., Awaitable[list]], page_size: int, skip: int, prefetch: bool, **kwargs) -> AsyncIterator[Any]:
+        if not prefetch:
+            while page := await fetch_page(limit=page_size, skip=skip, **kwargs):
+                for item in page:
+                    yield item
+                skip += len(page)
+            return
+
+        # Keep exactly one request in flight: the next page is requested as soon as the current one arrives
+        next_page = asyncio.ensure_future(fetch_page(limit=page_size, skip=skip, **kwargs))
+        try:
+            while page := await next_page:
+                skip += len(page)
+                next_page = asyncio.ensure_future(fetch_page(limit=page_size, skip=skip, **kwargs))
+                for item in page:
+                    yield item
+                # Drop our reference so only the prefetched page stays alive while waiting
+                del page
+        finally:
+            next_page.cancel()
+
+    async def _bulk_pages(self, fetch_page: Callable[..., Awaitable[list]], count: Callable[..., Awaitable[int]], page_size: int, max_workers: int, ordered: bool, **kwargs) -> AsyncIterator[Any]:
+        total = await count(filters=kwargs.get('filters'))
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch_range(offset: int) -> list:
+            # The API may cap limit below page_size, so keep fetching until the whole range is covered
+            objects = []
+            async with semaphore:
+                while len(objects) < page_size and offset + len(objects) < total:
+                    page = await fetch_page(limit=page_size - len(objects), skip=offset + len(objects), **kwargs)
+                    if not page:
+                        break
+                    objects.extend(page)
+            return objects
+
+        offsets = iter(range(0, total, page_size))
+        # Only keep a bounded number of pages scheduled so memory stays proportional to max_workers
+        window = 2 * max_workers
+        pending = [asyncio.ensure_future(fetch_range(offset)) for offset in islice(offsets, window)]
+        try:
+            if ordered:
+                pending = deque(pending)
+                while pending:
+                    page = await pending.popleft()
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        pending.append(asyncio.ensure_future(fetch_range(offset)))
+                    for item in page:
+                        yield item
+            else:
+                pending = set(pending)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        offset = next(offsets, None)
+                        if offset is not None:
+                            pending.add(asyncio.ensure_future(fetch_range(offset)))
+                        for item in task.result():
+                            yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def user(self) -> User:
+        """Async version of :py:meth:`AMcardsClient.user <amcards.amcards.AMcardsClient.user>`."""
+        res = await self._request('GET', '/.api/v1/user/')
+        user = _handle_user_response(res)
+        self._user_cache = (user, time.monotonic())
+        self._owner = (self._access_token, user.id)
+        return user
+
+    async def _owner_id(self) -> int:
+        owner = self._owner
+        if owner is None or owner[0] != self._access_token:
+            await self.user()
+            owner = self._owner
+        return owner[1]
+
+    async def cached_user(self) -> User:
+        """Async version of :py:meth:`AMcardsClient.cached_user <amcards.amcards.AMcardsClient.cached_user>`."""
+        if self._user_cache is not None:
+            user, fetched_at = self._user_cache
+            if time.monotonic() - fetched_at < self._user_cache_ttl:
+                return user
+        return await self.user()
+
+    def invalidate_user_cache(self) -> None:
+        """Same as :py:meth:`AMcardsClient.invalidate_user_cache <amcards.amcards.AMcardsClient.invalidate_user_cache>`."""
+        self._user_cache = None
+
+    async def credit_transactions(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[CreditTransaction]:
+        """Async version of :py:meth:`AMcardsClient.credit_transactions <amcards.amcards.AMcardsClient.credit_transactions>`."""
+        res = await self._request('GET', '/.api/v1/credittransaction/', params=_listing_params(limit, skip, filters))
+        return _handle_listing_response(res, CreditTransaction, 'credit transactions')
+
+    def iter_credit_transactions(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> AsyncIterator[CreditTransaction]:
+        """Async version of :py:meth:`AMcardsClient.iter_credit_transactions <amcards.amcards.AMcardsClient.iter_credit_transactions>`, use it with ``async for``."""
+        return self._iter_pages(self.credit_transactions, page_size, skip, prefetch, filters=filters)
+
+    def bulk_credit_transactions(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> AsyncIterator[CreditTransaction]:
+        """Async version of :py:meth:`AMcardsClient.bulk_credit_transactions <amcards.amcards.AMcardsClient.bulk_credit_transactions>`, use it with ``async for``. ``max_workers`` bounds the number of page requests in flight."""
+        return self._bulk_pages(self.credit_transactions, self.credit_transaction_count, page_size, max_workers, ordered, filters=filters)
+
+    async def credit_transaction_count(self, filters: dict = None) -> int:
+        """Async version of :py:meth:`AMcardsClient.credit_transaction_count <amcards.amcards.AMcardsClient.credit_transaction_count>`."""
+        res = await self._request('GET', '/.api/v1/credittransaction/', params=_count_params(filters))
+        return _handle_count_response(res, 'credit transaction count')
+
+    async def templates(self, limit: int = 25, skip: int = 0) -> List[Template]:
+        """Async version of :py:meth:`AMcardsClient.templates <amcards.amcards.AMcardsClient.templates>`."""
+        res = await self._request('GET', '/.api/v1/template/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Template, 'templates')
+
+    def iter_templates(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> AsyncIterator[Template]:
+        """Async version of :py:meth:`AMcardsClient.iter_templates <amcards.amcards.AMcardsClient.iter_templates>`, use it with ``async for``."""
+        return self._iter_pages(self.templates, page_size, skip, prefetch)
+
+    async def template(self, id: str | int) -> Template:
+        """Async version of :py:meth:`AMcardsClient.template <amcards.amcards.AMcardsClient.template>`."""
+        return await self._detail('template', f'/.api/v1/template/{id}/', Template, exceptions.ForbiddenTemplateError, 'template')
+
+    async def quicksends(self, limit: int = 25, skip: int = 0) -> List[Template]:
+        """Async version of :py:meth:`AMcardsClient.quicksends <amcards.amcards.AMcardsClient.quicksends>`."""
+        res = await self._request('GET', '/.api/v1/quicksendtemplate/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Template, 'quicksends')
+
+    def iter_quicksends(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> AsyncIterator[Template]:
+        """Async version of :py:meth:`AMcardsClient.iter_quicksends <amcards.amcards.AMcardsClient.iter_quicksends>`, use it with ``async for``."""
+        return self._iter_pages(self.quicksends, page_size, skip, prefetch)
+
+    async def quicksend(self, id: str | int) -> Template:
+        """Async version of :py:meth:`AMcardsClient.quicksend <amcards.amcards.AMcardsClient.quicksend>`."""
+        return await self._detail('quicksend', f'/.api/v1/quicksendtemplate/{id}/', Template, exceptions.ForbiddenTemplateError, 'quicksend template')
+
+    async def campaigns(self, limit: int = 25, skip: int = 0) -> List[Campaign]:
+        """Async version of :py:meth:`AMcardsClient.campaigns <amcards.amcards.AMcardsClient.campaigns>`."""
+        res = await self._request('GET', '/.api/v1/campaign/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Campaign, 'campaigns')
+
+    def iter_campaigns(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> AsyncIterator[Campaign]:
+        """Async version of :py:meth:`AMcardsClient.iter_campaigns <amcards.amcards.AMcardsClient.iter_campaigns>`, use it with ``async for``."""
+        return self._iter_pages(self.campaigns, page_size, skip, prefetch)
+
+    async def campaign(self, id: str | int) -> Campaign:
+        """Async version of :py:meth:`AMcardsClient.campaign <amcards.amcards.AMcardsClient.campaign>`."""
+        return await self._detail('campaign', f'/.api/v1/campaign/{id}/', Campaign, exceptions.ForbiddenCampaignError, 'drip campaign')
+
+    async def cards(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[Card]:
+        """Async version of :py:meth:`AMcardsClient.cards <amcards.amcards.AMcardsClient.cards>`."""
+        res = await self._request('GET', '/.api/v1/card/', params=_listing_params(limit, skip, filters))
+        return _handle_listing_response(res, Card, 'cards', self._lazy_models)
+
+    def iter_cards(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> AsyncIterator[Card]:
+        """Async version of :py:meth:`AMcardsClient.iter_cards <amcards.amcards.AMcardsClient.iter_cards>`, use it with ``async for``."""
+        return self._iter_pages(self.cards, page_size, skip, prefetch, filters=filters)
+
+    def bulk_cards(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> AsyncIterator[Card]:
+        """Async version of :py:meth:`AMcardsClient.bulk_cards <amcards.amcards.AMcardsClient.bulk_cards>`, use it with ``async for``. ``max_workers`` bounds the number of page requests in flight."""
+        return self._bulk_pages(self.cards, self.card_count, page_size, max_workers, ordered, filters=filters)
+
+    async def card(self, id: str | int) -> Card:
+        """Async version of :py:meth:`AMcardsClient.card <amcards.amcards.AMcardsClient.card>`."""
+        return await self._detail('card', f'/.api/v1/card/{id}/', Card, exceptions.ForbiddenCardError, 'card')
+
+    async def card_count(self, filters: dict = None) -> int:
+        """Async version of :py:meth:`AMcardsClient.card_count <amcards.amcards.AMcardsClient.card_count>`."""
+        res = await self._request('GET', '/.api/v1/card/', params=_count_params(filters))
+        return _handle_count_response(res, 'card count')
+
+    async def export_cards(self, filters: dict = None, columns: Tuple[Column, ...] = CARD_COLUMNS, page_size: int = 100, max_workers: int = 8) -> Columns:
+        """Async version of :py:meth:`AMcardsClient.export_cards <amcards.amcards.AMcardsClient.export_cards>`."""
+        export = Columns(columns)
+        async for page in _batched(self._bulk_pages(self._card_objects, self.card_count, page_size, max_workers, True, filters=filters), page_size):
+            export.extend(page)
+        return export
+
+    async def write_cards(self, file: TextIO, format: str = 'csv', filters: dict = None, columns: Tuple[Column, ...] = CARD_COLUMNS, page_size: int = 100, max_workers: int = 8) -> int:
+        """Async version of :py:meth:`AMcardsClient.write_cards <amcards.amcards.AMcardsClient.write_cards>`. Writes to ``file`` are blocking, one page at a time."""
+        write = _export_writer(format)
+        if write is write_csv:
+            # Header once up front, then every page without one
+            write_csv(file, [], columns)
+            write = partial(write_csv, header=False)
+        count = 0
+        async for page in _batched(self._bulk_pages(self._card_objects, self.card_count, page_size, max_workers, True, filters=filters), page_size):
+            count += write(file, page, columns)
+        return count
+
+    async def _card_objects(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[dict]:
+        res = await self._request('GET', '/.api/v1/card/', params=_listing_params(limit, skip, filters))
+        return _handle_objects_response(res, 'cards')
+
+    async def mailing(self, id: str | int) -> Mailing:
+        """Async version of :py:meth:`AMcardsClient.mailing <amcards.amcards.AMcardsClient.mailing>`."""
+        return await self._detail('mailing', f'/.api/v1/mailing/{id}/', Mailing, exceptions.ForbiddenMailingError, 'mailing')
+
+    async def contacts(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[Contact]:
+        """Async version of :py:meth:`AMcardsClient.contacts <amcards.amcards.AMcardsClient.contacts>`."""
+        res = await self._request('GET', '/.api/v1/contact/', params=_listing_params(limit, skip, filters))
+        return _handle_contacts_response(res, self._lazy_models)
+
+    def iter_contacts(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> AsyncIterator[Contact]:
+        """Async version of :py:meth:`AMcardsClient.iter_contacts <amcards.amcards.AMcardsClient.iter_contacts>`, use it with ``async for``."""
+        return self._iter_pages(self.contacts, page_size, skip, prefetch, filters=filters)
+
+    def bulk_contacts(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> AsyncIterator[Contact]:
+        """Async version of :py:meth:`AMcardsClient.bulk_contacts <amcards.amcards.AMcardsClient.bulk_contacts>`, use it with ``async for``. ``max_workers`` bounds the number of page requests in flight."""
+        return self._bulk_pages(self.contacts, self.contact_count, page_size, max_workers, ordered, filters=filters)
+
+    async def contact_count(self, filters: dict = None) -> int:
+        """Async version of :py:meth:`AMcardsClient.contact_count <amcards.amcards.AMcardsClient.contact_count>`."""
+        res = await self._request('GET', '/.api/v1/contact/', params=_count_params(filters))
+        return _handle_count_response(res, 'contact count')
+
+    async def export_contacts(self, filters: dict = None, columns: Tuple[Column, ...] = CONTACT_COLUMNS, page_size: int = 100, max_workers: int = 8) -> Columns:
+        """Async version of :py:meth:`AMcardsClient.export_contacts <amcards.amcards.AMcardsClient.export_contacts>`."""
+        export = Columns(columns)
+        async for page in _batched(self._bulk_pages(self._contact_objects, self.contact_count, page_size, max_workers, True, filters=filters), page_size):
+            export.extend(page)
+        return export
+
+    async def write_contacts(self, file: TextIO, format: str = 'csv', filters: dict = None, columns: Tuple[Column, ...] = CONTACT_COLUMNS, page_size: int = 100, max_workers: int = 8) -> int:
+        """Async version of :py:meth:`AMcardsClient.write_contacts <amcards.amcards.AMcardsClient.write_contacts>`. Writes to ``file`` are blocking, one page at a time."""
+        write = _export_writer(format)
+        if write is write_csv:
+            # Header once up front, then every page without one
+            write_csv(file, [], columns)
+            write = partial(write_csv, header=False)
+        count = 0
+        async for page in _batched(self._bulk_pages(self._contact_objects, self.contact_count, page_size, max_workers, True, filters=filters), page_size):
+            count += write(file, page, columns)
+        return count
+
+    async def _contact_objects(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[dict]:
+        res = await self._request('GET', '/.api/v1/contact/', params=_listing_params(limit, skip, filters))
+        return _handle_objects_response(res, 'contacts')
+
+    async def contact(self, id: str | int) -> Contact:
+        """Async version of :py:meth:`AMcardsClient.contact <amcards.amcards.AMcardsClient.contact>`."""
+        res = await self._request('GET', f'/.api/v1/contact/{id}/')
+        return _handle_detail_response(res, Contact, exceptions.ForbiddenContactError, 'contact')
+
+    async def create_contact(
+        self,
+        first_name: str,
+        last_name: str,
+        address_line_1: str,
+        city: str,
+        state: str,
+        postal_code: str,
+        country: Optional[str] = None,
+        notes: Optional[str] = None,
+        email: Optional[str] = None,
+        organization: Optional[str] = None,
+        phone: Optional[str] = None,
+        birth_year: Optional[str] = None,
+        birth_month: Optional[str] = None,
+        birth_day: Optional[str] = None,
+        anniversary_year: Optional[str] = None,
+        anniversary_month: Optional[str] = None,
+        anniversary_day: Optional[str] = None,
+        owner_id: Optional[int] = None,
+    ) -> None:
+        """Async version of :py:meth:`AMcardsClient.create_contact <amcards.amcards.AMcardsClient.create_contact>`."""
+        user_id = owner_id if owner_id is not None else await self._owner_id()
+        body = _build_contact_body(
+            user_id, first_name, last_name, address_line_1, city, state, postal_code, country, notes, email, organization,
+            phone, birth_year, birth_month, birth_day, anniversary_year, anniversary_month, anniversary_day,
+        )
+
+        res = await self._request('POST', '/.api/v1/contact/', json=body)
+        _handle_create_contact_response(res)
+
+    async def create_contacts(self, contacts: Iterable[dict], index: Optional[ContactIndex] = None, max_workers: int = 8, ordered: bool = True, owner_id: Optional[int] = None) -> AsyncIterator[ContactImportResult]:
+        """Async version of :py:meth:`AMcardsClient.create_contacts <amcards.amcards.AMcardsClient.create_contacts>`."""
+        index = index if index is not None else ContactIndex()
+        user_id = owner_id if owner_id is not None else await self._owner_id()
+        attempts = {}
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def create(position: int, contact: dict) -> ContactImportResult:
+            result, body, keys = _prepare_contact_import(user_id, index, position, contact)
+            if result is not None:
+                return result
+            earlier = _earlier_contact_attempts(attempts, keys)
+            _add_contact_attempt(attempts, keys, asyncio.current_task())
+            # A contact sharing a key with an earlier one still being created is only a duplicate if that one is created
+            if earlier:
+                await asyncio.wait(earlier)
+                if _any_contact_created(earlier):
+                    return ContactImportResult(position, contact, ContactImportStatus.DUPLICATE)
+            try:
+                async with semaphore:
+                    res = await self._request('POST', '/.api/v1/contact/', json=body)
+                _handle_create_contact_response(res)
+            except exceptions.AuthenticationError:
+                raise
+            except exceptions.AMcardsException as e:
+                return ContactImportResult(position, contact, ContactImportStatus.FAILED, e)
+            index.add(keys)
+            return ContactImportResult(position, contact, ContactImportStatus.CREATED)
+
+        async for result in _windowed(lambda row: create(*row), enumerate(contacts), 2 * max_workers, ordered):
+            yield result
+
+    async def delete_contact(self, id: str | int) -> None:
+        """Async version of :py:meth:`AMcardsClient.delete_contact <amcards.amcards.AMcardsClient.delete_contact>`."""
+        res = await self._request('DELETE', f'/.api/v1/contact/{id}/')
+        _handle_delete_contact_response(res)
+
+    async def send_card_cost(
+        self,
+        template_id: str | int,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+        user: Optional[User] = None,
+    ) -> int:
+        """Async version of :py:meth:`AMcardsClient.send_card_cost <amcards.amcards.AMcardsClient.send_card_cost>`."""
+        shipping_address, return_address = _prepare_card_cost(shipping_address, return_address, send_date)
+        return _card_cost(user or await self.cached_user(), shipping_address, return_address)
+
+    async def send_cards_cost(
+        self,
+        template_id: str | int,
+        shipping_addresses: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        user: Optional[User] = None,
+    ) -> BatchCost:
+        """Async version of :py:meth:`AMcardsClient.send_cards_cost <amcards.amcards.AMcardsClient.send_cards_cost>`."""
+        for idx, shipping_address in enumerate(shipping_addresses):
+            _validate_shipping_address(shipping_address, f' at shipping_addresses[{idx}]')
+        _validate_send_date(send_date)
+
+        user = user or await self.cached_user()
+        return_address = _prefix_return_address(return_address)
+        return BatchCost([
+            _card_cost(user, helpers.sanitize_shipping_address_for_card_send(shipping_address), return_address)
+            for shipping_address in shipping_addresses
+        ])
+
+    async def send_card(
+        self,
+        template_id: str | int,
+        initiator: str,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+        message: str = None,
+        extra_data: dict = None,
+        idempotency_key: Optional[str] = None,
+    ) -> CardResponse:
+        """Async version of :py:meth:`AMcardsClient.send_card <amcards.amcards.AMcardsClient.send_card>`."""
+        body, sanitized_shipping_address = _build_card_send_body(template_id, initiator, shipping_address, return_address, send_date, message, extra_data)
+        duplicate = _reserve_send(self._duplicate_index, 'card', template_id, shipping_address, send_date)
+        try:
+            res = await self._request('POST', '/cards/open-card-form-oa/', idempotency_key=idempotency_key, json=body)
+            response = _handle_card_send_response(res, template_id, sanitized_shipping_address)
+        except exceptions.AMcardsException as e:
+            _release_send(self._duplicate_index, duplicate, e)
+            raise
+        _release_send(self._duplicate_index, duplicate)
+        return response
+
+    async def send_card_stream(self, cards: Iterable[dict], max_in_flight: int = 8, ordered: bool = False) -> AsyncIterator[CardSendResult]:
+        """Async version of :py:meth:`AMcardsClient.send_card_stream <amcards.amcards.AMcardsClient.send_card_stream>`."""
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def send(position: int, card: dict) -> CardSendResult:
+            try:
+                body, shipping_address = _build_card_stream_body(card)
+                duplicate = _reserve_send(self._duplicate_index, 'card', card['template_id'], card['shipping_address'], card.get('send_date'))
+            except exceptions.AMcardsException as e:
+                return CardSendResult(position, card, error=e)
+            started = False
+            try:
+                async with semaphore:
+                    started = True
+                    res = await self._request('POST', '/cards/open-card-form-oa/', idempotency_key=card.get('idempotency_key'), json=body)
+                response = _handle_card_send_response(res, card['template_id'], shipping_address)
+            except exceptions.AMcardsException as e:
+                _release_send(self._duplicate_index, duplicate, e)
+                if isinstance(e, exceptions.AuthenticationError):
+                    raise
+                return CardSendResult(position, card, error=e)
+            except asyncio.CancelledError:
+                # A card cancelled while waiting for a slot, when the stream is closed early, was never made
+                if not started and duplicate is not None:
+                    self._duplicate_index.release(duplicate, sent=False)
+                raise
+            _release_send(self._duplicate_index, duplicate)
+            return CardSendResult(position, card, response)
+
+        async for result in _windowed(lambda row: send(*row), enumerate(cards), 2 * max_in_flight, ordered):
+            yield result
+
+    async def send_campaign_cost(
+        self,
+        campaign_id: str | int,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+    ) -> int:
+        """Async version of :py:meth:`AMcardsClient.send_campaign_cost <amcards.amcards.AMcardsClient.send_campaign_cost>`."""
+        body = _build_campaign_cost_body(campaign_id, shipping_address, return_address, send_date)
+        res = await self._request('POST', '/campaigns/calculate-campaign-price/', json=body)
+        return _handle_campaign_cost_response(res, campaign_id)
+
+    async def send_campaign_cost_many(
+        self,
+        campaign_id: str | int,
+        recipients: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        max_workers: int = 8,
+    ) -> BatchCost:
+        """Async version of :py:meth:`AMcardsClient.send_campaign_cost_many <amcards.amcards.AMcardsClient.send_campaign_cost_many>`. ``max_workers`` bounds the number of pricing requests in flight."""
+        bodies, keys = _build_campaign_cost_bodies(campaign_id, recipients, return_address, send_date)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def price(body: dict) -> int:
+            async with semaphore:
+                res = await self._request('POST', '/campaigns/calculate-campaign-price/', json=body)
+            return _handle_campaign_cost_response(res, campaign_id)
+
+        costs = dict(zip(bodies, await asyncio.gather(*(price(body) for body in bodies.values()))))
+        return BatchCost([costs[key] for key in keys])
+
+    async def send_campaign(
+        self,
+        campaign_id: str | int,
+        initiator: str,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+        extra_data: dict = None,
+        idempotency_key: Optional[str] = None,
+    ) -> CampaignResponse:
+        """Async version of :py:meth:`AMcardsClient.send_campaign <amcards.amcards.AMcardsClient.send_campaign>`."""
+        body, sanitized_shipping_address = _build_campaign_send_body(campaign_id, initiator, shipping_address, return_address, send_date, extra_data)
+        duplicate = _reserve_send(self._duplicate_index, 'campaign', campaign_id, shipping_address, send_date)
+        try:
+            res = await self._request('POST', '/campaigns/open-campaign-form/', idempotency_key=idempotency_key, json=body)
+            response = _handle_campaign_send_response(res, campaign_id, sanitized_shipping_address)
+        except exceptions.AMcardsException as e:
+            _release_send(self._duplicate_index, duplicate, e)
+            raise
+        _release_send(self._duplicate_index, duplicate)
+        return response
+
+    async def send_cards(
+        self,
+        template_id: str | int,
+        initiator: str,
+        shipping_addresses: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        send_if_error: bool = False,
+        idempotency_key: Optional[str] = None,
+    ) -> CardsResponse:
+        """Async version of :py:meth:`AMcardsClient.send_cards <amcards.amcards.AMcardsClient.send_cards>`."""
+        body, shipping_addresses = _build_cards_send_body(template_id, initiator, shipping_addresses, return_address, send_date, send_if_error)
+        res = await self._request('POST', '/cards/open-mailing-form/', idempotency_key=idempotency_key, json=body)
+        return _handle_cards_send_response(res, template_id, shipping_addresses)
+
+    async def send_cards_chunked(
+        self,
+        template_id: str | int,
+        initiator: str,
+        shipping_addresses: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        send_if_error: bool = False,
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        idempotency_key: Optional[str] = None,
+    ) -> ChunkedCardsResponse:
+        """Async version of :py:meth:`AMcardsClient.send_cards_chunked <amcards.amcards.AMcardsClient.send_cards_chunked>`. ``max_workers`` bounds the number of chunks in flight."""
+        body, _ = _build_cards_send_body(template_id, initiator, shipping_addresses, return_address, send_date, send_if_error)
+        semaphore = asyncio.Semaphore(max_workers)
+        unauthorized = False
+
+        async def send_chunk(index: int, chunk_body: dict) -> Optional[CardsResponse]:
+            nonlocal unauthorized
+            async with semaphore:
+                # Once the access token is rejected, the remaining chunks would all be rejected too
+                if unauthorized:
+                    return None
+                try:
+                    res = await self._request('POST', '/cards/open-mailing-form/', idempotency_key=_chunk_idempotency_key(idempotency_key, index), json=chunk_body)
+                    return _handle_cards_send_response(res, template_id, chunk_body['recipients'])
+                except exceptions.AuthenticationError:
+                    unauthorized = True
+                    raise
+
+        chunk_bodies = _chunk_cards_send_body(body, chunk_size)
+        results = await asyncio.gather(*(send_chunk(index, chunk_body) for index, chunk_body in enumerate(chunk_bodies)), return_exceptions=True)
+        return _chunked_cards_response(chunk_bodies, results)
+
+async def _batched(items: AsyncIterator[Any], size: int) -> AsyncIterator[list]:
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def _windowed(create: Callable[[Any], Awaitable[Any]], items: Iterator[Any], window: int, ordered: bool) -> AsyncIterator[Any]:
+    # Only keep a bounded number of items scheduled so memory stays proportional to the window, items is not read further until results are consumed
+    pending = [asyncio.ensure_future(create(item)) for item in islice(items, window)]
+    try:
+        if ordered:
+            pending = deque(pending)
+            while pending:
+                result = await pending.popleft()
+                item = next(items, None)
+                if item is not None:
+                    pending.append(asyncio.ensure_future(create(item)))
+                yield result
+        else:
+            pending = set(pending)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = next(items, None)
+                    if item is not None:
+                        pending.add(asyncio.ensure_future(create(item)))
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,25 +1,50 @@
+import json
+import threading
+import time
 import requests
-from typing import List, Optional, Callable, Any
-
-
-from .models import User, Template, Gift, Campaign, CardResponse, CardsResponse, CampaignResponse, Card, Contact, Mailing, CreditTransaction
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from itertools import islice
+from typing import List, Optional, Callable, Any, Iterable, Iterator, TextIO, Tuple
+
+
+from .transport import Transport, shared_transport
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .cache import ResponseCache
+from .contacts import ContactIndex, contact_keys
+from .dedupe import DuplicateIndex, duplicate_key
+from .validation import validate_addresses, _DATE_MESSAGE, _PHONE_MESSAGE
+from .export import Column, Columns, CARD_COLUMNS, CONTACT_COLUMNS, write_csv, write_ndjson
+from .models import User, Template, Gift, Campaign, CardResponse, CardsResponse, CampaignResponse, Card, Contact, Mailing, CreditTransaction, BatchCost, ChunkedCardsResponse, FailedChunk, ContactImportResult, ContactImportStatus, CardSendResult
 from . import exceptions
 from . import __helpers as helpers
 
 
 DOMAIN = 'https://amcards.com'
 
-FIXED_COUNTRY = {
-    # US fixes
-    'USA': 'US', 'UNITED STATES': 'US', 'UNITED STATES OF AMERICA': 'US', 'THE UNITED STATES OF AMERICA': 'US', 'AMERICA': 'US',
-    # GB fixes
-    'ENGLAND': 'GB',
-}
+FIXED_COUNTRY = helpers.FIXED_COUNTRY
 
 
 class AMcardsClient:
     """Client for AMcards API."""
-    def __init__(self, access_token: str, oauth_config: Optional[dict] = None, callback: Optional[Callable[[str, str, int], Any]] = None) -> None:
+    def __init__(
+        self,
+        access_token: str,
+        oauth_config: Optional[dict] = None,
+        callback: Optional[Callable[[str, str, int], Any]] = None,
+        domain: str = DOMAIN,
+        transport: Optional[Transport] = None,
+        user_cache_ttl: float = 300.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        refresh_margin: float = 60.0,
+        lazy_models: bool = False,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        duplicate_index: Optional[DuplicateIndex] = None,
+    ) -> None:
         """Client for AMcards API.
 
         :param str access_token: Your AMcards access token. Generate one `here <https://amcards.com/user/generate-access-token/>`_.
@@ -35,32 +60,62 @@ class AMcardsClient:
                 }
 
         :param Optional[Callable[[str, str, int], Any]] callback: This function will be called by the client when you have ``oauth_config`` defined, and the client refreshes the ``access_token`` before making a request. This can be useful when you need perform some logic when the client refreshes the specified ``access_token`` (like updating your database to reflect the new access_token and refresh_token). ``callback`` is optional, but if you choose to include it, it needs to accept the following keyword arguments: ``access_token`` ``refresh_token`` ``expiration``. ``callback`` will be called by the client as follows: ``callback(access_token='newaccesstoken', refresh_token='newrefreshtoken', expiration=1671692135130)``, note that ``expiration`` is specified as a unix timestamp in ms.
+        :param str domain: Defaults to ``"https://amcards.com"``. Scheme and host the client sends its requests to.
+        :param Optional[Transport] transport: Defaults to ``None``. The :py:class:`transport <amcards.transport.Transport>` used to send requests. If not specified, the client uses the transport shared by all clients with the same ``domain``. Pass your own to configure pool size, keep-alive and timeouts:
+
+            .. code-block::
+
+                >>> from amcards import AMcardsClient, Transport
+                >>> transport = Transport(pool_maxsize=32, connect_timeout=3, read_timeout=30)
+                >>> client = AMcardsClient('youraccesstoken', transport=transport)
+
+        :param float user_cache_ttl: Defaults to ``300.0``. Seconds the client's :py:class:`user <amcards.models.User>` is cached for by :py:meth:`cached_user` and :py:meth:`send_card_cost`. ``0`` disables caching.
+        :param Optional[RetryPolicy] retry_policy: Defaults to ``None``. The :py:class:`retry policy <amcards.retry.RetryPolicy>` for requests that fail because of a connection error, throttling (``429``) or a server error (``5xx``). If not specified, ``GET`` requests and requests with an ``idempotency_key`` are attempted up to 3 times. Pass ``RetryPolicy(max_attempts=1)`` to disable retries. Once retries are exhausted, the request raises :py:class:`NetworkError <amcards.exceptions.NetworkError>`, :py:class:`RateLimitError <amcards.exceptions.RateLimitError>` or :py:class:`ServerError <amcards.exceptions.ServerError>`.
+        :param Optional[RateLimiter] rate_limiter: Defaults to ``None``. The :py:class:`rate limiter <amcards.ratelimit.RateLimiter>` every request waits on before it is sent, with separate budgets for listings, sends and pricing. Share one limiter between clients, or use :py:class:`FileTokenBucket <amcards.ratelimit.FileTokenBucket>` buckets to share a budget between processes. If not specified, requests are not limited.
+        :param float refresh_margin: Defaults to ``60.0``. Seconds before the ``expiration`` in ``oauth_config`` the client starts refreshing the ``access_token``. Only one refresh runs at a time, however many threads share the client, and ``callback`` is called once per refresh. Requests sent during the margin keep using the current token while a single one of them refreshes it, only requests sent after ``expiration`` wait for the refresh.
+        :param bool lazy_models: Defaults to ``False``. If True, the :py:class:`cards <amcards.models.Card>` and :py:class:`contacts <amcards.models.Contact>` returned by listings (:py:meth:`cards`, :py:meth:`contacts` and their ``iter_*`` and ``bulk_*`` variants) keep AMcards' raw JSON and decode each field the first time it is read, so listings that only read a few fields, like ``id`` and ``status``, skip parsing dates, addresses, gifts and ``extra_data``. A malformed field then raises when it is read rather than when the page is fetched.
+        :param Optional[ResponseCache] cache: Defaults to ``None``. The :py:class:`read-through cache <amcards.cache.ResponseCache>` for :py:meth:`template`, :py:meth:`quicksend`, :py:meth:`campaign`, :py:meth:`mailing` and :py:meth:`card`, with per-resource TTLs and ``ETag`` / ``Last-Modified`` revalidation. If not specified, every lookup sends a request.
+        :param bool coalesce_requests: Defaults to ``True``. If True, identical ``GET`` requests (same path, params and ``access_token``) sent by several threads at once share a single request and its response: the threads that join a request already in flight wait for it rather than sending their own. Unlike a cache, a response is never reused once its request completes.
+        :param Optional[DuplicateIndex] duplicate_index: Defaults to ``None``. The :py:class:`index <amcards.dedupe.DuplicateIndex>` of the sends made by :py:meth:`send_card`, :py:meth:`send_card_stream` and :py:meth:`send_campaign`. A send of the same template or campaign to the same recipient for the same ``send_date`` as one already in the index raises :py:class:`DuplicateCardError <amcards.exceptions.DuplicateCardError>` or :py:class:`DuplicateCampaignError <amcards.exceptions.DuplicateCampaignError>` without sending a request, whatever its ``initiator``. A send is :py:meth:`reserved <amcards.dedupe.DuplicateIndex.reserve>` in the index while its request is in flight, so the same card sent by several threads at once is sent once. A send whose outcome is unknown, after a connection error or a ``5xx`` that outlasted the retries, stays reserved for as long as the index is open. Share a :py:class:`FileDuplicateIndex <amcards.dedupe.FileDuplicateIndex>` or :py:class:`BloomDuplicateIndex <amcards.dedupe.BloomDuplicateIndex>` to catch duplicates across restarts and processes. If not specified, duplicates are only caught by AMcards, for campaigns.
+
+            .. code-block::
+
+                >>> from amcards import AMcardsClient
+                >>> from amcards.dedupe import BloomDuplicateIndex
+                >>> client = AMcardsClient('youraccesstoken', duplicate_index=BloomDuplicateIndex('amcards-sends.bloom'))
 
         """
         self._access_token = access_token
         self._oauth_config = oauth_config
         self._callback = callback
-
-    def _token_expired(self) -> bool:
-        return self._oauth_config is not None and helpers.current_timestamp() >= self._oauth_config['expiration']
+        self._domain = domain
+        self._transport = transport if transport is not None else shared_transport(domain)
+        self._user_cache_ttl = user_cache_ttl
+        self._user_cache = None
+        self._owner = None
+        self._user_cache_lock = threading.Lock()
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._refresh_margin = refresh_margin
+        self._lazy_models = lazy_models
+        self._cache = cache
+        self._coalesce_requests = coalesce_requests
+        self._duplicate_index = duplicate_index
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _token_expired(self, margin: float = 0.0) -> bool:
+        return self._oauth_config is not None and helpers.current_timestamp() >= self._oauth_config['expiration'] - margin * 1000
 
     def _refresh_token(self) -> None:
         # Refresh the tokens
-        payload = {
-            'grant_type': 'refresh_token',
-            'refresh_token': self._oauth_config['refresh_token'],
-            'client_id': self._oauth_config['client_id'],
-            'client_secret': self._oauth_config['client_secret'],
-        }
-        res = requests.post(url=f'{DOMAIN}/oauth2/token/', data=payload)
-
-        # Make sure the refresh was successful
-        if not res.ok:
-            raise exceptions.OAuthTokenRefreshError('Something went wrong when attempting to refresh AMcards access_token')
+        res = self._transport.request('POST', f'{self._domain}/oauth2/token/', data=_token_refresh_payload(self._oauth_config))
+        res_json = _handle_token_refresh_response(res)
 
-        # Update the access_token, refresh_token, and expiration
-        res_json = res.json()
+        # Update the access_token, refresh_token, and expiration, the owner is resolved again for the new token
         self._access_token = res_json['access_token']
+        self._owner = None
         self._oauth_config['refresh_token'] = res_json['refresh_token']
         self._oauth_config['expiration'] = helpers.current_timestamp() + res_json['expires_in'] * 1000
 
@@ -72,15 +127,158 @@ class AMcardsClient:
                 expiration=self._oauth_config['expiration'],
             )
 
+    def _ensure_token(self) -> None:
+        if not self._token_expired(self._refresh_margin):
+            return
+        if self._token_expired():
+            # The token is no longer valid, wait for whoever is refreshing it
+            with self._refresh_lock:
+                if self._token_expired(self._refresh_margin):
+                    self._refresh_token()
+        elif self._refresh_lock.acquire(blocking=False):
+            # The token is still valid, refresh it early while the other threads keep using it, a failed early refresh is tried again by the next request
+            try:
+                if self._token_expired(self._refresh_margin):
+                    self._refresh_token()
+            except (exceptions.OAuthTokenRefreshError, exceptions.NetworkError):
+                pass
+            finally:
+                self._refresh_lock.release()
+
     @property
     def _HEADERS(self) -> dict:
-        if self._token_expired():
-            self._refresh_token()
+        self._ensure_token()
 
         return {
             'Authorization': f'Bearer {self._access_token}',
         }
 
+    def _request(self, method: str, path: str, idempotency_key: Optional[str] = None, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        if method != 'GET' or not self._coalesce_requests:
+            return self._retrying_request(method, path, idempotency_key, headers, **kwargs)
+
+        key = _coalescing_key(self._access_token, path, headers, kwargs)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            res = self._retrying_request(method, path, idempotency_key, headers, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _retrying_request(self, method: str, path: str, idempotency_key: Optional[str] = None, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        idempotent = idempotency_key is not None
+        extra_headers = headers
+        attempt = 1
+        while True:
+            headers = self._HEADERS
+            if idempotent:
+                headers['Idempotency-Key'] = idempotency_key
+            if extra_headers:
+                headers.update(extra_headers)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(method, path)
+            try:
+                res = self._transport.request(method, f'{self._domain}{path}', headers=headers, **kwargs)
+            except exceptions.NetworkError:
+                if not self._retry_policy.should_retry(method, attempt, idempotent):
+                    raise
+                delay = self._retry_policy.delay(attempt)
+            else:
+                if not self._retry_policy.should_retry(method, attempt, idempotent, res.status_code):
+                    break
+                delay = self._retry_policy.delay(attempt, res.headers.get('Retry-After'))
+                if delay is None:
+                    break
+            time.sleep(delay)
+            attempt += 1
+
+        _raise_for_transient_status(res)
+        return res
+
+    def _detail(self, resource: str, path: str, model: type, forbidden_error: type, resource_name: str):
+        if self._cache is None or not self._cache.caches(resource):
+            res = self._request('GET', path)
+            return _handle_detail_response(res, model, forbidden_error, resource_name)
+
+        key = f'{self._domain}{path}'
+        body, entry, headers = self._cache._lookup(key)
+        if body is None:
+            res = self._request('GET', path, headers=headers)
+            body = self._cache._update(resource, key, entry, res)
+            if body is None and res.status_code == 304:
+                # No entry to confirm, the validators came from one that is gone: a miss, fetched again in full
+                res = self._request('GET', path)
+                body = self._cache._update(resource, key, None, res)
+            if body is None:
+                return _handle_detail_response(res, model, forbidden_error, resource_name)
+        return model._from_json(body)
+
+    def _iter_pages(self, fetch_page: Callable[..., list], page_size: int, skip: int, prefetch: bool, **kwargs) -> Iterator[Any]:
+        if not prefetch:
+            while page := fetch_page(limit=page_size, skip=skip, **kwargs):
+                yield from page
+                skip += len(page)
+            return
+
+        # Keep exactly one request in flight: the next page is requested as soon as the current one arrives
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(fetch_page, limit=page_size, skip=skip, **kwargs)
+            while page := next_page.result():
+                skip += len(page)
+                next_page = executor.submit(fetch_page, limit=page_size, skip=skip, **kwargs)
+                yield from page
+                # Drop our reference so only the prefetched page stays alive while waiting
+                del page
+
+    def _bulk_pages(self, fetch_page: Callable[..., list], total: int, page_size: int, max_workers: int, ordered: bool, **kwargs) -> Iterator[Any]:
+        def fetch_range(offset: int) -> list:
+            # The API may cap limit below page_size, so keep fetching until the whole range is covered
+            objects = []
+            while len(objects) < page_size and offset + len(objects) < total:
+                page = fetch_page(limit=page_size - len(objects), skip=offset + len(objects), **kwargs)
+                if not page:
+                    break
+                objects.extend(page)
+            return objects
+
+        offsets = iter(range(0, total, page_size))
+        # Only keep a bounded number of pages submitted so memory stays proportional to max_workers
+        window = 2 * max_workers
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            if ordered:
+                pending = deque(executor.submit(fetch_range, offset) for offset in islice(offsets, window))
+                while pending:
+                    page = pending.popleft().result()
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        pending.append(executor.submit(fetch_range, offset))
+                    yield from page
+            else:
+                pending = {executor.submit(fetch_range, offset) for offset in islice(offsets, window)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        offset = next(offsets, None)
+                        if offset is not None:
+                            pending.add(executor.submit(fetch_range, offset))
+                        yield from future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def user(self) -> User:
         """Fetches client's AMcards user.
 
@@ -90,12 +288,43 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/user/', headers=self._HEADERS)
-        if not res.ok:
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        res = self._request('GET', '/.api/v1/user/')
+        user = _handle_user_response(res)
+        with self._user_cache_lock:
+            self._user_cache = (user, time.monotonic())
+        self._owner = (self._access_token, user.id)
+        return user
+
+    def _owner_id(self) -> int:
+        # A token's owner never changes, so the user is only fetched once per access_token
+        owner = self._owner
+        if owner is None or owner[0] != self._access_token:
+            self.user()
+            owner = self._owner
+        return owner[1]
+
+    def cached_user(self) -> User:
+        """Returns client's AMcards user, only fetching it when the cached copy is older than ``user_cache_ttl`` seconds.
+
+        Useful for reading fields that rarely change, like pricing. Use :py:meth:`user` when you need a fresh ``credits`` balance.
 
-        user_json = res.json().get('objects', [{}])[0]
-        return User._from_json(user_json)
+        :return: The client's :py:class:`user <amcards.models.User>`.
+        :rtype: :py:class:`User <amcards.models.User>`
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        with self._user_cache_lock:
+            if self._user_cache is not None:
+                user, fetched_at = self._user_cache
+                if time.monotonic() - fetched_at < self._user_cache_ttl:
+                    return user
+        return self.user()
+
+    def invalidate_user_cache(self) -> None:
+        """Discards the cached user, so the next :py:meth:`cached_user` or :py:meth:`send_card_cost` call fetches it again."""
+        with self._user_cache_lock:
+            self._user_cache = None
 
     def credit_transactions(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[CreditTransaction]:
         """Fetches client's AMcards credit transactions.
@@ -112,19 +341,54 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        params = {
-            'limit': limit,
-            'offset': skip,
-        } | (filters or {})
+        res = self._request('GET', '/.api/v1/credittransaction/', params=_listing_params(limit, skip, filters))
+        return _handle_listing_response(res, CreditTransaction, 'credit transactions')
+
+    def iter_credit_transactions(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> Iterator[CreditTransaction]:
+        """Lazily iterates over all of client's AMcards credit transactions, fetching them one page at a time.
+
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many credit transactions the client's user has.
+
+            .. code-block::
+
+                >>> for item in client.iter_credit_transactions(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of credit transactions fetched per request.
+        :param int skip: Defaults to ``0``. Number of credit transactions to be skipped.
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching credit transactions, same as :py:meth:`credit_transactions`.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`credit transactions <amcards.models.CreditTransaction>`.
+        :rtype: Iterator[:py:class:`CreditTransaction <amcards.models.CreditTransaction>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.credit_transactions, page_size, skip, prefetch, filters=filters)
 
-        res = requests.get(url=f'{DOMAIN}/.api/v1/credittransaction/', headers=self._HEADERS, params=params)
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching credit transactions. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+    def bulk_credit_transactions(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> Iterator[CreditTransaction]:
+        """Fetches all of client's AMcards credit transactions matching ``filters``, requesting several pages at the same time.
 
-        credit_transactions_json = res.json().get('objects', [])
-        return [CreditTransaction._from_json(credit_transaction_json) for credit_transaction_json in credit_transactions_json]
+        The total is read once with :py:meth:`credit_transaction_count`, every page offset is computed from it, and up to ``max_workers`` pages are fetched concurrently.
+
+            .. code-block::
+
+                >>> items = list(client.bulk_credit_transactions(page_size=200, max_workers=16))
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching credit transactions, same as :py:meth:`credit_transactions`.
+        :param int page_size: Defaults to ``100``. Number of credit transactions fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+        :param bool ordered: Defaults to ``True``. If True, credit transactions are yielded in the same order as :py:meth:`iter_credit_transactions` would yield them. If False, each page is yielded as soon as it arrives, which keeps all workers busy when some pages are slow.
+
+        :return: The client's :py:class:`credit transactions <amcards.models.CreditTransaction>`. Credit transactions created or deleted while the export is running may be missed or yielded twice, since page offsets are fixed up front.
+        :rtype: Iterator[:py:class:`CreditTransaction <amcards.models.CreditTransaction>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        total = self.credit_transaction_count(filters=filters)
+        return self._bulk_pages(self.credit_transactions, total, page_size, max_workers, ordered, filters=filters)
 
     def credit_transaction_count(self, filters: dict = None) -> int:
         """Fetches count of client's AMcards credit transactions.
@@ -139,17 +403,8 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        params = {
-            'limit': 1,
-        } | (filters or {})
-
-        res = requests.get(url=f'{DOMAIN}/.api/v1/credittransaction/', headers=self._HEADERS, params=params)
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching credit transaction count. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
-
-        return res.json()['meta']['total_count']
+        res = self._request('GET', '/.api/v1/credittransaction/', params=_count_params(filters))
+        return _handle_count_response(res, 'credit transaction count')
 
     def templates(self, limit: int = 25, skip: int = 0) -> List[Template]:
         """Fetches client's AMcards templates.
@@ -163,14 +418,34 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/template/', headers=self._HEADERS, params={'limit': limit, 'offset': skip})
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching templates. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+        res = self._request('GET', '/.api/v1/template/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Template, 'templates')
+
+    def iter_templates(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> Iterator[Template]:
+        """Lazily iterates over all of client's AMcards templates, fetching them one page at a time.
+
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many templates the client's user has.
+
+            .. code-block::
+
+                >>> for item in client.iter_templates(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of templates fetched per request.
+        :param int skip: Defaults to ``0``. Number of templates to be skipped.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`templates <amcards.models.Template>`.
+        :rtype: Iterator[:py:class:`Template <amcards.models.Template>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.templates, page_size, skip, prefetch)
 
-        templates_json = res.json().get('objects', [])
-        return [Template._from_json(template_json) for template_json in templates_json]
+    def _template_objects(self, limit: int = 25, skip: int = 0) -> List[dict]:
+        res = self._request('GET', '/.api/v1/template/', params=_listing_params(limit, skip))
+        return _handle_objects_response(res, 'templates')
 
     def template(self, id: str | int) -> Template:
         """Fetches client's AMcards template with a specified id.
@@ -184,14 +459,7 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/template/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenTemplateError('The template for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        template_json = res.json()
-        return Template._from_json(template_json)
+        return self._detail('template', f'/.api/v1/template/{id}/', Template, exceptions.ForbiddenTemplateError, 'template')
 
     def quicksends(self, limit: int = 25, skip: int = 0) -> List[Template]:
         """Fetches client's AMcards quicksend templates.
@@ -205,14 +473,30 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/quicksendtemplate/', headers=self._HEADERS, params={'limit': limit, 'offset': skip})
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching quicksends. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+        res = self._request('GET', '/.api/v1/quicksendtemplate/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Template, 'quicksends')
+
+    def iter_quicksends(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> Iterator[Template]:
+        """Lazily iterates over all of client's AMcards quicksend templates, fetching them one page at a time.
 
-        templates_json = res.json().get('objects', [])
-        return [Template._from_json(template_json) for template_json in templates_json]
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many quicksend templates the client's user has.
+
+            .. code-block::
+
+                >>> for item in client.iter_quicksends(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of quicksend templates fetched per request.
+        :param int skip: Defaults to ``0``. Number of quicksend templates to be skipped.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`quicksend templates <amcards.models.Template>`.
+        :rtype: Iterator[:py:class:`Template <amcards.models.Template>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.quicksends, page_size, skip, prefetch)
 
     def quicksend(self, id: str | int) -> Template:
         """Fetches client's AMcards quicksend template with a specified id.
@@ -226,14 +510,7 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/quicksendtemplate/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenTemplateError('The quicksend template for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        template_json = res.json()
-        return Template._from_json(template_json)
+        return self._detail('quicksend', f'/.api/v1/quicksendtemplate/{id}/', Template, exceptions.ForbiddenTemplateError, 'quicksend template')
 
     def campaigns(self, limit: int = 25, skip: int = 0) -> List[Campaign]:
         """Fetches client's AMcards drip campaigns.
@@ -247,14 +524,34 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/campaign/', headers=self._HEADERS, params={'limit': limit, 'offset': skip})
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching campaigns. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+        res = self._request('GET', '/.api/v1/campaign/', params=_listing_params(limit, skip))
+        return _handle_listing_response(res, Campaign, 'campaigns')
+
+    def iter_campaigns(self, page_size: int = 100, skip: int = 0, prefetch: bool = True) -> Iterator[Campaign]:
+        """Lazily iterates over all of client's AMcards drip campaigns, fetching them one page at a time.
+
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many drip campaigns the client's user has.
+
+            .. code-block::
+
+                >>> for item in client.iter_campaigns(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of drip campaigns fetched per request.
+        :param int skip: Defaults to ``0``. Number of drip campaigns to be skipped.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`drip campaigns <amcards.models.Campaign>`.
+        :rtype: Iterator[:py:class:`Campaign <amcards.models.Campaign>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.campaigns, page_size, skip, prefetch)
 
-        campaigns_json = res.json().get('objects', [])
-        return [Campaign._from_json(campaign_json) for campaign_json in campaigns_json]
+    def _campaign_objects(self, limit: int = 25, skip: int = 0) -> List[dict]:
+        res = self._request('GET', '/.api/v1/campaign/', params=_listing_params(limit, skip))
+        return _handle_objects_response(res, 'campaigns')
 
     def campaign(self, id: str | int) -> Campaign:
         """Fetches client's AMcards drip campaign with a specified id.
@@ -268,14 +565,7 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/campaign/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenCampaignError('The drip campaign for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        campaign_json = res.json()
-        return Campaign._from_json(campaign_json)
+        return self._detail('campaign', f'/.api/v1/campaign/{id}/', Campaign, exceptions.ForbiddenCampaignError, 'drip campaign')
 
     def cards(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[Card]:
         """Fetches client's AMcards cards.
@@ -292,19 +582,54 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        params = {
-            'limit': limit,
-            'offset': skip,
-        } | (filters or {})
+        res = self._request('GET', '/.api/v1/card/', params=_listing_params(limit, skip, filters))
+        return _handle_listing_response(res, Card, 'cards', self._lazy_models)
+
+    def iter_cards(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> Iterator[Card]:
+        """Lazily iterates over all of client's AMcards cards, fetching them one page at a time.
 
-        res = requests.get(url=f'{DOMAIN}/.api/v1/card/', headers=self._HEADERS, params=params)
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching cards. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many cards the client's user has.
+
+            .. code-block::
 
-        cards_json = res.json().get('objects', [])
-        return [Card._from_json(card_json) for card_json in cards_json]
+                >>> for item in client.iter_cards(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of cards fetched per request.
+        :param int skip: Defaults to ``0``. Number of cards to be skipped.
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching cards, same as :py:meth:`cards`.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`cards <amcards.models.Card>`.
+        :rtype: Iterator[:py:class:`Card <amcards.models.Card>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.cards, page_size, skip, prefetch, filters=filters)
+
+    def bulk_cards(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> Iterator[Card]:
+        """Fetches all of client's AMcards cards matching ``filters``, requesting several pages at the same time.
+
+        The total is read once with :py:meth:`card_count`, every page offset is computed from it, and up to ``max_workers`` pages are fetched concurrently.
+
+            .. code-block::
+
+                >>> items = list(client.bulk_cards(page_size=200, max_workers=16))
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching cards, same as :py:meth:`cards`.
+        :param int page_size: Defaults to ``100``. Number of cards fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+        :param bool ordered: Defaults to ``True``. If True, cards are yielded in the same order as :py:meth:`iter_cards` would yield them. If False, each page is yielded as soon as it arrives, which keeps all workers busy when some pages are slow.
+
+        :return: The client's :py:class:`cards <amcards.models.Card>`. Cards created or deleted while the export is running may be missed or yielded twice, since page offsets are fixed up front.
+        :rtype: Iterator[:py:class:`Card <amcards.models.Card>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        total = self.card_count(filters=filters)
+        return self._bulk_pages(self.cards, total, page_size, max_workers, ordered, filters=filters)
 
     def card(self, id: str | int) -> Card:
         """Fetches client's AMcards card with a specified id.
@@ -318,14 +643,7 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/card/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenCardError('The card for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        card_json = res.json()
-        return Card._from_json(card_json)
+        return self._detail('card', f'/.api/v1/card/{id}/', Card, exceptions.ForbiddenCardError, 'card')
 
     def card_count(self, filters: dict = None) -> int:
         """Fetches count of client's AMcards cards.
@@ -340,17 +658,64 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        params = {
-            'limit': 1,
-        } | (filters or {})
+        res = self._request('GET', '/.api/v1/card/', params=_count_params(filters))
+        return _handle_count_response(res, 'card count')
+
+    def export_cards(self, filters: dict = None, columns: Tuple[Column, ...] = CARD_COLUMNS, page_size: int = 100, max_workers: int = 8) -> Columns:
+        """Fetches all of client's AMcards cards matching ``filters`` into a column-oriented :py:class:`export <amcards.export.Columns>`, without building a :py:class:`Card <amcards.models.Card>` per card.
+
+        Pages are fetched concurrently as by :py:meth:`bulk_cards` and decoded straight into the export's columns.
+
+            .. code-block::
+
+                >>> columns = client.export_cards()
+                >>> arrays = columns.to_numpy()
+                >>> table = columns.to_arrow()
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching cards, same as :py:meth:`cards`.
+        :param Tuple[Column, ...] columns: Defaults to :py:data:`CARD_COLUMNS <amcards.export.CARD_COLUMNS>`. Columns to export.
+        :param int page_size: Defaults to ``100``. Number of cards fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+
+        :return: The client's cards, one row per card.
+        :rtype: :py:class:`Columns <amcards.export.Columns>`
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        export = Columns(columns)
+        export.extend(self._bulk_pages(self._card_objects, self.card_count(filters=filters), page_size, max_workers, True, filters=filters))
+        return export
+
+    def write_cards(self, file: TextIO, format: str = 'csv', filters: dict = None, columns: Tuple[Column, ...] = CARD_COLUMNS, page_size: int = 100, max_workers: int = 8) -> int:
+        """Streams all of client's AMcards cards matching ``filters`` to a CSV or NDJSON file, holding no more than ``2 * max_workers`` pages in memory.
+
+            .. code-block::
+
+                >>> with open('cards.csv', 'w', newline='') as f:
+                ...     client.write_cards(f)
+                120000
+
+        :param TextIO file: Text file to write to, opened with ``newline=''`` for CSV.
+        :param str format: Defaults to ``"csv"``. ``"csv"`` writes a header row and one row per card, see :py:func:`write_csv <amcards.export.write_csv>`. ``"ndjson"`` writes one JSON object per line, see :py:func:`write_ndjson <amcards.export.write_ndjson>`.
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching cards, same as :py:meth:`cards`.
+        :param Tuple[Column, ...] columns: Defaults to :py:data:`CARD_COLUMNS <amcards.export.CARD_COLUMNS>`. Columns to write.
+        :param int page_size: Defaults to ``100``. Number of cards fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+
+        :return: Number of cards written.
+        :rtype: int
 
-        res = requests.get(url=f'{DOMAIN}/.api/v1/card/', headers=self._HEADERS, params=params)
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException(f'Something went wrong when fetching card count. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+        :raises ValueError: When ``format`` is neither ``"csv"`` nor ``"ndjson"``.
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
-        return res.json()['meta']['total_count']
+        """
+        write = _export_writer(format)
+        return write(file, self._bulk_pages(self._card_objects, self.card_count(filters=filters), page_size, max_workers, True, filters=filters), columns)
+
+    def _card_objects(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[dict]:
+        res = self._request('GET', '/.api/v1/card/', params=_listing_params(limit, skip, filters))
+        return _handle_objects_response(res, 'cards')
 
     def mailing(self, id: str | int) -> Mailing:
         """Fetches client's AMcards mailing with a specified id.
@@ -364,14 +729,7 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/mailing/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenMailingError('The mailing for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        mailing_json = res.json()
-        return Mailing._from_json(mailing_json)
+        return self._detail('mailing', f'/.api/v1/mailing/{id}/', Mailing, exceptions.ForbiddenMailingError, 'mailing')
 
     def contacts(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[Contact]:
         """Fetches client's AMcards contacts.
@@ -388,17 +746,126 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        params = {
-            'limit': limit,
-            'offset': skip,
-        } | (filters or {})
+        res = self._request('GET', '/.api/v1/contact/', params=_listing_params(limit, skip, filters))
+        return _handle_contacts_response(res, self._lazy_models)
 
-        res = requests.get(url=f'{DOMAIN}/.api/v1/contact/', headers=self._HEADERS, params=params)
-        if not res.ok:
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+    def iter_contacts(self, page_size: int = 100, skip: int = 0, filters: dict = None, prefetch: bool = True) -> Iterator[Contact]:
+        """Lazily iterates over all of client's AMcards contacts, fetching them one page at a time.
+
+        Only the page being consumed (and, with ``prefetch``, the next one) is held in memory, no matter how many contacts the client's user has.
+
+            .. code-block::
+
+                >>> for item in client.iter_contacts(page_size=200):
+                ...     print(item.id)
+
+        :param int page_size: Defaults to ``100``. Number of contacts fetched per request.
+        :param int skip: Defaults to ``0``. Number of contacts to be skipped.
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching contacts, same as :py:meth:`contacts`.
+        :param bool prefetch: Defaults to ``True``. If True, the next page is fetched in the background while the current page is being consumed.
+
+        :return: The client's :py:class:`contacts <amcards.models.Contact>`.
+        :rtype: Iterator[:py:class:`Contact <amcards.models.Contact>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        return self._iter_pages(self.contacts, page_size, skip, prefetch, filters=filters)
 
-        contacts_json = res.json().get('objects', [])
-        return [Contact._from_json(contact_json) for contact_json in contacts_json]
+    def bulk_contacts(self, filters: dict = None, page_size: int = 100, max_workers: int = 8, ordered: bool = True) -> Iterator[Contact]:
+        """Fetches all of client's AMcards contacts matching ``filters``, requesting several pages at the same time.
+
+        The total is read once with :py:meth:`contact_count`, every page offset is computed from it, and up to ``max_workers`` pages are fetched concurrently.
+
+            .. code-block::
+
+                >>> items = list(client.bulk_contacts(page_size=200, max_workers=16))
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching contacts, same as :py:meth:`contacts`.
+        :param int page_size: Defaults to ``100``. Number of contacts fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+        :param bool ordered: Defaults to ``True``. If True, contacts are yielded in the same order as :py:meth:`iter_contacts` would yield them. If False, each page is yielded as soon as it arrives, which keeps all workers busy when some pages are slow.
+
+        :return: The client's :py:class:`contacts <amcards.models.Contact>`. Contacts created or deleted while the export is running may be missed or yielded twice, since page offsets are fixed up front.
+        :rtype: Iterator[:py:class:`Contact <amcards.models.Contact>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        total = self.contact_count(filters=filters)
+        return self._bulk_pages(self.contacts, total, page_size, max_workers, ordered, filters=filters)
+
+    def contact_count(self, filters: dict = None) -> int:
+        """Fetches count of client's AMcards contacts.
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when counting contacts.
+
+            A common use case is to use ``filter = {'last_name': 'Smith'}``, this will count all contacts with ``last_name == 'Smith'``.
+
+        :return: The count of client's contacts.
+        :rtype: int
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        res = self._request('GET', '/.api/v1/contact/', params=_count_params(filters))
+        return _handle_count_response(res, 'contact count')
+
+    def export_contacts(self, filters: dict = None, columns: Tuple[Column, ...] = CONTACT_COLUMNS, page_size: int = 100, max_workers: int = 8) -> Columns:
+        """Fetches all of client's AMcards contacts matching ``filters`` into a column-oriented :py:class:`export <amcards.export.Columns>`, without building a :py:class:`Contact <amcards.models.Contact>` per contact.
+
+        Pages are fetched concurrently as by :py:meth:`bulk_contacts` and decoded straight into the export's columns.
+
+            .. code-block::
+
+                >>> columns = client.export_contacts()
+                >>> arrays = columns.to_numpy()
+                >>> table = columns.to_arrow()
+
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching contacts, same as :py:meth:`contacts`.
+        :param Tuple[Column, ...] columns: Defaults to :py:data:`CONTACT_COLUMNS <amcards.export.CONTACT_COLUMNS>`. Columns to export.
+        :param int page_size: Defaults to ``100``. Number of contacts fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+
+        :return: The client's contacts, one row per contact.
+        :rtype: :py:class:`Columns <amcards.export.Columns>`
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        export = Columns(columns)
+        export.extend(self._bulk_pages(self._contact_objects, self.contact_count(filters=filters), page_size, max_workers, True, filters=filters))
+        return export
+
+    def write_contacts(self, file: TextIO, format: str = 'csv', filters: dict = None, columns: Tuple[Column, ...] = CONTACT_COLUMNS, page_size: int = 100, max_workers: int = 8) -> int:
+        """Streams all of client's AMcards contacts matching ``filters`` to a CSV or NDJSON file, holding no more than ``2 * max_workers`` pages in memory.
+
+            .. code-block::
+
+                >>> with open('contacts.csv', 'w', newline='') as f:
+                ...     client.write_contacts(f)
+                120000
+
+        :param TextIO file: Text file to write to, opened with ``newline=''`` for CSV.
+        :param str format: Defaults to ``"csv"``. ``"csv"`` writes a header row and one row per contact, see :py:func:`write_csv <amcards.export.write_csv>`. ``"ndjson"`` writes one JSON object per line, see :py:func:`write_ndjson <amcards.export.write_ndjson>`.
+        :param Optional[dict] filters: Defaults to ``None``. Filters to be applied when fetching contacts, same as :py:meth:`contacts`.
+        :param Tuple[Column, ...] columns: Defaults to :py:data:`CONTACT_COLUMNS <amcards.export.CONTACT_COLUMNS>`. Columns to write.
+        :param int page_size: Defaults to ``100``. Number of contacts fetched per request.
+        :param int max_workers: Defaults to ``8``. Max number of pages fetched at the same time.
+
+        :return: Number of contacts written.
+        :rtype: int
+
+        :raises ValueError: When ``format`` is neither ``"csv"`` nor ``"ndjson"``.
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        write = _export_writer(format)
+        return write(file, self._bulk_pages(self._contact_objects, self.contact_count(filters=filters), page_size, max_workers, True, filters=filters), columns)
+
+    def _contact_objects(self, limit: int = 25, skip: int = 0, filters: dict = None) -> List[dict]:
+        res = self._request('GET', '/.api/v1/contact/', params=_listing_params(limit, skip, filters))
+        return _handle_objects_response(res, 'contacts')
 
     def contact(self, id: str | int) -> Contact:
         """Fetches client's AMcards contact with a specified id.
@@ -412,14 +879,8 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.get(url=f'{DOMAIN}/.api/v1/contact/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenContactError('The contact for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-
-        contact_json = res.json()
-        return Contact._from_json(contact_json)
+        res = self._request('GET', f'/.api/v1/contact/{id}/')
+        return _handle_detail_response(res, Contact, exceptions.ForbiddenContactError, 'contact')
 
     def create_contact(
         self,
@@ -440,6 +901,7 @@ class AMcardsClient:
         anniversary_year: Optional[str] = None,
         anniversary_month: Optional[str] = None,
         anniversary_day: Optional[str] = None,
+        owner_id: Optional[int] = None,
     ) -> None:
         """Creates a new contact for the client.
 
@@ -460,41 +922,95 @@ class AMcardsClient:
         :param Optional[str] anniverary_year: Contact's anniversary year. In the form ``"YYYY"``.
         :param Optional[str] anniverary_month: Contact's anniversary month. In the form ``"MM"``.
         :param Optional[str] anniverary_day: Contact's anniversary day. In the form ``"DD"``.
+        :param Optional[int] owner_id: Defaults to ``None``. Unique id of the client's :py:class:`user <amcards.models.User>`, who owns the contact. If not specified, the client fetches its user the first time, and again only once its ``access_token`` changes.
 
         :raises AMcardsException: When something unexpected occurs.
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        user_id = self.user().id
-        body = {
-            'first_name': first_name,
-            'last_name': last_name,
-            'address_line_1': address_line_1,
-            'city': city,
-            'state': state,
-            'postal_code': postal_code,
-            'owner': f'/.api/v1/user/{user_id}/',
-            'notes': '',
-            'groups': '',
-        }
+        user_id = owner_id if owner_id is not None else self._owner_id()
+        body = _build_contact_body(
+            user_id, first_name, last_name, address_line_1, city, state, postal_code, country, notes, email, organization,
+            phone, birth_year, birth_month, birth_day, anniversary_year, anniversary_month, anniversary_day,
+        )
+
+        res = self._request('POST', '/.api/v1/contact/', json=body)
+        _handle_create_contact_response(res)
+
+    def create_contacts(self, contacts: Iterable[dict], index: Optional[ContactIndex] = None, max_workers: int = 8, ordered: bool = True, owner_id: Optional[int] = None) -> Iterator[ContactImportResult]:
+        """Creates many contacts concurrently, validating and deduplicating them locally first, and yields the outcome of each as it is known.
 
-        if country is not None: body |= {'country': country}
-        if notes is not None: body |= {'notes': notes}
-        if email is not None: body |= {'email_address': email}
-        if organization is not None: body |= {'organization': organization}
-        if phone is not None: body |= {'phone_number': phone}
-        if birth_year is not None: body |= {'birth_year': birth_year}
-        if birth_month is not None: body |= {'birth_month': birth_month}
-        if birth_day is not None: body |= {'birth_day': birth_day}
-        if anniversary_year is not None: body |= {'anniversary_year': anniversary_year}
-        if anniversary_month is not None: body |= {'anniversary_month': anniversary_month}
-        if anniversary_day is not None: body |= {'anniversary_day': anniversary_day}
-
-        res = requests.post(url=f'{DOMAIN}/.api/v1/contact/', json=body, headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code == 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            raise exceptions.AMcardsException('Something went wrong when trying to create a contact')
+        ``contacts`` is consumed lazily and at most ``2 * max_workers`` contacts are in flight at once, so a large CSV export can be streamed through with bounded memory.
+
+            .. code-block::
+
+                >>> import csv
+                >>> from amcards.contacts import SQLiteContactIndex
+                >>> from amcards.models import ContactImportStatus
+                >>> index = SQLiteContactIndex('contacts-import.db')
+                >>> with open('crm-export.csv', newline='') as f:
+                ...     for result in client.create_contacts(csv.DictReader(f), index=index):
+                ...         if result.status in (ContactImportStatus.INVALID, ContactImportStatus.FAILED):
+                ...             print(result.index, result.error)
+                7 Invalid phone format, please specify phone as a 10 number string with no special formatting (ex. 5556667777), or omit it
+
+        Contacts that failed can be retried by passing them back, or by running the whole import again with the same persistent ``index``, which skips every contact already created.
+
+        :param Iterable[dict] contacts: Details of each contact, keyed by the arguments of :py:meth:`create_contact`, with an optional ``"third_party_contact_id"`` used for deduplication only.
+        :param Optional[ContactIndex] index: Defaults to ``None``. :py:class:`Index <amcards.contacts.ContactIndex>` of the contacts already imported. Contacts whose ``third_party_contact_id`` or email is in the index, or belongs to a contact created earlier in ``contacts``, are skipped as ``DUPLICATE``, and every created contact is added to it. A contact sharing a key with an earlier one still being created waits for its outcome, and is created if that one ``FAILED``. Use a :py:class:`SQLiteContactIndex <amcards.contacts.SQLiteContactIndex>` to make the import resumable. If not specified, contacts are only deduplicated within ``contacts``.
+        :param int max_workers: Defaults to ``8``. Max number of contacts created at the same time.
+        :param bool ordered: Defaults to ``True``. If True, results are yielded in the order of ``contacts``. If False, they are yielded as soon as they are known.
+        :param Optional[int] owner_id: Defaults to ``None``. Unique id of the client's user, see :py:meth:`create_contact`.
+
+        :return: The :py:class:`result <amcards.models.ContactImportResult>` of every contact: ``CREATED``, ``DUPLICATE``, ``INVALID`` (with a :py:class:`ContactFormatError <amcards.exceptions.ContactFormatError>`, :py:class:`PhoneFormatError <amcards.exceptions.PhoneFormatError>` or :py:class:`DateFormatError <amcards.exceptions.DateFormatError>`) or ``FAILED``.
+        :rtype: Iterator[:py:class:`ContactImportResult <amcards.models.ContactImportResult>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid. The import stops.
+
+        """
+        index = index if index is not None else ContactIndex()
+        user_id = owner_id if owner_id is not None else self._owner_id()
+        attempts = {}
+
+        def create(position: int, contact: dict, body: dict, keys: List[str]) -> ContactImportResult:
+            try:
+                res = self._request('POST', '/.api/v1/contact/', json=body)
+                _handle_create_contact_response(res)
+            except exceptions.AuthenticationError:
+                raise
+            except exceptions.AMcardsException as e:
+                return ContactImportResult(position, contact, ContactImportStatus.FAILED, e)
+            index.add(keys)
+            return ContactImportResult(position, contact, ContactImportStatus.CREATED)
+
+        def start(future: Future, position: int, contact: dict, body: dict, keys: List[str], earlier: List[Future]) -> None:
+            # Runs once the earlier contacts sharing a key with this one are done, a contact is only a duplicate if one of them was created
+            if _any_contact_created(earlier):
+                future.set_result(ContactImportResult(position, contact, ContactImportStatus.DUPLICATE))
+                return
+            try:
+                _chain(executor.submit(create, position, contact, body, keys), future)
+            except RuntimeError:
+                # The import stopped before the earlier contacts were done
+                future.cancel()
+
+        def submit(row: tuple) -> Future:
+            position, contact = row
+            result, body, keys = _prepare_contact_import(user_id, index, position, contact)
+            if result is not None:
+                return _completed(result)
+            earlier = _earlier_contact_attempts(attempts, keys)
+            future = Future()
+            _add_contact_attempt(attempts, keys, future)
+            # Started from a done callback rather than waiting in a worker, so no worker is held up by another contact
+            _after(earlier, partial(start, future, position, contact, body, keys, earlier))
+            return future
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            yield from _windowed(submit, enumerate(contacts), 2 * max_workers, ordered)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def delete_contact(self, id: str | int) -> None:
         """Deletes client's AMcards contact with a specified id.
@@ -505,11 +1021,8 @@ class AMcardsClient:
         :raises AuthenticationError: When the client's ``access_token`` is invalid.
 
         """
-        res = requests.delete(url=f'{DOMAIN}/.api/v1/contact/{id}/', headers=self._HEADERS)
-        if not res.ok:
-            if res.status_code in (403, 404):
-                raise exceptions.ForbiddenContactError('The contact for the specified id either does not exist or is not owned by the client\'s user')
-            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        res = self._request('DELETE', f'/.api/v1/contact/{id}/')
+        _handle_delete_contact_response(res)
 
     def send_card_cost(
         self,
@@ -517,9 +1030,12 @@ class AMcardsClient:
         shipping_address: dict,
         return_address: dict = None,
         send_date: str = None,
+        user: Optional[User] = None,
     ) -> int:
         """Get cost for a card send. Without actually sending the card.
 
+        The cost is computed locally from the client's :py:class:`user <amcards.models.User>` pricing, which is fetched at most once every ``user_cache_ttl`` seconds, so quoting many cards costs no extra requests.
+
             .. code-block::
 
                 >>> from amcards import AMcardsClient
@@ -571,6 +1087,7 @@ class AMcardsClient:
                 }
 
         :param Optional[str] send_date: The date the card should be sent. If not specified, the card will be scheduled for the following day. The format should be: ``"YYYY-MM-DD"``.
+        :param Optional[User] user: Defaults to ``None``. A prefetched :py:class:`user <amcards.models.User>` to take pricing from. If not specified, the client's cached user is used.
 
         :return: Cost for sending card in `cents`.
         :rtype: ``int``
@@ -581,35 +1098,53 @@ class AMcardsClient:
         :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
 
         """
-        # Validate shipping address
-        missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
-        if missings:
-            error_message = 'Missing the following required shipping address fields: ' + ', '.join(missings)
-            raise exceptions.ShippingAddressError(error_message)
-
-        # Validate send date
-        if send_date is not None and not helpers.is_valid_date(send_date):
-            error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-
-        # Sanitize shipping address and return address
-        shipping_address = helpers.sanitize_shipping_address_for_card_send(shipping_address)
-        if return_address is not None:
-            return_address = helpers.sanitize_return_address(return_address)
-            # prefix return address fields with return_
-            return_address = {f'return_{key}': value for key, value in return_address.items()}
-
-        user = self.user()
-        shipping_country = _fix_country(shipping_address['country'])
-        return_country = _fix_country(user.country)
-        if return_address is not None and 'return_country' in return_address:
-            return_country = _fix_country(return_address['return_country'])
-
-        # If this card is domestic charge domestic postage
-        if shipping_country in user.domestic_postage_countries and return_country in user.domestic_postage_countries:
-            return user.greeting_card_cost + user.domestic_postage_cost
-        # Otherwise charge international postage
-        return user.greeting_card_cost + user.international_postage_cost
+        shipping_address, return_address = _prepare_card_cost(shipping_address, return_address, send_date)
+        return _card_cost(user or self.cached_user(), shipping_address, return_address)
+
+    def send_cards_cost(
+        self,
+        template_id: str | int,
+        shipping_addresses: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        user: Optional[User] = None,
+    ) -> BatchCost:
+        """Get cost for sending a card to each of several recipients. Without actually sending any cards.
+
+        Costs are computed locally from a single cached :py:class:`user <amcards.models.User>` fetch, see :py:meth:`send_card_cost`.
+
+            .. code-block::
+
+                >>> res = client.send_cards_cost(template_id='123', shipping_addresses=shipping_addresses)
+                >>> res.costs
+                [442, 442, 526]
+                >>> res.total_cost
+                1410
+
+        :param str or int template_id: Unique id for the :py:class:`template <amcards.models.Template>` you are getting cost for.
+        :param List[dict] shipping_addresses: List of shipping details, each in the same form as ``shipping_address`` in :py:meth:`send_card_cost`.
+        :param Optional[dict] return_address: Dict of return details that will override the client's AMcards user default return details, same as :py:meth:`send_card_cost`.
+        :param Optional[str] send_date: The date the cards should be sent. The format should be: ``"YYYY-MM-DD"``.
+        :param Optional[User] user: Defaults to ``None``. A prefetched :py:class:`user <amcards.models.User>` to take pricing from. If not specified, the client's cached user is used.
+
+        :return: Cost for each recipient and the total, in `cents`.
+        :rtype: :py:class:`BatchCost <amcards.models.BatchCost>`
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+        :raises ShippingAddressError: When some items in ``shipping_addresses`` are missing some `required` keys.
+        :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
+
+        """
+        for idx, shipping_address in enumerate(shipping_addresses):
+            _validate_shipping_address(shipping_address, f' at shipping_addresses[{idx}]')
+        _validate_send_date(send_date)
+
+        user = user or self.cached_user()
+        return_address = _prefix_return_address(return_address)
+        return BatchCost([
+            _card_cost(user, helpers.sanitize_shipping_address_for_card_send(shipping_address), return_address)
+            for shipping_address in shipping_addresses
+        ])
 
     def send_card(
         self,
@@ -620,6 +1155,7 @@ class AMcardsClient:
         send_date: str = None,
         message: str = None,
         extra_data: dict = None,
+        idempotency_key: Optional[str] = None,
     ) -> CardResponse:
         """Attempt to send a card.
 
@@ -694,6 +1230,8 @@ class AMcardsClient:
                     'carMake': 'Honda',                      # OPTIONAL
                 }
 
+        :param Optional[str] idempotency_key: Defaults to ``None``. Sent as the ``Idempotency-Key`` header. Marks the request as safe to retry after a connection error, ``429`` or ``5xx``, use a value unique to this send (for example the id of the event that triggered it).
+
         :return: AMcards' :py:class:`response <amcards.models.CardResponse>` for sending a single card.
         :rtype: :py:class:`CardResponse <amcards.models.CardResponse>`
 
@@ -703,64 +1241,80 @@ class AMcardsClient:
         :raises ShippingAddressError: When ``shipping_address`` is missing some `required` keys.
         :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
         :raises InsufficientCreditsError: When the client's user has insufficient credits in their balance.
+        :raises DuplicateCardError: When the client's ``duplicate_index`` already holds this card, sent to this recipient for this ``send_date``. No request is sent.
 
         """
-        # Validate shipping address
-        missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
-        if missings:
-            error_message = 'Missing the following required shipping address fields: ' + ', '.join(missings)
-            raise exceptions.ShippingAddressError(error_message)
-
-        # Validate send date
-        if send_date is not None and not helpers.is_valid_date(send_date):
-            error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-
-        # Sanitize shipping address and return address
-        shipping_address = helpers.sanitize_shipping_address_for_card_send(shipping_address)
-        if return_address is not None:
-            return_address = helpers.sanitize_return_address(return_address)
-            # prefix return address fields with return_
-            return_address = {f'return_{key}': value for key, value in return_address.items()}
-
-        # Sanitize extra_data
-        extra_data = helpers.sanitize_extra_data(extra_data)
-
-        # Build request json payload
-        body = {
-            'template_id': template_id,
-            'initiator': initiator,
-        } | shipping_address
-
-        if return_address is not None:
-            body |= return_address
-
-        if send_date is not None:
-            body |= {'send_date': send_date}
-
-        if message is not None:
-            body |= {'message': message}
-
-        if extra_data is not None:
-            body |= {'extra_data': extra_data}
-
-        res = requests.post(f'{DOMAIN}/cards/open-card-form-oa/', json=body, headers=self._HEADERS)
-
-        # Check for errors
-        match res.status_code:
-            case 400:
-                raise exceptions.CardSendError('Something went wrong when attempting to send a card')
-            case 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            case 402:
-                raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no card was scheduled')
-            case 403:
-                raise exceptions.ForbiddenTemplateError(f'Clients\' user does not own given template with id of {template_id}')
-
-        res_json = res.json()
-        return CardResponse._from_json(res_json | {
-            'shipping_address': shipping_address,
-        })
+        body, sanitized_shipping_address = _build_card_send_body(template_id, initiator, shipping_address, return_address, send_date, message, extra_data)
+        duplicate = _reserve_send(self._duplicate_index, 'card', template_id, shipping_address, send_date)
+        try:
+            res = self._request('POST', '/cards/open-card-form-oa/', idempotency_key=idempotency_key, json=body)
+            response = _handle_card_send_response(res, template_id, sanitized_shipping_address)
+        except exceptions.AMcardsException as e:
+            _release_send(self._duplicate_index, duplicate, e)
+            raise
+        _release_send(self._duplicate_index, duplicate)
+        return response
+
+    def send_card_stream(self, cards: Iterable[dict], max_in_flight: int = 8, ordered: bool = False) -> Iterator[CardSendResult]:
+        """Sends a stream of cards, one :py:meth:`send_card` request each, with up to ``max_in_flight`` requests at once, and yields the outcome of each as it completes.
+
+        Each card is validated and its request body built by the calling thread while earlier cards are in flight. ``cards`` is only read as results are consumed, at most ``2 * max_in_flight`` cards ahead, so a slow API or a slow consumer holds back reading ``cards`` rather than growing memory.
+
+            .. code-block::
+
+                >>> events = ({'template_id': '123', 'initiator': 'crm', 'shipping_address': event.address, 'idempotency_key': event.id} for event in crm_events())
+                >>> for result in client.send_card_stream(events, max_in_flight=16):
+                ...     if result.ok:
+                ...         print(result.response.card_id)
+                ...     else:
+                ...         print(result.card['idempotency_key'], result.error)
+                1522873
+                evt_8812 ShippingAddressError('Missing the following required shipping address fields: city')
+
+        :param Iterable[dict] cards: Details of each card, keyed by the arguments of :py:meth:`send_card`: ``"template_id"``, ``"initiator"`` and ``"shipping_address"``, and optionally ``"return_address"``, ``"send_date"``, ``"message"``, ``"extra_data"`` and ``"idempotency_key"``.
+        :param int max_in_flight: Defaults to ``8``. Max number of send requests in flight at once.
+        :param bool ordered: Defaults to ``False``. If False, results are yielded as the requests complete. If True, they are yielded in the order of ``cards``.
+
+        :return: The :py:class:`result <amcards.models.CardSendResult>` of every card, holding either AMcards' response or the exception that prevented the send: a :py:class:`CardSendError <amcards.exceptions.CardSendError>` for missing or unknown keys, :py:class:`ShippingAddressError <amcards.exceptions.ShippingAddressError>` or :py:class:`DateFormatError <amcards.exceptions.DateFormatError>` for invalid cards and :py:class:`DuplicateCardError <amcards.exceptions.DuplicateCardError>` for cards in the client's ``duplicate_index`` or already in flight in this stream, which are never sent, and any error raised by :py:meth:`send_card` otherwise.
+        :rtype: Iterator[:py:class:`CardSendResult <amcards.models.CardSendResult>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid. The stream stops.
+
+        """
+        def send(position: int, card: dict, body: dict, shipping_address: dict, duplicate: Optional[str]) -> CardSendResult:
+            try:
+                res = self._request('POST', '/cards/open-card-form-oa/', idempotency_key=card.get('idempotency_key'), json=body)
+                response = _handle_card_send_response(res, card['template_id'], shipping_address)
+            except exceptions.AMcardsException as e:
+                _release_send(self._duplicate_index, duplicate, e)
+                if isinstance(e, exceptions.AuthenticationError):
+                    raise
+                return CardSendResult(position, card, error=e)
+            _release_send(self._duplicate_index, duplicate)
+            return CardSendResult(position, card, response)
+
+        def submit(row: tuple) -> Future:
+            position, card = row
+            try:
+                body, shipping_address = _build_card_stream_body(card)
+                duplicate = _reserve_send(self._duplicate_index, 'card', card['template_id'], card['shipping_address'], card.get('send_date'))
+            except (exceptions.CardSendError, exceptions.ShippingAddressError, exceptions.DateFormatError, exceptions.DuplicateCardError) as e:
+                return _completed(CardSendResult(position, card, error=e))
+            future = executor.submit(send, position, card, body, shipping_address, duplicate)
+            if duplicate is not None:
+                future.add_done_callback(partial(release_cancelled, duplicate))
+            return future
+
+        def release_cancelled(duplicate: str, future: Future) -> None:
+            # A card cancelled before it was sent, when the stream is closed early, was never made
+            if future.cancelled():
+                self._duplicate_index.release(duplicate, sent=False)
+
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        try:
+            yield from _windowed(submit, enumerate(cards), 2 * max_in_flight, ordered)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def send_campaign_cost(
         self,
@@ -836,63 +1390,55 @@ class AMcardsClient:
         :raises PhoneFormatError: When the ``phone_number`` is not a digit string of length 10.
 
         """
-        # Validate shipping address
-        missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
-        if missings:
-            error_message = 'Missing the following required shipping address fields: ' + ', '.join(missings)
-            raise exceptions.ShippingAddressError(error_message)
-
-        # Validate send date
-        if send_date is not None and not helpers.is_valid_date(send_date):
-            error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-
-        # Sanitize shipping address and return address
-        shipping_address = helpers.sanitize_shipping_address_for_campaign_send(shipping_address)
-        if return_address is not None:
-            return_address = helpers.sanitize_return_address(return_address)
-            # prefix return address fields with return_
-            return_address = {f'return_{key}': value for key, value in return_address.items()}
-
-        # Validate birth_date
-        if 'birth_date' in shipping_address and not helpers.is_valid_birthdate(shipping_address['birth_date']):
-            error_message = 'Invalid birth_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-        # Validate anniversary_date
-        if 'anniversary_date' in shipping_address and not helpers.is_valid_date(shipping_address['anniversary_date']):
-            error_message = 'Invalid anniversary_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-        # Validate phone_number
-        if 'phone_number' in shipping_address and not helpers.is_valid_phone(shipping_address['phone_number']):
-            error_message = 'Invalid phone_number format, please specify phone as a 10 number string with no special formatting (ex. 15556667777), or omit it'
-            raise exceptions.PhoneFormatError(error_message)
-
-        # Build request json payload
-        body = {
-            'campaign_id': campaign_id,
-            'recipients': [shipping_address],
-        }
+        body = _build_campaign_cost_body(campaign_id, shipping_address, return_address, send_date)
+        res = self._request('POST', '/campaigns/calculate-campaign-price/', json=body)
+        return _handle_campaign_cost_response(res, campaign_id)
+
+    def send_campaign_cost_many(
+        self,
+        campaign_id: str | int,
+        recipients: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        max_workers: int = 8,
+    ) -> BatchCost:
+        """Get cost for sending a drip campaign to each of several recipients. Without actually sending the campaign.
 
-        if return_address is not None:
-            body |= return_address
+        Identical recipients are priced once, and up to ``max_workers`` pricing requests are made at the same time.
 
-        if send_date is not None:
-            body |= {'send_date': send_date}
+            .. code-block::
+
+                >>> res = client.send_campaign_cost_many(campaign_id='123', recipients=recipients)
+                >>> res.costs
+                [1326, 1326, 1578]
+                >>> res.total_cost
+                4230
+
+        :param str or int campaign_id: Unique id for the :py:class:`drip campaign <amcards.models.Campaign>` you are getting cost for.
+        :param List[dict] recipients: List of shipping details, each in the same form as ``shipping_address`` in :py:meth:`send_campaign_cost`.
+        :param Optional[dict] return_address: Dict of return details that will override the client's AMcards user default return details, same as :py:meth:`send_campaign_cost`.
+        :param Optional[str] send_date: The date the drip campaign should be sent, in ``"YYYY-MM-DD"`` format.
+        :param int max_workers: Defaults to ``8``. Max number of pricing requests made at the same time.
 
-        if 'birth_date' in shipping_address:
-            body['recipients'][0]['birth_day'] = shipping_address['birth_date'][-2:]
-            body['recipients'][0]['birth_month'] = shipping_address['birth_date'][-5:-3]
+        :return: Cost for each recipient and the total, in `cents`.
+        :rtype: :py:class:`BatchCost <amcards.models.BatchCost>`
 
-        res = requests.post(f'{DOMAIN}/campaigns/calculate-campaign-price/', json=body, headers=self._HEADERS)
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+        :raises ForbiddenCampaignError: When the client does not own the :py:class:`campaign <amcards.models.Campaign>` specified by ``campaign_id``.
+        :raises ShippingAddressError: When some items in ``recipients`` are missing some `required` keys.
+        :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
+        :raises PhoneFormatError: When the ``phone_number`` of some item in ``recipients`` is not a digit string of length 10.
+
+        """
+        bodies, keys = _build_campaign_cost_bodies(campaign_id, recipients, return_address, send_date)
 
-        # Check for errors
-        match res.status_code:
-            case 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            case 403:
-                raise exceptions.ForbiddenCampaignError(f'Clients\' user does not own given campaign with id of {campaign_id}')
+        def price(body: dict) -> int:
+            res = self._request('POST', '/campaigns/calculate-campaign-price/', json=body)
+            return _handle_campaign_cost_response(res, campaign_id)
 
-        return res.json()['pricing']['total_cost']
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            costs = dict(zip(bodies, executor.map(price, bodies.values())))
+        return BatchCost([costs[key] for key in keys])
 
     def send_campaign(
         self,
@@ -902,6 +1448,7 @@ class AMcardsClient:
         return_address: dict = None,
         send_date: str = None,
         extra_data: dict = None,
+        idempotency_key: Optional[str] = None,
     ) -> CampaignResponse:
         """Attempt to send a drip campaign.
 
@@ -978,6 +1525,8 @@ class AMcardsClient:
                     'carMake': 'Honda',                      # OPTIONAL
                 }
 
+        :param Optional[str] idempotency_key: Defaults to ``None``. Sent as the ``Idempotency-Key`` header. Marks the request as safe to retry after a connection error, ``429`` or ``5xx``, use a value unique to this send (for example the id of the event that triggered it).
+
         :return: AMcards' :py:class:`response <amcards.models.CampaignResponse>` for sending a single drip campaign.
         :rtype: :py:class:`CampaignResponse <amcards.models.CampaignResponse>`
 
@@ -988,76 +1537,19 @@ class AMcardsClient:
         :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
         :raises PhoneFormatError: When the ``phone_number`` is not a digit string of length 10.
         :raises InsufficientCreditsError: When the client's user has insufficient credits in their balance.
-        :raises DuplicateCampaignError: When AMcards detects this :py:class:`campaign <amcards.models.Campaign>` specified by ``campaign_id`` is a duplicate and ``send_if_duplicate`` in :py:class:`Campaign <amcards.models.Campaign>` is ``False``.
+        :raises DuplicateCampaignError: When AMcards detects this :py:class:`campaign <amcards.models.Campaign>` specified by ``campaign_id`` is a duplicate and ``send_if_duplicate`` in :py:class:`Campaign <amcards.models.Campaign>` is ``False``, or when the client's ``duplicate_index`` already holds this campaign, sent to this recipient for this ``send_date``, in which case no request is sent.
 
         """
-        # Validate shipping address
-        missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
-        if missings:
-            error_message = 'Missing the following required shipping address fields: ' + ', '.join(missings)
-            raise exceptions.ShippingAddressError(error_message)
-
-        # Validate send date
-        if send_date is not None and not helpers.is_valid_date(send_date):
-            error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-
-        # Sanitize shipping address and return address
-        shipping_address = helpers.sanitize_shipping_address_for_campaign_send(shipping_address)
-        if return_address is not None:
-            return_address = helpers.sanitize_return_address(return_address)
-            # prefix return address fields with return_
-            return_address = {f'return_{key}': value for key, value in return_address.items()}
-
-        # Validate birth_date
-        if 'birth_date' in shipping_address and not helpers.is_valid_birthdate(shipping_address['birth_date']):
-            error_message = f'Invalid birth_date format of "{shipping_address["birth_date"]}", please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-        # Validate anniversary_date
-        if 'anniversary_date' in shipping_address and not helpers.is_valid_date(shipping_address['anniversary_date']):
-            error_message = f'Invalid anniversary_date format of "{shipping_address["anniversary_date"]}", please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-        # Validate phone_number
-        if 'phone_number' in shipping_address and not helpers.is_valid_phone(shipping_address['phone_number']):
-            error_message = 'Invalid phone_number format, please specify phone as a 10 number string with no special formatting (ex. 15556667777), or omit it'
-            raise exceptions.PhoneFormatError(error_message)
-        # Sanitize extra_data
-        extra_data = helpers.sanitize_extra_data(extra_data)
-
-        # Build request json payload
-        body = {
-            'campaign_id': campaign_id,
-            'initiator': initiator,
-        } | shipping_address
-
-        if return_address is not None:
-            body |= return_address
-
-        if send_date is not None:
-            body |= {'send_date': send_date}
-
-        if extra_data is not None:
-            body |= {'extra_data': extra_data}
-
-        res = requests.post(f'{DOMAIN}/campaigns/open-campaign-form/', json=body, headers=self._HEADERS)
-
-        # Check for errors
-        match res.status_code:
-            case 400:
-                raise exceptions.CampaignSendError('Something went wrong when attempting to send a drip campaign')
-            case 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            case 402:
-                raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no cards were scheduled')
-            case 403:
-                raise exceptions.ForbiddenCampaignError(f'Clients\' user does not own given campaign with id of {campaign_id}')
-            case 409:
-                raise exceptions.DuplicateCampaignError('Duplicates were detected, no cards were scheduled')
-
-        res_json = res.json()
-        return CampaignResponse._from_json(res_json | {
-            'shipping_address': shipping_address,
-        })
+        body, sanitized_shipping_address = _build_campaign_send_body(campaign_id, initiator, shipping_address, return_address, send_date, extra_data)
+        duplicate = _reserve_send(self._duplicate_index, 'campaign', campaign_id, shipping_address, send_date)
+        try:
+            res = self._request('POST', '/campaigns/open-campaign-form/', idempotency_key=idempotency_key, json=body)
+            response = _handle_campaign_send_response(res, campaign_id, sanitized_shipping_address)
+        except exceptions.AMcardsException as e:
+            _release_send(self._duplicate_index, duplicate, e)
+            raise
+        _release_send(self._duplicate_index, duplicate)
+        return response
 
     def send_cards(
         self,
@@ -1067,6 +1559,7 @@ class AMcardsClient:
         return_address: dict = None,
         send_date: str = None,
         send_if_error: bool = False,
+        idempotency_key: Optional[str] = None,
     ) -> CardsResponse:
         """Attempt to send multiple cards.
 
@@ -1139,6 +1632,8 @@ class AMcardsClient:
                     }
                 ]
 
+            Addresses are sent as they are. To trim fields, fix countries and get a report of every invalid address rather than an error for the first one, run them through :py:func:`validate_addresses <amcards.validation.validate_addresses>` first and send its ``valid_addresses``.
+
         :param Optional[dict] return_address: Dict of return details that will override the client's AMcards user default return details. Here's an example how the dict might look, all of the keys are optional:
 
             .. code-block::
@@ -1155,6 +1650,7 @@ class AMcardsClient:
 
         :param Optional[str] send_date: The date the card should be sent, If not specified, the card will be scheduled for the following day. The format should be: ``"YYYY-MM-DD"``.
         :param bool send_if_error: Defaults to False. If False, when sending cards to several recipients, if one of the card sends fails, all other card sends will be haulted. If True, only the cards that fail will be haulted, the rest will be scheduled as normal.
+        :param Optional[str] idempotency_key: Defaults to ``None``. Sent as the ``Idempotency-Key`` header. Marks the request as safe to retry after a connection error, ``429`` or ``5xx``, use a value unique to this send (for example the id of the event that triggered it).
 
         :return: AMcards' :py:class:`response <amcards.models.CardsResponse>` for sending multiple cards.
         :rtype: :py:class:`CardsResponse <amcards.models.CardsResponse>`
@@ -1167,62 +1663,652 @@ class AMcardsClient:
         :raises InsufficientCreditsError: When the client's user has insufficient credits in their balance.
 
         """
-        # Validate shipping addresses
-        for idx, shipping_address in enumerate(shipping_addresses):
-            missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
-            if missings:
-                error_message = f'Missing the following required shipping address fields at shipping_addresses[{idx}]: ' + ', '.join(missings)
-                raise exceptions.ShippingAddressError(error_message)
-
-        # Validate send date
-        if send_date is not None and not helpers.is_valid_date(send_date):
-            error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
-            raise exceptions.DateFormatError(error_message)
-
-        # Sanitize shipping addresses and return address
-        shipping_addresses = [helpers.sanitize_shipping_address_for_card_send(shipping_address) for shipping_address in shipping_addresses]
-        if return_address is not None:
-            return_address = helpers.sanitize_return_address(return_address)
-            # prefix return address fields with return_
-            return_address = {f'return_{key}': value for key, value in return_address.items()}
-
-        # Build request json payload
-        body = {
-            'template_id': template_id,
-            'initiator': initiator,
-            'recipients': shipping_addresses,
-            'send_even_if_error': 'true' if send_if_error else 'false',
-            'offset_type': 'before', # This is arbitrary, but we must add it as per https://amcards.com/docs/open-mailing-form/
-            'date_offset': '0', # This is arbitrary, but we must add it as per https://amcards.com/docs/open-mailing-form/
-            'send_type': 'immediate',
-            'send_date': helpers.today(),
-        }
+        body, shipping_addresses = _build_cards_send_body(template_id, initiator, shipping_addresses, return_address, send_date, send_if_error)
+        res = self._request('POST', '/cards/open-mailing-form/', idempotency_key=idempotency_key, json=body)
+        return _handle_cards_send_response(res, template_id, shipping_addresses)
+
+    def send_cards_chunked(
+        self,
+        template_id: str | int,
+        initiator: str,
+        shipping_addresses: List[dict],
+        return_address: dict = None,
+        send_date: str = None,
+        send_if_error: bool = False,
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        idempotency_key: Optional[str] = None,
+    ) -> ChunkedCardsResponse:
+        """Attempt to send multiple cards, split into chunks of at most ``chunk_size`` recipients that are sent concurrently.
+
+        Each chunk is its own :py:meth:`send_cards` request and creates its own :py:class:`mailing <amcards.models.Mailing>`, so a chunk that fails does not affect the others. Every shipping address is validated before any chunk is sent.
+
+            .. code-block::
+
+                >>> res = client.send_cards_chunked(
+                ...     template_id='123',
+                ...     initiator='myintegration123',
+                ...     shipping_addresses=shipping_addresses,
+                ...     chunk_size=1000,
+                ... )
+                >>> res.mailing_ids
+                [29694, 29695, 29697]
+                >>> res.failed_chunks
+                [(error=InsufficientCreditsError("Clients' user has insufficient credits, no card was scheduled"), index=2, rejected=True, shipping_addresses=[...])]
+                >>> retry = client.send_cards_chunked(
+                ...     template_id='123',
+                ...     initiator='myintegration123',
+                ...     shipping_addresses=res.rejected_shipping_addresses,
+                ...     idempotency_key='campaign-2024-05-retry-1',
+                ... )
+
+            Only :py:attr:`rejected <amcards.models.FailedChunk.rejected>` chunks are safe to send again. A chunk that failed with a connection error or a ``5xx`` may have been scheduled: resend it unchanged with the same ``idempotency_key`` and ``chunk_size``, so it keeps its ``Idempotency-Key``, or check whether its mailing was created on AMcards first. Sending a subset of the addresses changes the chunks and their keys, so give it a new ``idempotency_key``.
+
+        :param str or int template_id: Unique id for the :py:class:`template <amcards.models.Template>` you are sending.
+        :param str initiator: Unique identifier of client's user so if multiple users use a single AMcards.com account, a card can be identified per person.
+        :param List[dict] shipping_addresses: List of shipping details, same as :py:meth:`send_cards`.
+        :param Optional[dict] return_address: Dict of return details that will override the client's AMcards user default return details, same as :py:meth:`send_cards`.
+        :param Optional[str] send_date: The date the cards should be sent, If not specified, the cards will be scheduled for the following day. The format should be: ``"YYYY-MM-DD"``.
+        :param bool send_if_error: Defaults to False. Applies within each chunk, same as :py:meth:`send_cards`.
+        :param int chunk_size: Defaults to ``500``. Max number of recipients per request.
+        :param int max_workers: Defaults to ``4``. Max number of chunks sent at the same time.
+        :param Optional[str] idempotency_key: Defaults to ``None``. Chunk ``i`` is sent with the ``Idempotency-Key`` header ``f"{idempotency_key}-{i}"``, see :py:meth:`send_cards`. Pass the same key and ``chunk_size`` when calling again with the same ``shipping_addresses``.
+
+        :return: AMcards' :py:class:`responses <amcards.models.ChunkedCardsResponse>` for every chunk, and the chunks that failed.
+        :rtype: :py:class:`ChunkedCardsResponse <amcards.models.ChunkedCardsResponse>`
+
+        :raises ShippingAddressError: When some items in ``shipping_addresses`` are missing some `required` keys. No chunks are sent.
+        :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format. No chunks are sent.
+        :raises AuthenticationError: When the client's ``access_token`` is invalid. Chunks not sent yet are not sent.
 
-        if return_address is not None:
-            body |= return_address
-
-        if send_date is not None:
-            body |= {'send_type': 'specific_date', 'send_date': send_date}
-
-        res = requests.post(f'{DOMAIN}/cards/open-mailing-form/', json=body, headers=self._HEADERS)
-
-        # Check for errors
-        match res.status_code:
-            case 400:
-                raise exceptions.CardsSendError('Something went wrong when attempting to send cards')
-            case 401:
-                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
-            case 402:
-                raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no card was scheduled')
-            case 403:
-                raise exceptions.ForbiddenTemplateError(f'Clients\' user does not own given template with id of {template_id}')
-
-        res_json = res.json()
-        return CardsResponse._from_json(res_json | {
-            'shipping_addresses': shipping_addresses,
-        })
-
-def _fix_country(country: str) -> str:
-    if not isinstance(country, str): return ''
-    country = country.upper()
-    return FIXED_COUNTRY.get(country, country)
+        """
+        body, _ = _build_cards_send_body(template_id, initiator, shipping_addresses, return_address, send_date, send_if_error)
+        unauthorized = threading.Event()
+
+        def send_chunk(index: int, chunk_body: dict) -> Optional[CardsResponse]:
+            # Once the access token is rejected, the remaining chunks would all be rejected too
+            if unauthorized.is_set():
+                return None
+            try:
+                res = self._request('POST', '/cards/open-mailing-form/', idempotency_key=_chunk_idempotency_key(idempotency_key, index), json=chunk_body)
+                return _handle_cards_send_response(res, template_id, chunk_body['recipients'])
+            except exceptions.AuthenticationError:
+                unauthorized.set()
+                raise
+
+        chunk_bodies = _chunk_cards_send_body(body, chunk_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(send_chunk, index, chunk_body) for index, chunk_body in enumerate(chunk_bodies)]
+
+        return _chunked_cards_response(chunk_bodies, [future.exception() or future.result() for future in futures])
+
+def _completed(result: Any) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+def _after(futures: List[Future], callback: Callable[[], None]) -> None:
+    # Calls callback once every future is done, from the thread that completes the last one
+    if not futures:
+        callback()
+    else:
+        futures[0].add_done_callback(lambda _: _after(futures[1:], callback))
+
+def _chain(source: Future, target: Future) -> None:
+    # Completes target the way source completes
+    def copy(source: Future) -> None:
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    source.add_done_callback(copy)
+
+def _windowed(submit: Callable[[Any], Future], items: Iterator[Any], window: int, ordered: bool) -> Iterator[Any]:
+    # Only keep a bounded number of items submitted so memory stays proportional to the window, items is not read further until results are consumed
+    if ordered:
+        pending = deque(submit(item) for item in islice(items, window))
+        while pending:
+            result = pending.popleft().result()
+            item = next(items, None)
+            if item is not None:
+                pending.append(submit(item))
+            yield result
+    else:
+        pending = {submit(item) for item in islice(items, window)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = next(items, None)
+                if item is not None:
+                    pending.add(submit(item))
+                yield future.result()
+
+def _coalescing_key(access_token: str, path: str, headers: Optional[dict], kwargs: dict) -> str:
+    # Requests only share a response when everything that goes on the wire is the same
+    return json.dumps([access_token, path, headers, kwargs], sort_keys=True, default=str)
+
+def _chunk_cards_send_body(body: dict, chunk_size: int) -> List[dict]:
+    recipients = body['recipients']
+    return [body | {'recipients': recipients[start:start + chunk_size]} for start in range(0, len(recipients), chunk_size)]
+
+def _chunk_idempotency_key(idempotency_key: Optional[str], index: int) -> Optional[str]:
+    return None if idempotency_key is None else f'{idempotency_key}-{index}'
+
+# Errors raised once AMcards answered and refused a chunk, none of its cards were scheduled. Any other error leaves
+# the outcome unknown: the request may have reached AMcards before the connection dropped or the response was cut
+_CHUNK_REJECTIONS = (
+    exceptions.CardsSendError,
+    exceptions.InsufficientCreditsError,
+    exceptions.ForbiddenTemplateError,
+    exceptions.RateLimitError,
+)
+
+def _chunked_cards_response(chunk_bodies: List[dict], outcomes: list) -> ChunkedCardsResponse:
+    # outcomes holds each chunk's response or exception, None for chunks skipped after an AuthenticationError
+    for outcome in outcomes:
+        if isinstance(outcome, exceptions.AuthenticationError):
+            raise outcome
+    responses, failed_chunks = [], []
+    for index, (chunk_body, outcome) in enumerate(zip(chunk_bodies, outcomes)):
+        if isinstance(outcome, Exception):
+            failed_chunks.append(FailedChunk(index, chunk_body['recipients'], outcome, rejected=isinstance(outcome, _CHUNK_REJECTIONS)))
+        else:
+            responses.append(outcome)
+    return ChunkedCardsResponse(responses, failed_chunks)
+
+def _export_writer(format: str) -> Callable[..., int]:
+    match format:
+        case 'csv': return write_csv
+        case 'ndjson': return write_ndjson
+    raise ValueError(f'Unsupported export format "{format}", use "csv" or "ndjson"')
+
+def _listing_params(limit: int, skip: int, filters: Optional[dict] = None) -> dict:
+    return {
+        'limit': limit,
+        'offset': skip,
+    } | (filters or {})
+
+def _count_params(filters: Optional[dict] = None) -> dict:
+    return {
+        'limit': 1,
+    } | (filters or {})
+
+def _prefix_return_address(return_address: Optional[dict]) -> Optional[dict]:
+    if return_address is None:
+        return None
+    return_address = helpers.sanitize_return_address(return_address)
+    # prefix return address fields with return_
+    return {f'return_{key}': value for key, value in return_address.items()}
+
+def _validate_shipping_address(shipping_address: dict, location: str = '') -> None:
+    missings = helpers.get_missing_required_shipping_address_fields(shipping_address)
+    if missings:
+        error_message = f'Missing the following required shipping address fields{location}: ' + ', '.join(missings)
+        raise exceptions.ShippingAddressError(error_message)
+
+def _validate_send_date(send_date: Optional[str]) -> None:
+    if send_date is not None and not helpers.is_valid_date(send_date):
+        error_message = 'Invalid send_date format, please specify date as "YYYY-MM-DD", or omit it'
+        raise exceptions.DateFormatError(error_message)
+
+def _validate_campaign_recipient(shipping_address: dict, quote_values: bool) -> None:
+    # Validate birth_date and anniversary_date
+    for field, is_valid in (('birth_date', helpers.is_valid_birthdate), ('anniversary_date', helpers.is_valid_date)):
+        if field in shipping_address and not is_valid(shipping_address[field]):
+            value = f' of "{shipping_address[field]}"' if quote_values else ''
+            raise exceptions.DateFormatError(_DATE_MESSAGE.format(field=field, value=value))
+    # Validate phone_number
+    if 'phone_number' in shipping_address and not helpers.is_valid_phone(shipping_address['phone_number']):
+        raise exceptions.PhoneFormatError(_PHONE_MESSAGE)
+
+CONTACT_FIELDS = (
+    'first_name', 'last_name', 'address_line_1', 'city', 'state', 'postal_code', 'country', 'notes', 'email', 'organization',
+    'phone', 'birth_year', 'birth_month', 'birth_day', 'anniversary_year', 'anniversary_month', 'anniversary_day',
+)
+
+def _validate_contact(contact: dict) -> dict:
+    # Returns the keyword arguments of _build_contact_body
+    unknowns = [field for field in contact if field not in CONTACT_FIELDS and field != 'third_party_contact_id']
+    if unknowns:
+        raise exceptions.ContactFormatError('Unknown contact fields: ' + ', '.join(unknowns))
+    missings = helpers.get_missing_required_shipping_address_fields(contact)
+    if missings:
+        raise exceptions.ContactFormatError('Missing the following required contact fields: ' + ', '.join(missings))
+    if contact.get('phone') is not None and not helpers.is_valid_phone(contact['phone']):
+        error_message = 'Invalid phone format, please specify phone as a 10 number string with no special formatting (ex. 5556667777), or omit it'
+        raise exceptions.PhoneFormatError(error_message)
+    for date in ('birth', 'anniversary'):
+        _validate_contact_date(date, contact.get(f'{date}_year'), contact.get(f'{date}_month'), contact.get(f'{date}_day'))
+    return {field: contact[field] for field in CONTACT_FIELDS if contact.get(field) is not None}
+
+def _validate_contact_date(date: str, year: Optional[str], month: Optional[str], day: Optional[str]) -> None:
+    if year is None and month is None and day is None:
+        return
+    if month is not None and day is not None:
+        # Without a year, check the day against a leap year so February 29th is accepted
+        valid = helpers.is_valid_date(f'{year if year is not None else 2000}-{month}-{day}')
+    else:
+        valid = month is None and day is None and isinstance(year, str) and len(year) == 4 and year.isdigit()
+    if not valid:
+        error_message = f'Invalid {date} date, please specify {date}_year as "YYYY", {date}_month as "MM" and {date}_day as "DD", or omit them'
+        raise exceptions.DateFormatError(error_message)
+
+def _prepare_contact_import(user_id: int, index: ContactIndex, position: int, contact: dict) -> tuple:
+    # Returns (result, None, None) for contacts settled locally, (None, body, keys) for contacts to create
+    try:
+        kwargs = _validate_contact(contact)
+    except (exceptions.ContactFormatError, exceptions.PhoneFormatError, exceptions.DateFormatError) as e:
+        return ContactImportResult(position, contact, ContactImportStatus.INVALID, e), None, None
+    keys = contact_keys(contact)
+    if any(key in index for key in keys):
+        return ContactImportResult(position, contact, ContactImportStatus.DUPLICATE), None, None
+    return None, _build_contact_body(user_id, **kwargs), keys
+
+def _earlier_contact_attempts(attempts: dict, keys: List[str]) -> list:
+    # Futures or tasks creating the earlier contacts of the import that share one of keys
+    return [attempt for key in keys for attempt in attempts.get(key, ())]
+
+def _add_contact_attempt(attempts: dict, keys: List[str], attempt: Any) -> None:
+    for key in keys:
+        attempts.setdefault(key, []).append(attempt)
+
+def _any_contact_created(attempts: list) -> bool:
+    # attempts are done, a contact whose create failed or was cancelled does not make later ones duplicates
+    return any(not attempt.cancelled() and attempt.exception() is None and attempt.result().status is ContactImportStatus.CREATED for attempt in attempts)
+
+def _build_contact_body(
+    user_id: int,
+    first_name: str,
+    last_name: str,
+    address_line_1: str,
+    city: str,
+    state: str,
+    postal_code: str,
+    country: Optional[str] = None,
+    notes: Optional[str] = None,
+    email: Optional[str] = None,
+    organization: Optional[str] = None,
+    phone: Optional[str] = None,
+    birth_year: Optional[str] = None,
+    birth_month: Optional[str] = None,
+    birth_day: Optional[str] = None,
+    anniversary_year: Optional[str] = None,
+    anniversary_month: Optional[str] = None,
+    anniversary_day: Optional[str] = None,
+) -> dict:
+    body = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'address_line_1': address_line_1,
+        'city': city,
+        'state': state,
+        'postal_code': postal_code,
+        'owner': f'/.api/v1/user/{user_id}/',
+        'notes': '',
+        'groups': '',
+    }
+
+    if country is not None: body |= {'country': country}
+    if notes is not None: body |= {'notes': notes}
+    if email is not None: body |= {'email_address': email}
+    if organization is not None: body |= {'organization': organization}
+    if phone is not None: body |= {'phone_number': phone}
+    if birth_year is not None: body |= {'birth_year': birth_year}
+    if birth_month is not None: body |= {'birth_month': birth_month}
+    if birth_day is not None: body |= {'birth_day': birth_day}
+    if anniversary_year is not None: body |= {'anniversary_year': anniversary_year}
+    if anniversary_month is not None: body |= {'anniversary_month': anniversary_month}
+    if anniversary_day is not None: body |= {'anniversary_day': anniversary_day}
+    return body
+
+def _prepare_card_cost(shipping_address: dict, return_address: Optional[dict], send_date: Optional[str]) -> tuple:
+    _validate_shipping_address(shipping_address)
+    _validate_send_date(send_date)
+
+    # Sanitize shipping address and return address
+    shipping_address = helpers.sanitize_shipping_address_for_card_send(shipping_address)
+    return_address = _prefix_return_address(return_address)
+    return shipping_address, return_address
+
+def _card_cost(user: User, shipping_address: dict, return_address: Optional[dict]) -> int:
+    shipping_country = helpers.fix_country(shipping_address.get('country'))
+    return_country = helpers.fix_country(user.country)
+    if return_address is not None and 'return_country' in return_address:
+        return_country = helpers.fix_country(return_address['return_country'])
+
+    # If this card is domestic charge domestic postage
+    if shipping_country in user.domestic_postage_countries and return_country in user.domestic_postage_countries:
+        return user.greeting_card_cost + user.domestic_postage_cost
+    # Otherwise charge international postage
+    return user.greeting_card_cost + user.international_postage_cost
+
+def _build_card_send_body(
+    template_id: str | int,
+    initiator: str,
+    shipping_address: dict,
+    return_address: Optional[dict],
+    send_date: Optional[str],
+    message: Optional[str],
+    extra_data: Optional[dict],
+) -> tuple:
+    _validate_shipping_address(shipping_address)
+    _validate_send_date(send_date)
+
+    # Sanitize shipping address, return address and extra_data
+    shipping_address = helpers.sanitize_shipping_address_for_card_send(shipping_address)
+    return_address = _prefix_return_address(return_address)
+    extra_data = helpers.sanitize_extra_data(extra_data)
+
+    # Build request json payload
+    body = {
+        'template_id': template_id,
+        'initiator': initiator,
+    } | shipping_address
+
+    if return_address is not None:
+        body |= return_address
+
+    if send_date is not None:
+        body |= {'send_date': send_date}
+
+    if message is not None:
+        body |= {'message': message}
+
+    if extra_data is not None:
+        body |= {'extra_data': extra_data}
+
+    return body, shipping_address
+
+CARD_STREAM_FIELDS = ('template_id', 'initiator', 'shipping_address', 'return_address', 'send_date', 'message', 'extra_data', 'idempotency_key')
+
+def _build_card_stream_body(card: dict) -> tuple:
+    unknowns = [field for field in card if field not in CARD_STREAM_FIELDS]
+    if unknowns:
+        raise exceptions.CardSendError('Unknown card fields: ' + ', '.join(unknowns))
+    missings = [field for field in ('template_id', 'initiator', 'shipping_address') if card.get(field) is None]
+    if missings:
+        raise exceptions.CardSendError('Missing the following required card fields: ' + ', '.join(missings))
+    return _build_card_send_body(
+        card['template_id'], card['initiator'], card['shipping_address'], card.get('return_address'), card.get('send_date'), card.get('message'), card.get('extra_data'),
+    )
+
+def _reserve_send(index: Optional[DuplicateIndex], kind: str, target_id: str | int, shipping_address: dict, send_date: Optional[str]) -> Optional[str]:
+    # Returns the key reserved until the send completes, None without an index
+    if index is None:
+        return None
+    key = duplicate_key(kind, target_id, shipping_address, send_date)
+    if not index.reserve(key):
+        error = exceptions.DuplicateCardError if kind == 'card' else exceptions.DuplicateCampaignError
+        raise error(f'This {kind} was already sent, or is being sent, to this recipient for this date according to the client\'s duplicate_index, no request was sent')
+    return key
+
+def _release_send(index: Optional[DuplicateIndex], key: Optional[str], error: Optional[Exception] = None) -> None:
+    # Records a send that succeeded and releases one AMcards rejected. A send whose outcome is unknown (a connection
+    # error or a 5xx that outlasted the retries) may have been scheduled, it stays reserved so it is not sent twice
+    if key is None:
+        return
+    if error is None:
+        index.release(key, sent=True)
+    elif not isinstance(error, (exceptions.NetworkError, exceptions.ServerError)):
+        index.release(key, sent=False)
+
+def _build_campaign_cost_body(campaign_id: str | int, shipping_address: dict, return_address: Optional[dict], send_date: Optional[str]) -> dict:
+    _validate_shipping_address(shipping_address)
+    _validate_send_date(send_date)
+
+    # Sanitize shipping address and return address
+    shipping_address = helpers.sanitize_shipping_address_for_campaign_send(shipping_address)
+    return_address = _prefix_return_address(return_address)
+    _validate_campaign_recipient(shipping_address, quote_values=False)
+
+    # Build request json payload
+    body = {
+        'campaign_id': campaign_id,
+        'recipients': [shipping_address],
+    }
+
+    if return_address is not None:
+        body |= return_address
+
+    if send_date is not None:
+        body |= {'send_date': send_date}
+
+    if 'birth_date' in shipping_address:
+        body['recipients'][0]['birth_day'] = shipping_address['birth_date'][-2:]
+        body['recipients'][0]['birth_month'] = shipping_address['birth_date'][-5:-3]
+
+    return body
+
+def _build_campaign_cost_bodies(campaign_id: str | int, recipients: List[dict], return_address: Optional[dict], send_date: Optional[str]) -> tuple:
+    # Returns the distinct request bodies keyed by their canonical json, and each recipient's key in order
+    bodies = {}
+    keys = []
+    for idx, recipient in enumerate(recipients):
+        try:
+            body = _build_campaign_cost_body(campaign_id, recipient, return_address, send_date)
+        except exceptions.AMcardsException as e:
+            raise type(e)(f'{e} (at recipients[{idx}])') from e
+        key = json.dumps(body, sort_keys=True)
+        bodies.setdefault(key, body)
+        keys.append(key)
+    return bodies, keys
+
+def _build_campaign_send_body(
+    campaign_id: str | int,
+    initiator: str,
+    shipping_address: dict,
+    return_address: Optional[dict],
+    send_date: Optional[str],
+    extra_data: Optional[dict],
+) -> tuple:
+    _validate_shipping_address(shipping_address)
+    _validate_send_date(send_date)
+
+    # Sanitize shipping address and return address
+    shipping_address = helpers.sanitize_shipping_address_for_campaign_send(shipping_address)
+    return_address = _prefix_return_address(return_address)
+    _validate_campaign_recipient(shipping_address, quote_values=True)
+    # Sanitize extra_data
+    extra_data = helpers.sanitize_extra_data(extra_data)
+
+    # Build request json payload
+    body = {
+        'campaign_id': campaign_id,
+        'initiator': initiator,
+    } | shipping_address
+
+    if return_address is not None:
+        body |= return_address
+
+    if send_date is not None:
+        body |= {'send_date': send_date}
+
+    if extra_data is not None:
+        body |= {'extra_data': extra_data}
+
+    return body, shipping_address
+
+def _build_cards_send_body(
+    template_id: str | int,
+    initiator: str,
+    shipping_addresses: List[dict],
+    return_address: Optional[dict],
+    send_date: Optional[str],
+    send_if_error: bool,
+) -> tuple:
+    # Validate and sanitize shipping addresses column by column, values are sent as they were passed
+    batch = validate_addresses(shipping_addresses, kind='card', normalize=False)
+    if batch.errors:
+        idx = batch.errors[0].index
+        missings = [error.field for error in batch.errors if error.index == idx]
+        raise exceptions.ShippingAddressError(f'Missing the following required shipping address fields at shipping_addresses[{idx}]: ' + ', '.join(missings))
+    _validate_send_date(send_date)
+
+    # Sanitize return address
+    shipping_addresses = batch.addresses
+    return_address = _prefix_return_address(return_address)
+
+    # Build request json payload
+    body = {
+        'template_id': template_id,
+        'initiator': initiator,
+        'recipients': shipping_addresses,
+        'send_even_if_error': 'true' if send_if_error else 'false',
+        'offset_type': 'before', # This is arbitrary, but we must add it as per https://amcards.com/docs/open-mailing-form/
+        'date_offset': '0', # This is arbitrary, but we must add it as per https://amcards.com/docs/open-mailing-form/
+        'send_type': 'immediate',
+        'send_date': helpers.today(),
+    }
+
+    if return_address is not None:
+        body |= return_address
+
+    if send_date is not None:
+        body |= {'send_type': 'specific_date', 'send_date': send_date}
+
+    return body, shipping_addresses
+
+# Response handlers are shared by AMcardsClient and AsyncAMcardsClient, so they only rely on the
+# status_code, text and json() members common to requests and httpx responses.
+
+def _raise_for_transient_status(res) -> None:
+    # Raised once retries are exhausted, before the endpoint specific handlers try to parse the body
+    if res.status_code == 429:
+        raise exceptions.RateLimitError(f'AMcards is throttling requests, retry after: {res.headers.get("Retry-After", "unknown")}. AMcards Body: {res.text}.')
+    if res.status_code >= 500:
+        raise exceptions.ServerError(f'AMcards failed to process the request. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+
+def _handle_user_response(res) -> User:
+    if res.status_code >= 400:
+        raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+
+    user_json = res.json().get('objects', [{}])[0]
+    return User._from_json(user_json)
+
+def _handle_objects_response(res, resource_name: str) -> List[dict]:
+    if res.status_code >= 400:
+        if res.status_code == 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        raise exceptions.AMcardsException(f'Something went wrong when fetching {resource_name}. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+
+    return res.json().get('objects', [])
+
+def _handle_listing_response(res, model: type, resource_name: str, lazy: bool = False) -> list:
+    objects_json = _handle_objects_response(res, resource_name)
+    if lazy:
+        return [model._from_json(object_json, lazy=True) for object_json in objects_json]
+    return [model._from_json(object_json) for object_json in objects_json]
+
+def _handle_contacts_response(res, lazy: bool = False) -> List[Contact]:
+    if res.status_code >= 400:
+        raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+
+    contacts_json = res.json().get('objects', [])
+    return [Contact._from_json(contact_json, lazy=lazy) for contact_json in contacts_json]
+
+def _handle_count_response(res, resource_name: str) -> int:
+    if res.status_code >= 400:
+        if res.status_code == 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        raise exceptions.AMcardsException(f'Something went wrong when fetching {resource_name}. AMcards Status Code: {res.status_code}, AMcards Body: {res.text}.')
+
+    return res.json()['meta']['total_count']
+
+def _handle_detail_response(res, model: type, forbidden_error: type, resource_name: str):
+    if res.status_code >= 400:
+        if res.status_code in (403, 404):
+            raise forbidden_error(f'The {resource_name} for the specified id either does not exist or is not owned by the client\'s user')
+        raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+
+    return model._from_json(res.json())
+
+def _handle_create_contact_response(res) -> None:
+    if res.status_code >= 400:
+        if res.status_code == 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        raise exceptions.AMcardsException('Something went wrong when trying to create a contact')
+
+def _handle_delete_contact_response(res) -> None:
+    if res.status_code >= 400:
+        if res.status_code in (403, 404):
+            raise exceptions.ForbiddenContactError('The contact for the specified id either does not exist or is not owned by the client\'s user')
+        raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+
+def _handle_card_send_response(res, template_id: str | int, shipping_address: dict) -> CardResponse:
+    # Check for errors
+    match res.status_code:
+        case 400:
+            raise exceptions.CardSendError('Something went wrong when attempting to send a card')
+        case 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        case 402:
+            raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no card was scheduled')
+        case 403:
+            raise exceptions.ForbiddenTemplateError(f'Clients\' user does not own given template with id of {template_id}')
+
+    res_json = res.json()
+    return CardResponse._from_json(res_json | {
+        'shipping_address': shipping_address,
+    })
+
+def _handle_campaign_cost_response(res, campaign_id: str | int) -> int:
+    # Check for errors
+    match res.status_code:
+        case 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        case 403:
+            raise exceptions.ForbiddenCampaignError(f'Clients\' user does not own given campaign with id of {campaign_id}')
+
+    return res.json()['pricing']['total_cost']
+
+def _handle_campaign_send_response(res, campaign_id: str | int, shipping_address: dict) -> CampaignResponse:
+    # Check for errors
+    match res.status_code:
+        case 400:
+            raise exceptions.CampaignSendError('Something went wrong when attempting to send a drip campaign')
+        case 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        case 402:
+            raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no cards were scheduled')
+        case 403:
+            raise exceptions.ForbiddenCampaignError(f'Clients\' user does not own given campaign with id of {campaign_id}')
+        case 409:
+            raise exceptions.DuplicateCampaignError('Duplicates were detected, no cards were scheduled')
+
+    res_json = res.json()
+    return CampaignResponse._from_json(res_json | {
+        'shipping_address': shipping_address,
+    })
+
+def _handle_cards_send_response(res, template_id: str | int, shipping_addresses: List[dict]) -> CardsResponse:
+    # Check for errors
+    match res.status_code:
+        case 400:
+            raise exceptions.CardsSendError('Something went wrong when attempting to send cards')
+        case 401:
+            raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+        case 402:
+            raise exceptions.InsufficientCreditsError('Clients\' user has insufficient credits, no card was scheduled')
+        case 403:
+            raise exceptions.ForbiddenTemplateError(f'Clients\' user does not own given template with id of {template_id}')
+
+    res_json = res.json()
+    return CardsResponse._from_json(res_json | {
+        'shipping_addresses': shipping_addresses,
+    })
+
+def _token_refresh_payload(oauth_config: dict) -> dict:
+    return {
+        'grant_type': 'refresh_token',
+        'refresh_token': oauth_config['refresh_token'],
+        'client_id': oauth_config['client_id'],
+        'client_secret': oauth_config['client_secret'],
+    }
+
+def _handle_token_refresh_response(res) -> dict:
+    # Make sure the refresh was successful
+    if res.status_code >= 400:
+        raise exceptions.OAuthTokenRefreshError('Something went wrong when attempting to refresh AMcards access_token')
+    return res.json()
@@ -0,0 +1,223 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+# Resources cached by ResponseCache, named after the client methods that fetch them
+RESOURCES = ('template', 'quicksend', 'campaign', 'mailing', 'card')
+
+DEFAULT_TTLS = {
+    'template': 3600.0,
+    'quicksend': 3600.0,
+    'campaign': 3600.0,
+    'mailing': 60.0,
+    'card': 60.0,
+}
+
+
+class CacheEntry(NamedTuple):
+    """A cached response body with the validators AMcards sent along with it."""
+    body: dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires: float
+
+
+class CacheStore:
+    """In-memory LRU store of a :py:class:`ResponseCache`, lost when the process exits. Base class of the persistent stores.
+
+    Subclass it and override :py:meth:`get`, :py:meth:`set`, :py:meth:`delete` and :py:meth:`clear` to keep the entries somewhere else. Stores are called from every thread using the cache and must be thread safe.
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        """In-memory LRU store of a :py:class:`ResponseCache`.
+
+        :param int maxsize: Defaults to ``1024``. Max number of entries kept, the least recently used ones are evicted first.
+
+        """
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Entry stored under ``key``, expired or not. ``None`` if there is none.
+
+        :rtype: Optional[CacheEntry]
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Stores ``entry`` under ``key``, replacing the previous one."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Removes the entry stored under ``key``, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheStore(CacheStore):
+    """LRU store kept in a SQLite database, shared by every process that opens the same file and kept across restarts."""
+    def __init__(self, path: str, maxsize: int = 100_000) -> None:
+        """LRU store kept in a SQLite database.
+
+        :param str path: Database file, created if it does not exist. May be shared with other tables.
+        :param int maxsize: Defaults to ``100000``. Max number of entries kept, the least recently used ones are evicted first.
+
+        """
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS amcards_cache (key TEXT PRIMARY KEY, entry TEXT NOT NULL, used REAL NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS amcards_cache_used ON amcards_cache (used)')
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock, self._connection:
+            row = self._connection.execute('SELECT entry FROM amcards_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute('UPDATE amcards_cache SET used = ? WHERE key = ?', (time.time(), key))
+        return CacheEntry(*json.loads(row[0]))
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO amcards_cache (key, entry, used) VALUES (?, ?, ?)', (key, json.dumps(entry), time.time()))
+            self._connection.execute(
+                'DELETE FROM amcards_cache WHERE key IN (SELECT key FROM amcards_cache ORDER BY used DESC LIMIT -1 OFFSET ?)', (self._maxsize,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM amcards_cache WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM amcards_cache')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM amcards_cache').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+class ResponseCache:
+    """Read-through cache of the single objects fetched by :py:meth:`template <amcards.amcards.AMcardsClient.template>`, :py:meth:`quicksend <amcards.amcards.AMcardsClient.quicksend>`, :py:meth:`campaign <amcards.amcards.AMcardsClient.campaign>`, :py:meth:`mailing <amcards.amcards.AMcardsClient.mailing>` and :py:meth:`card <amcards.amcards.AMcardsClient.card>`.
+
+    A fresh entry is returned without a request. Once an entry expires, it is revalidated with ``If-None-Match`` or ``If-Modified-Since`` when AMcards sent an ``ETag`` or ``Last-Modified`` header with it, and fetched again otherwise. Failed lookups are never cached.
+
+        .. code-block::
+
+            >>> from amcards import AMcardsClient
+            >>> from amcards.cache import ResponseCache, SQLiteCacheStore
+            >>> cache = ResponseCache(SQLiteCacheStore('amcards-cache.db'), ttls={'card': 0})
+            >>> client = AMcardsClient('youraccesstoken', cache=cache)
+            >>> template = client.template(123)
+            >>> template = client.template(123)
+            >>> cache.hits, cache.misses
+            (1, 1)
+
+    Entries are keyed on the client's ``domain`` and the object's path, not on its ``access_token``: only share a cache between clients of the same AMcards account.
+    """
+    def __init__(self, store: Optional[CacheStore] = None, ttls: Optional[Dict[str, float]] = None) -> None:
+        """Read-through cache of single object lookups.
+
+        :param Optional[CacheStore] store: Defaults to ``None``. Where entries are kept, for example a :py:class:`SQLiteCacheStore`. If not specified, up to 1024 entries are kept in memory.
+        :param Optional[Dict[str, float]] ttls: Defaults to ``None``. Seconds an entry stays fresh, per resource: any of ``"template"``, ``"quicksend"``, ``"campaign"``, ``"mailing"`` and ``"card"``. ``0`` disables caching of that resource. Resources not specified keep their default: an hour for templates, quicksend templates and campaigns, a minute for mailings and cards.
+
+        :raises ValueError: When ``ttls`` contains an unknown resource.
+
+        """
+        ttls = ttls or {}
+        for resource in ttls:
+            if resource not in RESOURCES:
+                raise ValueError(f'Unknown resource "{resource}", use one of: ' + ', '.join(RESOURCES))
+        self._store = store if store is not None else CacheStore()
+        self._ttls = DEFAULT_TTLS | ttls
+        self._lock = threading.Lock()
+        self.hits = 0
+        """Number of lookups answered from the cache without a request."""
+        self.misses = 0
+        """Number of lookups that sent a request, including revalidations."""
+        self.revalidations = 0
+        """Number of expired entries AMcards confirmed as unchanged with a ``304 Not Modified``, without sending them again."""
+
+    @property
+    def store(self) -> CacheStore:
+        """The store entries are kept in."""
+        return self._store
+
+    def caches(self, resource: str) -> bool:
+        """True if entries of ``resource`` are cached.
+
+        :rtype: bool
+
+        """
+        return self._ttls.get(resource, 0) > 0
+
+    def invalidate(self, key: str) -> None:
+        """Removes the entry cached under ``key``, the URL of the object, for example ``"https://amcards.com/.api/v1/template/123/"``."""
+        self._store.delete(key)
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        self._store.clear()
+        with self._lock:
+            self.hits = self.misses = self.revalidations = 0
+
+    def _count(self, hits: int = 0, misses: int = 0, revalidations: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.revalidations += revalidations
+
+    def _lookup(self, key: str) -> Tuple[Optional[dict], Optional[CacheEntry], dict]:
+        # Returns the fresh body, or the expired entry and the headers revalidating it
+        entry = self._store.get(key)
+        if entry is not None and entry.expires > time.time():
+            self._count(hits=1)
+            return entry.body, entry, {}
+        self._count(misses=1)
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        return None, entry, headers
+
+    def _update(self, resource: str, key: str, entry: Optional[CacheEntry], res) -> Optional[dict]:
+        # Returns the body to build the model from, None when the response is an error left to the caller or a 304 without an entry
+        expires = time.time() + self._ttls[resource]
+        if res.status_code == 304 and entry is not None:
+            self._count(revalidations=1)
+            self._store.set(key, entry._replace(expires=expires))
+            return entry.body
+        if res.status_code != 200:
+            self._store.delete(key)
+            return None
+        body = res.json()
+        self._store.set(key, CacheEntry(body, res.headers.get('ETag'), res.headers.get('Last-Modified'), expires))
+        return body
@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+from typing import Iterable, List
+
+from .models import Contact
+
+
+def contact_keys(contact: dict) -> List[str]:
+    """Keys identifying a contact in a :py:class:`ContactIndex`: one for its ``third_party_contact_id`` and one for its email, normalized to lowercase, when present.
+
+    :param dict contact: The contact's details, as passed to :py:meth:`create_contacts <amcards.amcards.AMcardsClient.create_contacts>`.
+
+    :rtype: List[str]
+
+    """
+    keys = []
+    third_party_contact_id = str(contact.get('third_party_contact_id') or '').strip()
+    if third_party_contact_id:
+        keys.append(f'third_party_contact_id:{third_party_contact_id}')
+    email = (contact.get('email') or '').strip().lower()
+    if email:
+        keys.append(f'email:{email}')
+    return keys
+
+
+class ContactIndex:
+    """In-memory index of the contacts already imported by :py:meth:`create_contacts <amcards.amcards.AMcardsClient.create_contacts>`, lost when the process exits. Base class of the persistent indexes.
+
+    Subclass it and override :py:meth:`__contains__`, :py:meth:`add` and :py:meth:`__len__` to keep the index somewhere else. Indexes are updated from the import's worker threads and must be thread safe.
+    """
+    def __init__(self) -> None:
+        """In-memory index of imported contacts."""
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add(self, keys: Iterable[str]) -> None:
+        """Adds the :py:func:`keys <contact_keys>` of an imported contact."""
+        with self._lock:
+            self._keys.update(keys)
+
+    def add_contacts(self, contacts: Iterable[Contact]) -> None:
+        """Adds existing contacts, so importing them again is skipped. AMcards contacts have no ``third_party_contact_id``, they are indexed by email.
+
+            .. code-block::
+
+                >>> index = ContactIndex()
+                >>> index.add_contacts(client.iter_contacts())
+
+        :param Iterable[Contact] contacts: The :py:class:`contacts <amcards.models.Contact>` to add.
+
+        """
+        for contact in contacts:
+            self.add(contact_keys({'email': contact.email}))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SQLiteContactIndex(ContactIndex):
+    """Index kept in a SQLite database. Pass the same file to an import that was interrupted or had failed rows to resume it: every contact created by the previous run is skipped."""
+    def __init__(self, path: str) -> None:
+        """Index kept in a SQLite database.
+
+        :param str path: Database file, created if it does not exist. May be shared with other tables.
+
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS amcards_contact_index (key TEXT PRIMARY KEY)')
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._connection.execute('SELECT 1 FROM amcards_contact_index WHERE key = ?', (key,)).fetchone() is not None
+
+    def add(self, keys: Iterable[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR IGNORE INTO amcards_contact_index (key) VALUES (?)', ((key,) for key in keys))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM amcards_contact_index').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
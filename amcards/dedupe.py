@@ -0,0 +1,203 @@
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from datetime import date, timedelta
+from typing import Optional
+
+from . import __helpers as helpers
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def duplicate_key(kind: str, target_id: str | int, shipping_address: dict, send_date: Optional[str] = None) -> str:
+    """Key of a send in a :py:class:`DuplicateIndex`: the same template or campaign, sent to the same recipient for the same date, gets the same key.
+
+    The recipient is identified by its name, organization, address, country and ``third_party_contact_id``, compared case and whitespace insensitively. Unlike :py:func:`send_key <amcards.outbox.send_key>`, the ``initiator`` is not part of the key, so two integrations sending the same card are caught too.
+
+    :param str kind: ``"card"`` or ``"campaign"``.
+    :param str or int target_id: Unique id of the template or campaign sent.
+    :param dict shipping_address: Shipping details of the recipient.
+    :param Optional[str] send_date: Defaults to ``None``. Date the send is scheduled for. If not specified, tomorrow, the date AMcards schedules it for.
+
+    :rtype: str
+
+    """
+    send_date = send_date if send_date is not None else (date.today() + timedelta(days=1)).isoformat()
+    return json.dumps([kind, str(target_id), helpers.normalize_recipient(shipping_address), send_date], sort_keys=True)
+
+
+class DuplicateIndex:
+    """In-memory index of the sends already made, lost when the process exits. Base class of the persistent indexes.
+
+    Keys are stored as 64-bit hashes, two distinct sends share a hash with a probability around ``len(index) / 2**64``. Subclass it and override :py:meth:`__contains__`, :py:meth:`add` and :py:meth:`__len__` to keep the index somewhere else. Indexes are updated from the threads sending cards and must be thread safe.
+
+    Clients :py:meth:`reserve` a send before its request and :py:meth:`release` it once AMcards answered, so two threads or tasks sending the same card at once through clients sharing the index send it once. Reservations are kept in memory, they are not seen by other processes.
+    """
+    def __init__(self) -> None:
+        """In-memory index of the sends already made."""
+        self._hashes = set()
+        self._lock = threading.Lock()
+        self._reserved = set()
+        self._reserved_lock = threading.Lock()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+    def __contains__(self, key: str) -> bool:
+        return self._hash(key) in self._hashes
+
+    def add(self, key: str) -> None:
+        """Records the send with this :py:func:`key <duplicate_key>`."""
+        with self._lock:
+            self._hashes.add(self._hash(key))
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def reserve(self, key: str) -> bool:
+        """Reserves the send with this :py:func:`key <duplicate_key>` if it is neither recorded nor already reserved, in a single atomic step.
+
+        :return: True if the send was reserved and may be made, False if it is a duplicate.
+        :rtype: bool
+
+        """
+        with self._reserved_lock:
+            if key in self._reserved or key in self:
+                return False
+            self._reserved.add(key)
+            return True
+
+    def release(self, key: str, sent: bool) -> None:
+        """Releases a :py:meth:`reserved <reserve>` send.
+
+        :param str key: Key of the send.
+        :param bool sent: True if the send was made, it is then recorded with :py:meth:`add` before its reservation is released. False if AMcards rejected it, so it can be made again.
+
+        """
+        if sent:
+            self.add(key)
+        with self._reserved_lock:
+            self._reserved.discard(key)
+
+
+class FileDuplicateIndex(DuplicateIndex):
+    """Index kept in an append-only file of 8 bytes per send, loaded in memory when the index is created.
+
+    Processes sharing the file only see each other's sends once they reopen it.
+    """
+    def __init__(self, path: str, fsync: bool = False) -> None:
+        """Index kept in an append-only file.
+
+        :param str path: File holding the index, created if it does not exist.
+        :param bool fsync: Defaults to ``False``. If True, every send is synced to disk before :py:meth:`add` returns, so it survives a power loss, not only a crash of the process.
+
+        """
+        super().__init__()
+        hashes = array('Q')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            # A crash while appending can leave a partial hash at the end
+            hashes.frombytes(data[:len(data) - len(data) % hashes.itemsize])
+        self._hashes = set(hashes)
+        self._fsync = fsync
+        self._file = open(path, 'ab')
+
+    def add(self, key: str) -> None:
+        hash = self._hash(key)
+        with self._lock:
+            if hash in self._hashes:
+                return
+            self._hashes.add(hash)
+            self._file.write(struct.pack('<Q', hash))
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Closes the file."""
+        self._file.close()
+
+
+class BloomDuplicateIndex(DuplicateIndex):
+    """Index kept in a memory-mapped Bloom filter file, sized up front. Uses about 29 bits per send at the default ``error_rate``, whatever the number of sends recorded. Every process that opens the same file sees the others' sends as soon as they are recorded, where ``fcntl`` is available.
+
+    A Bloom filter can report a send that was never made as a duplicate, with a probability of ``error_rate`` while it holds up to ``capacity`` sends, rising beyond that. Such a send is rejected and must be made without the index.
+    """
+    _HEADER = struct.Struct('<4sQQQ')
+    _MAGIC = b'AMBF'
+
+    def __init__(self, path: str, capacity: int = 1_000_000, error_rate: float = 1e-6) -> None:
+        """Index kept in a Bloom filter file.
+
+        :param str path: File holding the filter. Created with room for ``capacity`` sends if it does not exist, otherwise opened with the size it was created with.
+        :param int capacity: Defaults to ``1000000``. Number of sends the filter is sized for.
+        :param float error_rate: Defaults to ``1e-6``. Probability that a send never made is reported as a duplicate, while the filter holds up to ``capacity`` sends.
+
+        :raises ValueError: When ``path`` exists but is not a Bloom filter file.
+
+        """
+        self._lock = threading.Lock()
+        self._reserved = set()
+        self._reserved_lock = threading.Lock()
+        if not os.path.exists(path):
+            bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            hashes = max(1, round(bits / capacity * math.log(2)))
+            with open(path, 'wb') as f:
+                f.write(self._HEADER.pack(self._MAGIC, bits, hashes, 0))
+                f.truncate(self._HEADER.size + (bits + 7) // 8)
+        self._file = open(path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        magic, self._bits, self._hashes_per_key, _ = self._HEADER.unpack_from(self._mmap)
+        if magic != self._MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a Bloom filter file')
+
+    def _positions(self, key: str) -> list:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes_per_key)]
+
+    def __contains__(self, key: str) -> bool:
+        offset = self._HEADER.size
+        return all(self._mmap[offset + position // 8] >> (position % 8) & 1 for position in self._positions(key))
+
+    def add(self, key: str) -> None:
+        offset = self._HEADER.size
+        with self._lock:
+            # Bits are set byte by byte, so writers in other processes are kept out while they change
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                added = False
+                for position in self._positions(key):
+                    byte = self._mmap[offset + position // 8]
+                    bit = 1 << (position % 8)
+                    if not byte & bit:
+                        self._mmap[offset + position // 8] = byte | bit
+                        added = True
+                if added:
+                    magic, bits, hashes, count = self._HEADER.unpack_from(self._mmap)
+                    self._HEADER.pack_into(self._mmap, 0, magic, bits, hashes, count + 1)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        """Number of sends recorded."""
+        return self._HEADER.unpack_from(self._mmap)[3]
+
+    def close(self) -> None:
+        """Flushes the filter to disk and closes the file."""
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
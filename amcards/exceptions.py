@@ -24,6 +24,9 @@ class ForbiddenContactError(ForbiddenResourceError):
 class ShippingAddressError(AMcardsException, ValueError):
     """Some shipping address fields are missing or invalid"""
 
+class ContactFormatError(AMcardsException, ValueError):
+    """Contact details are missing required fields or contain unknown ones"""
+
 class AuthenticationError(AMcardsException):
     """Access token provided to client is unauthorized"""
 
@@ -42,6 +45,9 @@ class ExtraDataFormatError(AMcardsException, ValueError):
 class DuplicateCampaignError(AMcardsException):
     """Duplicate campaign detected"""
 
+class DuplicateCardError(AMcardsException):
+    """Duplicate card detected"""
+
 class CardSendError(AMcardsException):
     """Something went wrong when attempting to send a card"""
 
@@ -53,3 +59,12 @@ class CampaignSendError(AMcardsException):
 
 class OAuthTokenRefreshError(AMcardsException):
     """Something went wrong when attempting to refresh AMcards access_token"""
+
+class NetworkError(AMcardsException, OSError):
+    """Could not reach AMcards, the connection failed or timed out"""
+
+class RateLimitError(AMcardsException):
+    """AMcards is throttling the client's requests"""
+
+class ServerError(AMcardsException):
+    """AMcards failed to process the request because of an error on its side"""
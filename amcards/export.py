@@ -0,0 +1,323 @@
+import csv
+import json
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from . import __helpers as helpers
+
+
+NULL_TIMESTAMP = -2 ** 63
+"""Stored in timestamp columns for a missing date, NumPy reads it as ``NaT``."""
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Column kind -> array typecode, None for columns kept as lists
+_TYPECODES = {'int': 'q', 'small_int': 'b', 'bool': 'b', 'timestamp': 'q', 'str': None}
+
+
+class Column:
+    """Describes one column of an export: its name, its kind and how it is read from AMcards' JSON."""
+    __slots__ = ('_name', '_kind', '_extract')
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        extract: Callable[[dict], object],
+    ) -> None:
+        self._name = name
+        self._kind = kind
+        self._extract = extract
+
+    __repr__ = helpers.repr
+
+    @property
+    def name(self) -> str:
+        """Name of the column."""
+        return self._name
+
+    @property
+    def kind(self) -> str:
+        """Kind of the column's values, one of:
+
+        - ``"int"``: 64 bit integers, ids and amounts in `cents`.
+        - ``"small_int"``: 8 bit integers, for example a :py:class:`CardStatus <amcards.models.CardStatus>` value.
+        - ``"bool"``: stored as 8 bit integers, ``0`` or ``1``.
+        - ``"timestamp"``: 64 bit integers, microseconds since ``1970-01-01T00:00:00`` in AMcards' timezone, :py:data:`NULL_TIMESTAMP` when missing.
+        - ``"str"``: Python strings, ``None`` when missing.
+        """
+        return self._kind
+
+
+def _value(key: str) -> Callable[[dict], object]:
+    return lambda json: json.get(key)
+
+def _optional(key: str) -> Callable[[dict], object]:
+    return lambda json: json.get(key) or None
+
+def _timestamp(key: str) -> Callable[[dict], object]:
+    return lambda json: helpers.to_datetime(json.get(key))
+
+def _to_micros(value: Optional[datetime]) -> int:
+    return NULL_TIMESTAMP if value is None else (value - _EPOCH) // _MICROSECOND
+
+
+CARD_COLUMNS: Tuple[Column, ...] = (
+    Column('id', 'int', lambda json: json['id']),
+    Column('status', 'small_int', lambda json: json['status']),
+    Column('amount_charged', 'int', lambda json: int(json['amount_charged'] * 100)),
+    Column('send_date', 'str', _value('send_date')),
+    Column('date_created', 'timestamp', _timestamp('created')),
+    Column('date_last_modified', 'timestamp', _timestamp('last_modified')),
+    Column('date_fulfilled', 'timestamp', _timestamp('fulfilled')),
+    Column('is_international', 'bool', lambda json: bool(json.get('is_international'))),
+    Column('initiator', 'str', _value('initiator')),
+    Column('template_name', 'str', _value('template_name')),
+    Column('campaign_id', 'str', lambda json: None if json.get('campaign_pk') is None else str(json['campaign_pk'])),
+    Column('third_party_contact_id', 'str', _optional('third_party_contact_id')),
+    Column('first_name', 'str', _value('ship_to_first_name')),
+    Column('last_name', 'str', _value('ship_to_last_name')),
+    Column('organization', 'str', _optional('ship_to_organization')),
+    Column('address_line_1', 'str', _value('ship_to_line_1')),
+    Column('city', 'str', _value('ship_to_city')),
+    Column('state', 'str', _value('ship_to_state')),
+    Column('postal_code', 'str', _value('ship_to_postal')),
+    Column('country', 'str', _optional('ship_to_country')),
+)
+"""Columns exported for every :py:class:`card <amcards.models.Card>`, the address columns are the card's shipping address. ``amount_charged`` is in `cents`, ``status`` is the :py:class:`CardStatus <amcards.models.CardStatus>` value and ``campaign_id``, missing for cards not sent by a campaign, is text."""
+
+CONTACT_COLUMNS: Tuple[Column, ...] = (
+    Column('id', 'int', lambda json: int(json['id'])),
+    Column('date_created', 'timestamp', _timestamp('added')),
+    Column('date_last_modified', 'timestamp', _timestamp('updated')),
+    Column('date_last_card_send', 'timestamp', _timestamp('last_card_send_date')),
+    Column('email', 'str', _optional('email_address')),
+    Column('first_name', 'str', _value('first_name')),
+    Column('last_name', 'str', _value('last_name')),
+    Column('organization', 'str', _optional('organization')),
+    Column('address_line_1', 'str', _value('address_line_1')),
+    Column('city', 'str', _value('city')),
+    Column('state', 'str', _value('state')),
+    Column('postal_code', 'str', _value('postal_code')),
+    Column('country', 'str', _optional('country')),
+    Column('phone', 'str', _optional('phone_number')),
+)
+"""Columns exported for every :py:class:`contact <amcards.models.Contact>`."""
+
+
+class Columns:
+    """Column-oriented export of cards or contacts, built straight from AMcards' JSON without creating any models.
+
+    Numeric and timestamp columns are compact ``array.array`` buffers (8 bytes per value, 1 for small ints and bools), text columns are lists of strings, with repeated values stored once.
+
+        .. code-block::
+
+            >>> columns = client.export_cards(filters={'status': 2})
+            >>> len(columns)
+            120000
+            >>> columns['amount_charged'][:3]
+            array('q', [442, 442, 1442])
+            >>> frame = pandas.DataFrame(columns.to_numpy())
+    """
+    __slots__ = ('_columns', '_data', '_strings')
+    def __init__(self, columns: Tuple[Column, ...] = CARD_COLUMNS) -> None:
+        """Empty export with the given columns.
+
+        :param Tuple[Column, ...] columns: Defaults to :py:data:`CARD_COLUMNS`. Columns of the export, :py:data:`CARD_COLUMNS`, :py:data:`CONTACT_COLUMNS` or a subset of either.
+
+        """
+        self._columns = columns
+        self._data = {
+            column.name: array(_TYPECODES[column.kind]) if _TYPECODES[column.kind] else []
+            for column in columns
+        }
+        self._strings = {}
+
+    __repr__ = helpers.repr
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the columns, in order."""
+        return [column.name for column in self._columns]
+
+    def __len__(self) -> int:
+        return len(self._data[self._columns[0].name]) if self._columns else 0
+
+    def __getitem__(self, name: str):
+        return self._data[name]
+
+    def extend(self, objects_json: Iterable[dict]) -> None:
+        """Appends a row for every object.
+
+        :param Iterable[dict] objects_json: Cards or contacts as returned by AMcards' listing endpoints.
+
+        """
+        extracts = [column._extract for column in self._columns]
+        appends = [(self._data[column.name].append, self._converter(column.kind)) for column in self._columns]
+        for object_json in objects_json:
+            # Extract the whole row first so a malformed object leaves no partial row behind
+            row = [extract(object_json) for extract in extracts]
+            for (append, convert), value in zip(appends, row):
+                append(value if convert is None else convert(value))
+
+    def _converter(self, kind: str) -> Optional[Callable]:
+        match kind:
+            case 'timestamp': return _to_micros
+            # Every page decodes its own copy of repeated strings (states, template names...), keep one
+            case 'str': return lambda value: self._strings.setdefault(value, value)
+        return None
+
+    def to_numpy(self) -> Dict[str, 'numpy.ndarray']:
+        """Converts the export to NumPy arrays, ``pandas.DataFrame(columns.to_numpy())`` builds a data frame.
+
+        Numeric columns share memory with the export, timestamps are ``datetime64[us]`` with ``NaT`` when missing, bools are ``bool`` and text columns are ``object`` arrays.
+
+        :return: Array per column name.
+        :rtype: Dict[str, numpy.ndarray]
+
+        :raises ImportError: When ``numpy`` is not installed.
+
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError('Columns.to_numpy requires numpy, install it with: pip install python-amcards[numpy]') from e
+
+        arrays = {}
+        for column in self._columns:
+            data = self._data[column.name]
+            match column.kind:
+                case 'int': arrays[column.name] = numpy.frombuffer(data, dtype=numpy.int64)
+                case 'small_int': arrays[column.name] = numpy.frombuffer(data, dtype=numpy.int8)
+                case 'bool': arrays[column.name] = numpy.frombuffer(data, dtype=numpy.int8).astype(bool)
+                case 'timestamp': arrays[column.name] = numpy.frombuffer(data, dtype=numpy.int64).view('datetime64[us]')
+                case _: arrays[column.name] = numpy.array(data, dtype=object)
+        return arrays
+
+    def to_arrow(self) -> 'pyarrow.Table':
+        """Converts the export to an Arrow table, numeric columns are converted without copying.
+
+        :return: Table with one column per export column, missing values are nulls.
+        :rtype: pyarrow.Table
+
+        :raises ImportError: When ``pyarrow`` is not installed.
+
+        """
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError as e:
+            raise ImportError('Columns.to_arrow requires pyarrow, install it with: pip install python-amcards[arrow]') from e
+
+        arrays = []
+        for column in self._columns:
+            data = self._data[column.name]
+            match column.kind:
+                case 'int':
+                    arrays.append(pyarrow.Array.from_buffers(pyarrow.int64(), len(data), [None, pyarrow.py_buffer(data)]))
+                case 'small_int':
+                    arrays.append(pyarrow.Array.from_buffers(pyarrow.int8(), len(data), [None, pyarrow.py_buffer(data)]))
+                case 'bool':
+                    arrays.append(pyarrow.Array.from_buffers(pyarrow.int8(), len(data), [None, pyarrow.py_buffer(data)]).cast(pyarrow.bool_()))
+                case 'timestamp':
+                    micros = pyarrow.Array.from_buffers(pyarrow.int64(), len(data), [None, pyarrow.py_buffer(data)])
+                    missing = pyarrow.compute.equal(micros, NULL_TIMESTAMP)
+                    arrays.append(pyarrow.compute.if_else(missing, None, micros).cast(pyarrow.timestamp('us')))
+                case _:
+                    arrays.append(pyarrow.array(data, type=pyarrow.string()))
+        return pyarrow.Table.from_arrays(arrays, names=self.names)
+
+    def _rows(self) -> Iterable[tuple]:
+        return zip(*(self._data[column.name] for column in self._columns))
+
+    def write_csv(self, file: TextIO) -> int:
+        """Writes the export as CSV with a header row, formatted as by :py:func:`write_csv`.
+
+        :param TextIO file: Text file opened with ``newline=''``.
+
+        :return: Number of rows written.
+        :rtype: int
+
+        """
+        return _write_csv(file, self._columns, self._rows(), _formatters(self._columns, stored=True, csv=True), header=True)
+
+    def write_ndjson(self, file: TextIO) -> int:
+        """Writes the export as newline delimited JSON, formatted as by :py:func:`write_ndjson`.
+
+        :param TextIO file: Text file.
+
+        :return: Number of rows written.
+        :rtype: int
+
+        """
+        return _write_ndjson(file, self._columns, self._rows(), _formatters(self._columns, stored=True, csv=False))
+
+
+def write_csv(file: TextIO, objects_json: Iterable[dict], columns: Tuple[Column, ...] = CARD_COLUMNS, header: bool = True) -> int:
+    """Streams cards or contacts to CSV, one row per object, without holding more than one row in memory.
+
+    Timestamps are written in ISO 8601, missing values as empty fields and bools as ``0`` or ``1``.
+
+    :param TextIO file: Text file opened with ``newline=''``.
+    :param Iterable[dict] objects_json: Cards or contacts as returned by AMcards' listing endpoints.
+    :param Tuple[Column, ...] columns: Defaults to :py:data:`CARD_COLUMNS`. Columns to write.
+    :param bool header: Defaults to ``True``. If True, a header row with the column names is written first. Pass False when appending to a file that already has one.
+
+    :return: Number of rows written, not counting the header.
+    :rtype: int
+
+    """
+    rows = (tuple(column._extract(object_json) for column in columns) for object_json in objects_json)
+    return _write_csv(file, columns, rows, _formatters(columns, stored=False, csv=True), header)
+
+def write_ndjson(file: TextIO, objects_json: Iterable[dict], columns: Tuple[Column, ...] = CARD_COLUMNS) -> int:
+    """Streams cards or contacts to newline delimited JSON, one object per line, without holding more than one row in memory.
+
+    Timestamps are written in ISO 8601, missing values as ``null``.
+
+    :param TextIO file: Text file.
+    :param Iterable[dict] objects_json: Cards or contacts as returned by AMcards' listing endpoints.
+    :param Tuple[Column, ...] columns: Defaults to :py:data:`CARD_COLUMNS`. Columns to write.
+
+    :return: Number of rows written.
+    :rtype: int
+
+    """
+    rows = (tuple(column._extract(object_json) for column in columns) for object_json in objects_json)
+    return _write_ndjson(file, columns, rows, _formatters(columns, stored=False, csv=False))
+
+def _formatters(columns: Tuple[Column, ...], stored: bool, csv: bool) -> list:
+    # Rows come either straight from the extractors (datetimes, bools) or from stored columns (micros, 0/1)
+    missing = '' if csv else None
+    formatters = []
+    for column in columns:
+        match column.kind:
+            case 'timestamp' if stored:
+                formatters.append(lambda value: missing if value == NULL_TIMESTAMP else (_EPOCH + value * _MICROSECOND).isoformat())
+            case 'timestamp':
+                formatters.append(lambda value: missing if value is None else value.isoformat())
+            case 'bool':
+                formatters.append(int if csv else bool)
+            case _:
+                formatters.append(lambda value: missing if value is None else value)
+    return formatters
+
+def _write_csv(file: TextIO, columns: Tuple[Column, ...], rows: Iterable[tuple], formatters: list, header: bool) -> int:
+    writer = csv.writer(file)
+    if header:
+        writer.writerow([column.name for column in columns])
+    count = 0
+    for row in rows:
+        writer.writerow([format(value) for format, value in zip(formatters, row)])
+        count += 1
+    return count
+
+def _write_ndjson(file: TextIO, columns: Tuple[Column, ...], rows: Iterable[tuple], formatters: list) -> int:
+    names = [column.name for column in columns]
+    count = 0
+    for row in rows:
+        file.write(json.dumps(dict(zip(names, [format(value) for format, value in zip(formatters, row)]))))
+        file.write('\n')
+        count += 1
+    return count
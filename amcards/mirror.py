@@ -0,0 +1,284 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from .models import Card, CardStatus, Contact, Template, Campaign
+from .sync import CardSync, CardStates, SyncStore, _select_card_states
+from . import __helpers as helpers
+
+
+RESOURCES = ('cards', 'contacts', 'templates', 'campaigns')
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS amcards_mirror (key TEXT PRIMARY KEY, value TEXT)',
+    '''CREATE TABLE IF NOT EXISTS amcards_card (
+        id INTEGER PRIMARY KEY,
+        status INTEGER NOT NULL,
+        campaign_id INTEGER,
+        third_party_contact_id TEXT,
+        send_date TEXT,
+        last_modified TEXT NOT NULL,
+        json TEXT NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS amcards_card_status ON amcards_card (status)',
+    'CREATE INDEX IF NOT EXISTS amcards_card_campaign_id ON amcards_card (campaign_id)',
+    'CREATE INDEX IF NOT EXISTS amcards_card_third_party_contact_id ON amcards_card (third_party_contact_id, send_date)',
+    'CREATE INDEX IF NOT EXISTS amcards_card_send_date ON amcards_card (send_date)',
+    '''CREATE TABLE IF NOT EXISTS amcards_contact (
+        id INTEGER PRIMARY KEY,
+        email TEXT,
+        last_modified TEXT,
+        json TEXT NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS amcards_contact_email ON amcards_contact (email)',
+    'CREATE TABLE IF NOT EXISTS amcards_template (id INTEGER PRIMARY KEY, json TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS amcards_campaign (id INTEGER PRIMARY KEY, json TEXT NOT NULL)',
+)
+
+
+class Mirror:
+    """Local SQLite copy of a client's cards, contacts, templates and campaigns, queried without calling the AMcards API.
+
+    Cards are indexed on ``status``, ``campaign_id``, ``third_party_contact_id`` and ``send_date``, contacts on ``email``, and every resource on ``id``. Queries return the usual :py:mod:`models <amcards.models>`.
+
+        .. code-block::
+
+            >>> from amcards import AMcardsClient
+            >>> from amcards.mirror import Mirror
+            >>> from amcards.models import CardStatus
+            >>> mirror = Mirror(AMcardsClient('youraccesstoken'), 'amcards.db')
+            >>> mirror.refresh()
+            >>> flagged = mirror.cards(status=CardStatus.FLAGGED)
+            >>> this_year = mirror.cards(third_party_contact_id='crm42', sent_from='2023-01-01')
+
+    :py:meth:`refresh` is incremental for cards and contacts: only the objects modified since the previous refresh are fetched. Deleted cards and contacts are only dropped by a full refresh. A mirror, like its SQLite connection, must be used from the thread that created it.
+    """
+    def __init__(self, client, path: str, overlap: timedelta = timedelta(minutes=10), page_size: int = 100) -> None:
+        """Local SQLite copy of a client's account data.
+
+        :param AMcardsClient client: The :py:class:`client <amcards.amcards.AMcardsClient>` whose data is mirrored.
+        :param str path: Database file, created if it does not exist. ``":memory:"`` keeps the mirror in memory.
+        :param timedelta overlap: Defaults to 10 minutes. Window before the previous refresh's watermark that is fetched again, see :py:class:`CardSync <amcards.sync.CardSync>`.
+        :param int page_size: Defaults to ``100``. Number of objects fetched per request.
+
+        """
+        self._client = client
+        self._overlap = overlap
+        self._page_size = page_size
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def refresh(self, resources: Iterable[str] = RESOURCES, full: bool = False) -> None:
+        """Brings the mirror up to date with AMcards. Every resource is refreshed in its own transaction, a failed refresh leaves that resource as it was.
+
+        :param Iterable[str] resources: Defaults to all of them. Resources to refresh, any of ``"cards"``, ``"contacts"``, ``"templates"`` and ``"campaigns"``.
+        :param bool full: Defaults to ``False``. If True, the mirrored cards and contacts are dropped and fetched again, removing the ones deleted from AMcards. Templates and campaigns are always fetched in full.
+
+        :raises ValueError: When ``resources`` contains an unknown resource.
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        # Read once, resources may be a generator
+        resources = tuple(resources)
+        for resource in resources:
+            if resource not in RESOURCES:
+                raise ValueError(f'Unknown resource "{resource}", use one of: ' + ', '.join(RESOURCES))
+        for resource in resources:
+            try:
+                match resource:
+                    case 'cards': self._refresh_cards(full)
+                    case 'contacts': self._refresh_contacts(full)
+                    case 'templates': self._replace('amcards_template', self._client._template_objects)
+                    case 'campaigns': self._replace('amcards_campaign', self._client._campaign_objects)
+                self._connection.commit()
+            except BaseException:
+                self._connection.rollback()
+                raise
+
+    def _refresh_cards(self, full: bool) -> None:
+        if full:
+            self._connection.execute('DELETE FROM amcards_card')
+            self._set('card_watermark', None)
+        # CardSync works out which cards are new or changed and the new watermark, _MirrorSyncStore
+        # stores its state in the mirror's own tables
+        sync = CardSync(self._client, _MirrorSyncStore(self), overlap=self._overlap, page_size=self._page_size)
+        for change in sync.changes(all_changes=True):
+            card_json = change.card._json
+            self._connection.execute(
+                'INSERT OR REPLACE INTO amcards_card (id, status, campaign_id, third_party_contact_id, send_date, last_modified, json) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (card_json['id'], card_json['status'], card_json.get('campaign_pk'), card_json.get('third_party_contact_id') or None,
+                 card_json.get('send_date'), change.card.date_last_modified.isoformat(), json.dumps(card_json)),
+            )
+
+    def _refresh_contacts(self, full: bool) -> None:
+        if full:
+            self._connection.execute('DELETE FROM amcards_contact')
+            self._set('contact_watermark', None)
+        watermark = self._get('contact_watermark')
+        watermark = datetime.fromisoformat(watermark) if watermark is not None else None
+        filters = {'updated__gte': (watermark - self._overlap).isoformat()} if watermark is not None else None
+
+        for contact_json in self._client._iter_pages(self._client._contact_objects, self._page_size, 0, True, filters=filters):
+            updated = helpers.to_datetime(contact_json.get('updated'))
+            if updated is not None and (watermark is None or updated > watermark):
+                watermark = updated
+            self._connection.execute(
+                'INSERT OR REPLACE INTO amcards_contact (id, email, last_modified, json) VALUES (?, ?, ?, ?)',
+                (int(contact_json['id']), contact_json.get('email_address') or None, updated.isoformat() if updated else None, json.dumps(contact_json)),
+            )
+        self._set('contact_watermark', watermark.isoformat() if watermark is not None else None)
+
+    def _replace(self, table: str, fetch_page) -> None:
+        self._connection.execute(f'DELETE FROM {table}')
+        for object_json in self._client._iter_pages(fetch_page, self._page_size, 0, True):
+            self._connection.execute(f'INSERT OR REPLACE INTO {table} (id, json) VALUES (?, ?)', (int(object_json['id']), json.dumps(object_json)))
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._connection.execute('SELECT value FROM amcards_mirror WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: Optional[str]) -> None:
+        self._connection.execute('INSERT OR REPLACE INTO amcards_mirror (key, value) VALUES (?, ?)', (key, value))
+
+    def card(self, id: int) -> Optional[Card]:
+        """Mirrored card with a specified id.
+
+        :param int id: Unique id of the card.
+
+        :return: The :py:class:`card <amcards.models.Card>`, ``None`` if it is not mirrored.
+        :rtype: Optional[:py:class:`Card <amcards.models.Card>`]
+
+        """
+        row = self._connection.execute('SELECT json FROM amcards_card WHERE id = ?', (int(id),)).fetchone()
+        return Card._from_json(json.loads(row[0])) if row else None
+
+    def cards(
+        self,
+        status: Optional[CardStatus] = None,
+        campaign_id: Optional[int] = None,
+        third_party_contact_id: Optional[str] = None,
+        sent_from: Optional[str] = None,
+        sent_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Card]:
+        """Mirrored cards matching all of the given conditions, most recently sent first.
+
+        :param Optional[CardStatus] status: Defaults to ``None``. Only cards with this :py:class:`status <amcards.models.CardStatus>`.
+        :param Optional[int] campaign_id: Defaults to ``None``. Only cards sent by this campaign.
+        :param Optional[str] third_party_contact_id: Defaults to ``None``. Only cards sent to the recipient with this ``third_party_contact_id``.
+        :param Optional[str] sent_from: Defaults to ``None``. Only cards with a ``send_date`` on or after this date, in ``"YYYY-MM-DD"`` format.
+        :param Optional[str] sent_to: Defaults to ``None``. Only cards with a ``send_date`` on or before this date, in ``"YYYY-MM-DD"`` format.
+        :param Optional[int] limit: Defaults to ``None``. Max number of cards returned.
+
+        :return: The matching :py:class:`cards <amcards.models.Card>`.
+        :rtype: List[:py:class:`Card <amcards.models.Card>`]
+
+        """
+        conditions, params = [], []
+        for condition, value in (
+            ('status = ?', status.value if status is not None else None),
+            ('campaign_id = ?', int(campaign_id) if campaign_id is not None else None),
+            ('third_party_contact_id = ?', third_party_contact_id),
+            ('send_date >= ?', sent_from),
+            ('send_date <= ?', sent_to),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        query = 'SELECT json FROM amcards_card'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY send_date DESC, id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return [Card._from_json(json.loads(row[0])) for row in self._connection.execute(query, params)]
+
+    def contact(self, id: int) -> Optional[Contact]:
+        """Mirrored contact with a specified id.
+
+        :param int id: Unique id of the contact.
+
+        :return: The :py:class:`contact <amcards.models.Contact>`, ``None`` if it is not mirrored.
+        :rtype: Optional[:py:class:`Contact <amcards.models.Contact>`]
+
+        """
+        row = self._connection.execute('SELECT json FROM amcards_contact WHERE id = ?', (int(id),)).fetchone()
+        return Contact._from_json(json.loads(row[0])) if row else None
+
+    def contacts(self, email: Optional[str] = None, limit: Optional[int] = None) -> List[Contact]:
+        """Mirrored contacts, ordered by id.
+
+        :param Optional[str] email: Defaults to ``None``. Only contacts with this email address.
+        :param Optional[int] limit: Defaults to ``None``. Max number of contacts returned.
+
+        :return: The matching :py:class:`contacts <amcards.models.Contact>`.
+        :rtype: List[:py:class:`Contact <amcards.models.Contact>`]
+
+        """
+        query, params = 'SELECT json FROM amcards_contact', []
+        if email is not None:
+            query += ' WHERE email = ?'
+            params.append(email)
+        query += ' ORDER BY id'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return [Contact._from_json(json.loads(row[0])) for row in self._connection.execute(query, params)]
+
+    def template(self, id: int) -> Optional[Template]:
+        """Mirrored template with a specified id, ``None`` if it is not mirrored.
+
+        :rtype: Optional[:py:class:`Template <amcards.models.Template>`]
+
+        """
+        row = self._connection.execute('SELECT json FROM amcards_template WHERE id = ?', (int(id),)).fetchone()
+        return Template._from_json(json.loads(row[0])) if row else None
+
+    def templates(self) -> List[Template]:
+        """All mirrored templates, ordered by id.
+
+        :rtype: List[:py:class:`Template <amcards.models.Template>`]
+
+        """
+        return [Template._from_json(json.loads(row[0])) for row in self._connection.execute('SELECT json FROM amcards_template ORDER BY id')]
+
+    def campaign(self, id: int) -> Optional[Campaign]:
+        """Mirrored campaign with a specified id, ``None`` if it is not mirrored.
+
+        :rtype: Optional[:py:class:`Campaign <amcards.models.Campaign>`]
+
+        """
+        row = self._connection.execute('SELECT json FROM amcards_campaign WHERE id = ?', (int(id),)).fetchone()
+        return Campaign._from_json(json.loads(row[0])) if row else None
+
+    def campaigns(self) -> List[Campaign]:
+        """All mirrored campaigns, ordered by id.
+
+        :rtype: List[:py:class:`Campaign <amcards.models.Campaign>`]
+
+        """
+        return [Campaign._from_json(json.loads(row[0])) for row in self._connection.execute('SELECT json FROM amcards_campaign ORDER BY id')]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+class _MirrorSyncStore(SyncStore):
+    # CardSync state read from the mirror's card table, saved as part of the refresh transaction
+    def __init__(self, mirror: Mirror) -> None:
+        self._mirror = mirror
+
+    def watermark(self) -> Optional[str]:
+        return self._mirror._get('card_watermark')
+
+    def card_states(self, ids: Iterable[int]) -> CardStates:
+        return _select_card_states(self._mirror._connection, 'amcards_card', ids)
+
+    def save(self, watermark: Optional[str], card_states: CardStates) -> None:
+        # The card rows themselves were written while iterating the changes
+        self._mirror._set('card_watermark', watermark)
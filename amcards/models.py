@@ -1,4 +1,3 @@
-import ast
 from enum import Enum
 from datetime import datetime
 from typing import List, Optional
@@ -9,6 +8,7 @@ from . import __helpers as helpers
 
 class User:
     """Represents an AMcards user."""
+    __slots__ = ('_id', '_first_name', '_last_name', '_credits', '_email', '_phone', '_date_joined', '_address_line_1', '_city', '_state', '_postal_code', '_country', '_domestic_postage_cost', '_international_postage_cost', '_domestic_postage_countries', '_greeting_card_cost')
     def __init__(
         self,
         id: int,
@@ -154,6 +154,7 @@ class User:
 
 class Gift:
     """Represents an AMcards gift."""
+    __slots__ = ('_name', '_thumbnail', '_base_cost', '_shipping_and_handling_cost')
     def __init__(
         self,
         name: str,
@@ -204,6 +205,7 @@ class Gift:
 
 class Template:
     """Represents an AMcards template."""
+    __slots__ = ('_id', '_name', '_message', '_thumbnail', '_gifts', '_gifts_total')
     def __init__(
         self,
         id: int,
@@ -263,6 +265,7 @@ class Template:
 
 class Campaign:
     """Represents an AMcards drip campaign."""
+    __slots__ = ('_id', '_name', '_drip_count', '_send_if_duplicate', '_has_anniversary_drip', '_has_birthday_drip')
     def __init__(
         self,
         id: int,
@@ -341,6 +344,7 @@ class CardStatus(Enum):
 
 class Card:
     """Represents an AMcards card."""
+    __slots__ = ('_id', '_amount_charged', '_status', '_initiator', '_send_date', '_date_created', '_date_last_modified', '_date_fulfilled', '_is_international', '_template_name', '_thumbnail', '_campaign_id', '_shipping_address', '_return_address', '_gifts', '_extra_data', '_json')
     def __init__(
         self,
         id: int,
@@ -376,9 +380,14 @@ class Card:
         self._return_address = return_address
         self._gifts = gifts
         self._extra_data = extra_data
+        self._json = None
 
     __repr__ = helpers.repr
 
+    def __getattr__(self, name: str):
+        # Only reached for the fields of a lazy card that have not been decoded yet
+        return helpers.hydrate(self, name, _CARD_FIELDS)
+
     @property
     def id(self) -> int:
         """Card's unique identifier."""
@@ -502,30 +511,34 @@ class Card:
         return self._extra_data
 
     @classmethod
-    def _from_json(cls, json: dict):
-        return cls(
-            id=json['id'],
-            amount_charged=int(json['amount_charged'] * 100),
-            status=CardStatus(json['status']),
-            initiator=json['initiator'],
-            send_date=json['send_date'],
-            date_created=helpers.to_datetime(json['created']),
-            date_last_modified=helpers.to_datetime(json['last_modified']),
-            date_fulfilled=helpers.to_datetime(json['fulfilled']),
-            is_international=json['is_international'],
-            template_name=json['template_name'],
-            thumbnail=json['thumbnail'],
-            campaign_id=json['campaign_pk'],
-            shipping_address=helpers.parse_shipping_address(json),
-            return_address=helpers.parse_return_address(json),
-            gifts=[Gift(
-                name=gift['name'],
-                thumbnail='',
-                base_cost=gift['price'],
-                shipping_and_handling_cost=gift['shipping_and_handling'],
-            ) for gift in json['gifts']],
-            extra_data=ast.literal_eval(json.get('extra_data') or '{}'),
-        )
+    def _from_json(cls, json: dict, lazy: bool = False):
+        if lazy:
+            return helpers.lazy_model(cls, json)
+        return cls(**{field: decode(json) for field, decode in _CARD_FIELDS.items()})
+
+_CARD_FIELDS = {
+    'id': lambda json: json['id'],
+    'amount_charged': lambda json: int(json['amount_charged'] * 100),
+    'status': lambda json: CardStatus(json['status']),
+    'initiator': lambda json: json['initiator'],
+    'send_date': lambda json: json['send_date'],
+    'date_created': lambda json: helpers.to_datetime(json['created']),
+    'date_last_modified': lambda json: helpers.to_datetime(json['last_modified']),
+    'date_fulfilled': lambda json: helpers.to_datetime(json['fulfilled']),
+    'is_international': lambda json: json['is_international'],
+    'template_name': lambda json: json['template_name'],
+    'thumbnail': lambda json: json['thumbnail'],
+    'campaign_id': lambda json: json['campaign_pk'],
+    'shipping_address': helpers.parse_shipping_address,
+    'return_address': helpers.parse_return_address,
+    'gifts': lambda json: [Gift(
+        name=gift['name'],
+        thumbnail='',
+        base_cost=gift['price'],
+        shipping_and_handling_cost=gift['shipping_and_handling'],
+    ) for gift in json['gifts']],
+    'extra_data': lambda json: helpers.parse_extra_data(json.get('extra_data')),
+}
 
 class MailingStatus(Enum):
     """Represents the status of an AMcards mailing."""
@@ -534,6 +547,7 @@ class MailingStatus(Enum):
 
 class Mailing:
     """Represents an AMcards mailing."""
+    __slots__ = ('_id',)
     def __init__(
         self,
         id: int,
@@ -560,6 +574,7 @@ class Mailing:
 
 class Contact:
     """Represents an AMcards contact."""
+    __slots__ = ('_id', '_date_created', '_date_last_modified', '_date_last_card_send', '_notes', '_email', '_first_name', '_last_name', '_address_line_1', '_city', '_state', '_postal_code', '_country', '_organization', '_phone', '_birth_year', '_birth_month', '_birth_day', '_anniversary_year', '_anniversary_month', '_anniversary_day', '_json')
     def __init__(
         self,
         id: int,
@@ -605,9 +620,14 @@ class Contact:
         self._anniversary_year = anniversary_year
         self._anniversary_month = anniversary_month
         self._anniversary_day = anniversary_day
+        self._json = None
 
     __repr__ = helpers.repr
 
+    def __getattr__(self, name: str):
+        # Only reached for the fields of a lazy contact that have not been decoded yet
+        return helpers.hydrate(self, name, _CONTACT_FIELDS)
+
     @property
     def id(self) -> int:
         """Contact's unique identifier."""
@@ -714,33 +734,38 @@ class Contact:
         return self._anniversary_day
 
     @classmethod
-    def _from_json(cls, json: dict):
-        return cls(
-            id=int(json['id']),
-            date_created=helpers.to_datetime(json['added']),
-            date_last_modified=helpers.to_datetime(json['updated']),
-            date_last_card_send=helpers.to_datetime(json['last_card_send_date']),
-            notes=json['notes'] if json['notes'] else None,
-            email=json['email_address'] if json['email_address'] else None,
-            first_name=json['first_name'],
-            last_name=json['last_name'],
-            address_line_1=json['address_line_1'],
-            city=json['city'],
-            state=json['state'],
-            postal_code=json['postal_code'],
-            country=json['country'] if json['country'] else None,
-            organization=json['organization'] if json['organization'] else None,
-            phone=json['phone_number'] if json['phone_number'] else None,
-            birth_year=json['birth_year'] if json['birth_year'] else None,
-            birth_month=json['birth_month'] if json['birth_month'] else None,
-            birth_day=json['birth_day'] if json['birth_day'] else None,
-            anniversary_year=json['anniversary_year'] if json['anniversary_year'] else None,
-            anniversary_month=json['anniversary_month'] if json['anniversary_month'] else None,
-            anniversary_day=json['anniversary_day'] if json['anniversary_day'] else None,
-        )
+    def _from_json(cls, json: dict, lazy: bool = False):
+        if lazy:
+            return helpers.lazy_model(cls, json)
+        return cls(**{field: decode(json) for field, decode in _CONTACT_FIELDS.items()})
+
+_CONTACT_FIELDS = {
+    'id': lambda json: int(json['id']),
+    'date_created': lambda json: helpers.to_datetime(json['added']),
+    'date_last_modified': lambda json: helpers.to_datetime(json['updated']),
+    'date_last_card_send': lambda json: helpers.to_datetime(json['last_card_send_date']),
+    'notes': lambda json: json['notes'] if json['notes'] else None,
+    'email': lambda json: json['email_address'] if json['email_address'] else None,
+    'first_name': lambda json: json['first_name'],
+    'last_name': lambda json: json['last_name'],
+    'address_line_1': lambda json: json['address_line_1'],
+    'city': lambda json: json['city'],
+    'state': lambda json: json['state'],
+    'postal_code': lambda json: json['postal_code'],
+    'country': lambda json: json['country'] if json['country'] else None,
+    'organization': lambda json: json['organization'] if json['organization'] else None,
+    'phone': lambda json: json['phone_number'] if json['phone_number'] else None,
+    'birth_year': lambda json: json['birth_year'] if json['birth_year'] else None,
+    'birth_month': lambda json: json['birth_month'] if json['birth_month'] else None,
+    'birth_day': lambda json: json['birth_day'] if json['birth_day'] else None,
+    'anniversary_year': lambda json: json['anniversary_year'] if json['anniversary_year'] else None,
+    'anniversary_month': lambda json: json['anniversary_month'] if json['anniversary_month'] else None,
+    'anniversary_day': lambda json: json['anniversary_day'] if json['anniversary_day'] else None,
+}
 
 class CardResponse:
     """Represents AMcards' response for sending a single card."""
+    __slots__ = ('_card_id', '_total_cost', '_user_email', '_message', '_shipping_address')
     def __init__(
         self,
         card_id: int,
@@ -804,6 +829,7 @@ class CardResponse:
 
 class CampaignResponse:
     """Represents AMcards' response for sending a single drip campaign."""
+    __slots__ = ('_mailing_id', '_card_ids', '_user_email', '_message', '_shipping_address')
     def __init__(
         self,
         mailing_id: int,
@@ -862,6 +888,7 @@ class CampaignResponse:
 
 class CardsResponse:
     """Represents AMcards' response for sending multiple cards."""
+    __slots__ = ('_mailing_id', '_user_email', '_message', '_shipping_addresses')
     def __init__(
         self,
         mailing_id: int,
@@ -905,8 +932,312 @@ class CardsResponse:
             shipping_addresses=json['shipping_addresses'],
         )
 
+class FailedChunk:
+    """Represents a chunk of recipients that could not be sent by :py:meth:`send_cards_chunked <amcards.amcards.AMcardsClient.send_cards_chunked>`.
+
+    A chunk is either :py:attr:`rejected` by AMcards, and none of its cards were scheduled, or its outcome is unknown: after a connection error, a ``5xx`` that outlasted the client's retries or an unexpected response, its mailing may have been created.
+    """
+    __slots__ = ('_index', '_shipping_addresses', '_error', '_rejected')
+    def __init__(
+        self,
+        index: int,
+        shipping_addresses: List[dict],
+        error: Exception,
+        rejected: bool = False,
+    ) -> None:
+        self._index = index
+        self._shipping_addresses = shipping_addresses
+        self._error = error
+        self._rejected = rejected
+
+    __repr__ = helpers.repr
+
+    @property
+    def index(self) -> int:
+        """Position of this chunk among all chunks, starting at ``0``."""
+        return self._index
+
+    @property
+    def shipping_addresses(self) -> List[dict]:
+        """Shipping addresses in this chunk. None of them were scheduled if the chunk was :py:attr:`rejected`, otherwise they may have been."""
+        return self._shipping_addresses
+
+    @property
+    def error(self) -> Exception:
+        """Exception raised when sending this chunk, for example :py:class:`CardsSendError <amcards.exceptions.CardsSendError>`."""
+        return self._error
+
+    @property
+    def rejected(self) -> bool:
+        """True if AMcards answered and rejected the chunk (``400``, ``402``, ``403`` or ``429``), so it is safe to send again. False if its outcome is unknown: check whether its mailing was created on AMcards before sending it again."""
+        return self._rejected
+
+class ChunkedCardsResponse:
+    """Represents AMcards' responses for sending multiple cards in several chunks."""
+    __slots__ = ('_responses', '_failed_chunks')
+    def __init__(
+        self,
+        responses: List[CardsResponse],
+        failed_chunks: List[FailedChunk],
+    ) -> None:
+        self._responses = responses
+        self._failed_chunks = failed_chunks
+
+    __repr__ = helpers.repr
+
+    @property
+    def responses(self) -> List[CardsResponse]:
+        """:py:class:`Responses <amcards.models.CardsResponse>` for the chunks that were sent, in chunk order."""
+        return self._responses
+
+    @property
+    def mailing_ids(self) -> List[int]:
+        """Unique ids for the :py:class:`mailings <amcards.models.Mailing>` created, one per chunk that was sent."""
+        return [response.mailing_id for response in self._responses]
+
+    @property
+    def failed_chunks(self) -> List[FailedChunk]:
+        """:py:class:`Chunks <amcards.models.FailedChunk>` that could not be sent (could be an empty list)."""
+        return self._failed_chunks
+
+    @property
+    def failed_shipping_addresses(self) -> List[dict]:
+        """Shipping addresses of all :py:attr:`failed_chunks`, including chunks whose outcome is unknown and may have been scheduled. Do not send them again as a whole, see :py:attr:`rejected_shipping_addresses`."""
+        return [shipping_address for chunk in self._failed_chunks for shipping_address in chunk.shipping_addresses]
+
+    @property
+    def rejected_shipping_addresses(self) -> List[dict]:
+        """Shipping addresses of the :py:attr:`failed_chunks` AMcards :py:attr:`rejected <amcards.models.FailedChunk.rejected>`, none of which were scheduled, safe to pass back to :py:meth:`send_cards_chunked <amcards.amcards.AMcardsClient.send_cards_chunked>` once the cause is fixed."""
+        return [shipping_address for chunk in self._failed_chunks if chunk.rejected for shipping_address in chunk.shipping_addresses]
+
+class BatchCost:
+    """Represents the cost of sending to several recipients."""
+    __slots__ = ('_costs', '_total_cost')
+    def __init__(
+        self,
+        costs: List[int],
+    ) -> None:
+        self._costs = costs
+        self._total_cost = sum(costs)
+
+    __repr__ = helpers.repr
+
+    @property
+    def costs(self) -> List[int]:
+        """Cost for each recipient in `cents`, in the same order the recipients were given."""
+        return self._costs
+
+    @property
+    def total_cost(self) -> int:
+        """Sum of :py:attr:`costs` in `cents`."""
+        return self._total_cost
+
+class CardChange:
+    """Represents a card that changed since the last :py:class:`sync <amcards.sync.CardSync>`."""
+    __slots__ = ('_card', '_old_status')
+    def __init__(
+        self,
+        card: Card,
+        old_status: Optional[CardStatus],
+    ) -> None:
+        self._card = card
+        self._old_status = old_status
+
+    __repr__ = helpers.repr
+
+    @property
+    def card(self) -> Card:
+        """The card as it is now."""
+        return self._card
+
+    @property
+    def old_status(self) -> Optional[CardStatus]:
+        """Status of the card at the previous sync. ``None`` if the card was not seen before."""
+        return self._old_status
+
+    @property
+    def new_status(self) -> CardStatus:
+        """Current status of the card."""
+        return self._card.status
+
+    @property
+    def is_new(self) -> bool:
+        """True if the card was not seen by a previous sync."""
+        return self._old_status is None
+
+    @property
+    def status_changed(self) -> bool:
+        """True if the card's status is different from its status at the previous sync, always True for new cards."""
+        return self._old_status != self._card.status
+
+class ContactImportStatus(Enum):
+    """Represents the outcome of importing a single contact."""
+    CREATED = 0
+    DUPLICATE = 1
+    INVALID = 2
+    FAILED = 3
+
+class ContactImportResult:
+    """Represents the outcome of importing one contact with :py:meth:`create_contacts <amcards.amcards.AMcardsClient.create_contacts>`."""
+    __slots__ = ('_index', '_contact', '_status', '_error')
+    def __init__(
+        self,
+        index: int,
+        contact: dict,
+        status: ContactImportStatus,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self._index = index
+        self._contact = contact
+        self._status = status
+        self._error = error
+
+    __repr__ = helpers.repr
+
+    @property
+    def index(self) -> int:
+        """Position of the contact among the imported contacts, starting at ``0``."""
+        return self._index
+
+    @property
+    def contact(self) -> dict:
+        """The contact's details, as given."""
+        return self._contact
+
+    @property
+    def status(self) -> ContactImportStatus:
+        """``CREATED`` if the contact was created, ``DUPLICATE`` if it was skipped because its ``third_party_contact_id`` or email was already imported, ``INVALID`` if it failed validation and ``FAILED`` if AMcards could not create it."""
+        return self._status
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Exception that made the contact ``INVALID`` or ``FAILED``, for example :py:class:`PhoneFormatError <amcards.exceptions.PhoneFormatError>`. ``None`` otherwise."""
+        return self._error
+
+class CardSendResult:
+    """Represents the outcome of sending one card with :py:meth:`send_card_stream <amcards.amcards.AMcardsClient.send_card_stream>`."""
+    __slots__ = ('_index', '_card', '_response', '_error')
+    def __init__(
+        self,
+        index: int,
+        card: dict,
+        response: Optional[CardResponse] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self._index = index
+        self._card = card
+        self._response = response
+        self._error = error
+
+    __repr__ = helpers.repr
+
+    @property
+    def index(self) -> int:
+        """Position of the card among the cards sent, starting at ``0``."""
+        return self._index
+
+    @property
+    def card(self) -> dict:
+        """The card's details, as given."""
+        return self._card
+
+    @property
+    def response(self) -> Optional[CardResponse]:
+        """AMcards' :py:class:`response <amcards.models.CardResponse>` if the card was sent. ``None`` otherwise."""
+        return self._response
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Exception raised when validating or sending the card, for example :py:class:`ShippingAddressError <amcards.exceptions.ShippingAddressError>` or :py:class:`InsufficientCreditsError <amcards.exceptions.InsufficientCreditsError>`. ``None`` if the card was sent."""
+        return self._error
+
+    @property
+    def ok(self) -> bool:
+        """True if the card was sent."""
+        return self._error is None
+
+class OutboxState(Enum):
+    """Represents the state of a send queued in an :py:class:`outbox <amcards.outbox.Outbox>`."""
+    PENDING = 'pending'
+    IN_FLIGHT = 'in_flight'
+    DONE = 'done'
+    FAILED = 'failed'
+
+class OutboxEntry:
+    """Represents a send queued in an :py:class:`outbox <amcards.outbox.Outbox>`."""
+    __slots__ = ('_key', '_kind', '_request', '_state', '_attempts', '_card_ids', '_mailing_id', '_error', '_date_last_modified')
+    def __init__(
+        self,
+        key: str,
+        kind: str,
+        request: dict,
+        state: OutboxState,
+        attempts: int,
+        card_ids: List[int],
+        mailing_id: Optional[int],
+        error: Optional[str],
+        date_last_modified: datetime,
+    ) -> None:
+        self._key = key
+        self._kind = kind
+        self._request = request
+        self._state = state
+        self._attempts = attempts
+        self._card_ids = card_ids
+        self._mailing_id = mailing_id
+        self._error = error
+        self._date_last_modified = date_last_modified
+
+    __repr__ = helpers.repr
+
+    @property
+    def key(self) -> str:
+        """Deduplication key of the send, also sent as its ``Idempotency-Key`` header."""
+        return self._key
+
+    @property
+    def kind(self) -> str:
+        """``"card"`` for a :py:meth:`send_card <amcards.amcards.AMcardsClient.send_card>`, ``"campaign"`` for a :py:meth:`send_campaign <amcards.amcards.AMcardsClient.send_campaign>`."""
+        return self._kind
+
+    @property
+    def request(self) -> dict:
+        """Arguments the send is made with."""
+        return self._request
+
+    @property
+    def state(self) -> OutboxState:
+        """``PENDING`` until it is sent, ``IN_FLIGHT`` while sending or when the outcome of the send is unknown, ``DONE`` once AMcards scheduled it and ``FAILED`` if AMcards rejected it."""
+        return self._state
+
+    @property
+    def attempts(self) -> int:
+        """Number of times the send was submitted."""
+        return self._attempts
+
+    @property
+    def card_ids(self) -> List[int]:
+        """Unique ids of the cards scheduled once the send is ``DONE``, an empty list otherwise."""
+        return self._card_ids
+
+    @property
+    def mailing_id(self) -> Optional[int]:
+        """Unique id of the :py:class:`mailing <amcards.models.Mailing>` created by a ``DONE`` campaign send. ``None`` otherwise."""
+        return self._mailing_id
+
+    @property
+    def error(self) -> Optional[str]:
+        """Last error raised when sending, for example ``"InsufficientCreditsError: Clients' user has insufficient credits, no card was scheduled"``. ``None`` if there was none."""
+        return self._error
+
+    @property
+    def date_last_modified(self) -> datetime:
+        """Date and time the entry last changed state."""
+        return self._date_last_modified
+
 class CreditTransaction:
     """Represents an AMcards CreditTransaction."""
+    __slots__ = ('_id', '_wallet_id', '_amount_granted', '_amount_before', '_amount_after', '_amount_paid', '_amount', '_description', '_credit_card_details', '_date_created')
     def __init__(
         self,
         id: int,
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from .amcards import _build_card_send_body, _build_campaign_send_body, _windowed
+from .models import OutboxEntry, OutboxState
+from . import exceptions
+from . import __helpers as helpers
+
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS amcards_outbox (
+        key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        request TEXT NOT NULL,
+        state TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        result TEXT,
+        error TEXT,
+        updated REAL NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS amcards_outbox_state ON amcards_outbox (state)',
+)
+
+
+def send_key(kind: str, target_id: str | int, initiator: str, shipping_address: dict, send_date: Optional[str] = None) -> str:
+    """Deduplication key of a send: the same template or campaign, sent by the same ``initiator`` to the same recipient, gets the same key.
+
+    The recipient is identified by its name, organization, address, country and ``third_party_contact_id``, compared case and whitespace insensitively. A ``send_date``, when given, is part of the key, so the same card can be scheduled for different dates.
+
+    :param str kind: ``"card"`` or ``"campaign"``.
+    :param str or int target_id: Unique id of the template or campaign sent.
+    :param str initiator: Initiator of the send.
+    :param dict shipping_address: Shipping details of the recipient.
+    :param Optional[str] send_date: Defaults to ``None``. Date the send is scheduled for.
+
+    :return: A hex SHA-256 digest.
+    :rtype: str
+
+    """
+    payload = json.dumps([kind, str(target_id), initiator, helpers.normalize_recipient(shipping_address), send_date], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Outbox:
+    """Durable queue of card and campaign sends, kept in a SQLite database so a process that dies while sending can resume without sending anything twice.
+
+    Sends are validated and written to the outbox by :py:meth:`enqueue_card` and :py:meth:`enqueue_campaign`, then submitted by :py:meth:`drain`. Enqueuing the same send twice, even from another run, queues it once.
+
+        .. code-block::
+
+            >>> from amcards import AMcardsClient
+            >>> from amcards.outbox import Outbox
+            >>> outbox = Outbox(AMcardsClient('youraccesstoken'), 'outbox.db')
+            >>> for contact in contacts:
+            ...     outbox.enqueue_card('123', 'myintegration123', contact.shipping_address)
+            >>> for entry in outbox.drain():
+            ...     print(entry.state, entry.card_ids, entry.error)
+            OutboxState.DONE [1522873] None
+            OutboxState.FAILED [] ShippingAddressError: ...
+
+    An entry is marked ``IN_FLIGHT`` and committed before its request is sent, and is only marked ``DONE`` or ``FAILED`` once AMcards answered. After a crash, or a connection error or ``5xx`` that outlasted the client's retries, the outcome of an ``IN_FLIGHT`` send is unknown: it is not sent again unless you :py:meth:`requeue` it, or drain with ``resend_in_flight=True``. Every send carries its key as ``Idempotency-Key`` header, so AMcards can recognize a resent request.
+
+    Only drain an outbox from one process at a time.
+    """
+    def __init__(self, client, path: str) -> None:
+        """Durable queue of card and campaign sends.
+
+        :param AMcardsClient client: The :py:class:`client <amcards.amcards.AMcardsClient>` the sends are made with.
+        :param str path: Database file, created if it does not exist. May be shared with other tables.
+
+        """
+        self._client = client
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def enqueue_card(
+        self,
+        template_id: str | int,
+        initiator: str,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+        message: str = None,
+        extra_data: dict = None,
+        key: Optional[str] = None,
+    ) -> str:
+        """Queues a :py:meth:`send_card <amcards.amcards.AMcardsClient.send_card>`, takes the same arguments. The send is committed to disk when this returns.
+
+        :param Optional[str] key: Defaults to ``None``. Deduplication key of the send. If not specified, the :py:func:`send_key` of its template, initiator, recipient and ``send_date``.
+
+        :return: The send's key. If a send with this key is already queued, nothing is queued.
+        :rtype: str
+
+        :raises ShippingAddressError: When ``shipping_address`` is missing some `required` keys.
+        :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
+
+        """
+        _build_card_send_body(template_id, initiator, shipping_address, return_address, send_date, message, extra_data)
+        key = key if key is not None else send_key('card', template_id, initiator, shipping_address, send_date)
+        request = {
+            'template_id': template_id, 'initiator': initiator, 'shipping_address': shipping_address, 'return_address': return_address,
+            'send_date': send_date, 'message': message, 'extra_data': extra_data,
+        }
+        self._insert(key, 'card', request)
+        return key
+
+    def enqueue_campaign(
+        self,
+        campaign_id: str | int,
+        initiator: str,
+        shipping_address: dict,
+        return_address: dict = None,
+        send_date: str = None,
+        extra_data: dict = None,
+        key: Optional[str] = None,
+    ) -> str:
+        """Queues a :py:meth:`send_campaign <amcards.amcards.AMcardsClient.send_campaign>`, takes the same arguments. The send is committed to disk when this returns.
+
+        :param Optional[str] key: Defaults to ``None``. Deduplication key of the send. If not specified, the :py:func:`send_key` of its campaign, initiator, recipient and ``send_date``.
+
+        :return: The send's key. If a send with this key is already queued, nothing is queued.
+        :rtype: str
+
+        :raises ShippingAddressError: When ``shipping_address`` is missing some `required` keys.
+        :raises DateFormatError: When one of the dates provided is not in ``"YYYY-MM-DD"`` format.
+        :raises PhoneFormatError: When the phone number provided is not in the correct format.
+
+        """
+        _build_campaign_send_body(campaign_id, initiator, shipping_address, return_address, send_date, extra_data)
+        key = key if key is not None else send_key('campaign', campaign_id, initiator, shipping_address, send_date)
+        request = {
+            'campaign_id': campaign_id, 'initiator': initiator, 'shipping_address': shipping_address, 'return_address': return_address,
+            'send_date': send_date, 'extra_data': extra_data,
+        }
+        self._insert(key, 'campaign', request)
+        return key
+
+    def _insert(self, key: str, kind: str, request: dict) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO amcards_outbox (key, kind, request, state, updated) VALUES (?, ?, ?, ?, ?)',
+                (key, kind, json.dumps(request), OutboxState.PENDING.value, time.time()),
+            )
+
+    def _set_state(self, key: str, state: OutboxState, result: Optional[dict] = None, error: Optional[Exception] = None, attempt: bool = False) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                'UPDATE amcards_outbox SET state = ?, result = ?, error = ?, attempts = attempts + ?, updated = ? WHERE key = ?',
+                (state.value, json.dumps(result) if result is not None else None, f'{type(error).__name__}: {error}' if error is not None else None, int(attempt), time.time(), key),
+            )
+
+    def drain(self, max_workers: int = 4, resend_in_flight: bool = False) -> Iterator[OutboxEntry]:
+        """Sends the ``PENDING`` entries, up to ``max_workers`` at once, and yields each entry as its send completes.
+
+        Entries whose request AMcards rejected (an invalid address, insufficient credits, a template the client does not own...) become ``FAILED``. Throttled entries go back to ``PENDING`` for the next drain. Entries whose outcome is unknown stay ``IN_FLIGHT``.
+
+        Stopping the drain early, by breaking out of the loop or because of an ``AuthenticationError``, waits for the sends in flight to complete. Entries not sent yet stay ``PENDING`` for the next drain.
+
+        :param int max_workers: Defaults to ``4``. Max number of sends in flight at once.
+        :param bool resend_in_flight: Defaults to ``False``. If True, entries left ``IN_FLIGHT`` are sent again, with the same ``Idempotency-Key``. Only use it once you know those sends were not scheduled, or AMcards deduplicates on ``Idempotency-Key``.
+
+        :return: Every entry sent, in its new state.
+        :rtype: Iterator[:py:class:`OutboxEntry <amcards.models.OutboxEntry>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid. The entry being sent goes back to ``PENDING`` and the drain stops.
+
+        """
+        states = (OutboxState.PENDING, OutboxState.IN_FLIGHT) if resend_in_flight else (OutboxState.PENDING,)
+        with self._lock:
+            rows = self._connection.execute(
+                f'SELECT key, kind, request FROM amcards_outbox WHERE state IN ({",".join("?" * len(states))}) ORDER BY rowid', [state.value for state in states],
+            ).fetchall()
+
+        def send(key: str, kind: str, request: dict) -> OutboxEntry:
+            # Committed right before the request is sent, so a crash leaves the entry IN_FLIGHT rather than PENDING, while
+            # entries still queued in the executor when the drain stops stay PENDING
+            self._set_state(key, OutboxState.IN_FLIGHT, attempt=True)
+            try:
+                if kind == 'card':
+                    response = self._client.send_card(**request, idempotency_key=key)
+                    result = {'card_ids': [response.card_id]}
+                else:
+                    response = self._client.send_campaign(**request, idempotency_key=key)
+                    result = {'card_ids': response.card_ids, 'mailing_id': response.mailing_id}
+            except exceptions.AuthenticationError:
+                self._set_state(key, OutboxState.PENDING)
+                raise
+            except exceptions.RateLimitError as e:
+                # A throttled request was not processed
+                self._set_state(key, OutboxState.PENDING, error=e)
+            except (exceptions.NetworkError, exceptions.ServerError) as e:
+                # AMcards may or may not have scheduled it
+                self._set_state(key, OutboxState.IN_FLIGHT, error=e)
+            except exceptions.AMcardsException as e:
+                self._set_state(key, OutboxState.FAILED, error=e)
+            else:
+                self._set_state(key, OutboxState.DONE, result=result)
+            return self.entry(key)
+
+        def submit(row: tuple) -> Future:
+            key, kind, request = row
+            return executor.submit(send, key, kind, json.loads(request))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            yield from _windowed(submit, iter(rows), 2 * max_workers, False)
+        finally:
+            # Sends not started yet are cancelled and stay PENDING, the ones in flight get their outcome recorded
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def requeue(self, keys: Iterable[str]) -> int:
+        """Moves ``IN_FLIGHT`` and ``FAILED`` entries back to ``PENDING``, so the next :py:meth:`drain` sends them again.
+
+        :param Iterable[str] keys: Keys of the entries to requeue.
+
+        :return: Number of entries requeued.
+        :rtype: int
+
+        """
+        with self._lock, self._connection:
+            return self._connection.executemany(
+                'UPDATE amcards_outbox SET state = ?, updated = ? WHERE key = ? AND state IN (?, ?)',
+                ((OutboxState.PENDING.value, time.time(), key, OutboxState.IN_FLIGHT.value, OutboxState.FAILED.value) for key in keys),
+            ).rowcount
+
+    def entry(self, key: str) -> Optional[OutboxEntry]:
+        """Entry with a specified key, ``None`` if there is none.
+
+        :rtype: Optional[:py:class:`OutboxEntry <amcards.models.OutboxEntry>`]
+
+        """
+        with self._lock:
+            row = self._connection.execute(f'SELECT {_COLUMNS} FROM amcards_outbox WHERE key = ?', (key,)).fetchone()
+        return _entry(row) if row else None
+
+    def entries(self, state: Optional[OutboxState] = None) -> List[OutboxEntry]:
+        """Entries in the order they were queued.
+
+        :param Optional[OutboxState] state: Defaults to ``None``. Only entries in this :py:class:`state <amcards.models.OutboxState>`, for example ``OutboxState.IN_FLIGHT`` to review the sends with an unknown outcome.
+
+        :rtype: List[:py:class:`OutboxEntry <amcards.models.OutboxEntry>`]
+
+        """
+        query, params = f'SELECT {_COLUMNS} FROM amcards_outbox', []
+        if state is not None:
+            query += ' WHERE state = ?'
+            params.append(state.value)
+        with self._lock:
+            rows = self._connection.execute(query + ' ORDER BY rowid', params).fetchall()
+        return [_entry(row) for row in rows]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+_COLUMNS = 'key, kind, request, state, attempts, result, error, updated'
+
+def _entry(row: tuple) -> OutboxEntry:
+    key, kind, request, state, attempts, result, error, updated = row
+    result = json.loads(result) if result is not None else {}
+    return OutboxEntry(
+        key=key,
+        kind=kind,
+        request=json.loads(request),
+        state=OutboxState(state),
+        attempts=attempts,
+        card_ids=result.get('card_ids', []),
+        mailing_id=result.get('mailing_id'),
+        error=error,
+        date_last_modified=datetime.fromtimestamp(updated),
+    )
@@ -0,0 +1,290 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Optional, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+LISTING = 'listing'
+SENDS = 'sends'
+PRICING = 'pricing'
+OTHER = 'other'
+
+_SEND_PATHS = ('/cards/open-card-form-oa/', '/cards/open-mailing-form/', '/campaigns/open-campaign-form/')
+_PRICING_PATHS = ('/campaigns/calculate-campaign-price/',)
+
+# tokens, last refill timestamp
+_STATE = struct.Struct('<dd')
+
+
+class TokenBucket:
+    """In-process token bucket, safe to share between threads and between clients.
+
+    The bucket holds up to ``capacity`` tokens and refills at ``rate`` tokens per second. Every request takes one token, when the bucket is empty the request waits until its token has been refilled. Waiting requests are served in the order they arrived.
+
+        .. code-block::
+
+            >>> from amcards import AMcardsClient
+            >>> from amcards.ratelimit import RateLimiter, TokenBucket
+            >>> limiter = RateLimiter(listing=TokenBucket(rate=10, capacity=20), sends=TokenBucket(rate=2))
+            >>> client = AMcardsClient('youraccesstoken', rate_limiter=limiter)
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """In-process token bucket.
+
+        :param float rate: Tokens refilled per second, the sustained number of requests per second.
+        :param Optional[float] capacity: Defaults to ``None``. Max number of tokens the bucket holds, the size of a burst sent without waiting. If not specified, ``max(1, rate)``.
+
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self._rate = float(rate)
+        self._capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self._capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._wait_time = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        """Max number of tokens the bucket holds."""
+        return self._capacity
+
+    @property
+    def acquired(self) -> int:
+        """Number of tokens taken from the bucket by this process."""
+        return self._acquired
+
+    @property
+    def throttled(self) -> int:
+        """Number of tokens taken by this process that had to be waited for."""
+        return self._throttled
+
+    @property
+    def wait_time(self) -> float:
+        """Total seconds this process spent waiting for tokens."""
+        return self._wait_time
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        # A clock that went backwards refills nothing instead of draining the bucket
+        return min(self._capacity, tokens + max(0.0, now - updated) * self._rate)
+
+    def reserve(self) -> float:
+        """Takes a token without waiting for it.
+
+        The bucket may go into debt, the returned delay is the time until the token taken is refilled. The caller must wait for it before sending its request.
+
+        :return: Seconds to wait before sending the request.
+        :rtype: float
+
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = self._refill(self._tokens, self._updated, now) - 1
+            self._updated = now
+            return max(0.0, -self._tokens / self._rate)
+
+    def _record(self, delay: float) -> None:
+        with self._metrics_lock:
+            self._acquired += 1
+            if delay > 0:
+                self._throttled += 1
+                self._wait_time += delay
+
+    def acquire(self) -> float:
+        """Takes a token, sleeping until it is available.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+
+        """
+        delay = self.reserve()
+        self._record(delay)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Takes a token, awaiting until it is available without blocking the event loop.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+
+        """
+        delay = self.reserve()
+        self._record(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose tokens are stored in a local file, so every process on the host using the same ``path`` shares a single budget.
+
+    Processes take turns updating the file under an exclusive ``flock``, which is held only for the few microseconds it takes to read and write the bucket, never while waiting for a token. Only available on Unix.
+
+        .. code-block::
+
+            >>> from amcards.ratelimit import RateLimiter, FileTokenBucket
+            >>> # every worker process creates the same limiter
+            >>> limiter = RateLimiter(sends=FileTokenBucket('/tmp/amcards-sends.bucket', rate=2))
+    """
+    def __init__(self, path: str, rate: float, capacity: Optional[float] = None) -> None:
+        """Token bucket shared by every process using the same ``path``.
+
+        :param str path: File holding the bucket, created if it does not exist.
+        :param float rate: Tokens refilled per second, the sustained number of requests per second across all processes.
+        :param Optional[float] capacity: Defaults to ``None``. Max number of tokens the bucket holds. If not specified, ``max(1, rate)``.
+
+        :raises OSError: When file locking is not supported on this platform, or ``path`` cannot be opened.
+
+        """
+        if fcntl is None:
+            raise OSError('FileTokenBucket requires fcntl, which is not available on this platform')
+        super().__init__(rate, capacity)
+        self._path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    @property
+    def path(self) -> str:
+        """File holding the bucket."""
+        return self._path
+
+    def reserve(self) -> float:
+        """Takes a token from the shared bucket without waiting for it, see :py:meth:`TokenBucket.reserve`.
+
+        :return: Seconds to wait before sending the request.
+        :rtype: float
+
+        """
+        # flock does not exclude threads sharing the same file descriptor, so threads take turns first
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                state = os.pread(self._fd, _STATE.size, 0)
+                if len(state) == _STATE.size:
+                    tokens, updated = _STATE.unpack(state)
+                    tokens = self._refill(tokens, updated, now) - 1
+                else:
+                    tokens = self._capacity - 1
+                os.pwrite(self._fd, _STATE.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return max(0.0, -tokens / self._rate)
+
+    def close(self) -> None:
+        """Closes the bucket's file, the file itself is kept for the other processes."""
+        if getattr(self, '_fd', -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class RateLimiter:
+    """Client-side rate limits per endpoint family, passed to a client as ``rate_limiter``.
+
+    Each family has its own bucket:
+
+    - ``listing``: every ``GET`` request, listings and single objects.
+    - ``sends``: :py:meth:`send_card <amcards.amcards.AMcardsClient.send_card>`, :py:meth:`send_cards <amcards.amcards.AMcardsClient.send_cards>` and :py:meth:`send_campaign <amcards.amcards.AMcardsClient.send_campaign>` and their variants.
+    - ``pricing``: campaign price calculations.
+    - ``other``: any other request, for example creating or deleting a contact.
+
+    A family without a bucket is not limited. One limiter may be shared by any number of clients and threads, use :py:class:`FileTokenBucket` buckets to share the budget between processes. Every attempt of a retried request takes a token.
+    """
+    def __init__(
+        self,
+        listing: Optional[TokenBucket] = None,
+        sends: Optional[TokenBucket] = None,
+        pricing: Optional[TokenBucket] = None,
+        other: Optional[TokenBucket] = None,
+    ) -> None:
+        """Client-side rate limits per endpoint family.
+
+        :param Optional[TokenBucket] listing: Defaults to ``None``. Bucket for ``GET`` requests.
+        :param Optional[TokenBucket] sends: Defaults to ``None``. Bucket for card, cards and campaign sends.
+        :param Optional[TokenBucket] pricing: Defaults to ``None``. Bucket for campaign price calculations.
+        :param Optional[TokenBucket] other: Defaults to ``None``. Bucket for all other requests.
+
+        """
+        self._buckets = {LISTING: listing, SENDS: sends, PRICING: pricing, OTHER: other}
+
+    def bucket(self, family: str) -> Optional[TokenBucket]:
+        """The bucket of an endpoint family.
+
+        :param str family: One of ``"listing"``, ``"sends"``, ``"pricing"`` or ``"other"``.
+
+        :return: The family's bucket, ``None`` if the family is not limited.
+        :rtype: Optional[TokenBucket]
+
+        """
+        return self._buckets[family]
+
+    @property
+    def wait_times(self) -> Dict[str, float]:
+        """Total seconds this process spent waiting for tokens, per limited endpoint family."""
+        return {family: bucket.wait_time for family, bucket in self._buckets.items() if bucket is not None}
+
+    @property
+    def wait_time(self) -> float:
+        """Total seconds this process spent waiting for tokens, across all endpoint families."""
+        return sum(self.wait_times.values())
+
+    def acquire(self, method: str, path: str) -> float:
+        """Waits for a token of the request's endpoint family.
+
+        :param str method: HTTP method of the request.
+        :param str path: Path of the request, for example ``"/.api/v1/card/"``.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+
+        """
+        bucket = self._buckets[endpoint_family(method, path)]
+        return bucket.acquire() if bucket is not None else 0.0
+
+    async def acquire_async(self, method: str, path: str) -> float:
+        """Awaits a token of the request's endpoint family, see :py:meth:`acquire`.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+
+        """
+        bucket = self._buckets[endpoint_family(method, path)]
+        return await bucket.acquire_async() if bucket is not None else 0.0
+
+
+def endpoint_family(method: str, path: str) -> str:
+    """The endpoint family a request is rate limited under.
+
+    :param str method: HTTP method of the request.
+    :param str path: Path of the request, for example ``"/.api/v1/card/"``.
+
+    :return: ``"listing"``, ``"sends"``, ``"pricing"`` or ``"other"``.
+    :rtype: str
+
+    """
+    if path in _SEND_PATHS:
+        return SENDS
+    if path in _PRICING_PATHS:
+        return PRICING
+    if method.upper() == 'GET':
+        return LISTING
+    return OTHER
@@ -0,0 +1,95 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterable
+
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Decides whether and when :py:class:`AMcardsClient <amcards.amcards.AMcardsClient>` retries a failed request.
+
+    Requests are retried when the connection fails or AMcards responds with one of ``retry_statuses``. Only requests whose method is in ``retry_methods``, or that carry an idempotency key, are retried, so a card is never sent twice because of a retry.
+
+    Waits grow exponentially with "full jitter": before attempt ``n + 1`` the client sleeps a random time between ``0`` and ``min(backoff_max, backoff_base * 2 ** (n - 1))`` seconds. When the response has a ``Retry-After`` header, the client sleeps exactly that long instead.
+    """
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_methods: Iterable[str] = ('GET',),
+        respect_retry_after: bool = True,
+    ) -> None:
+        """Decides whether and when a failed request is retried.
+
+        :param int max_attempts: Defaults to ``3``. Max number of times a request is attempted, including the first attempt. ``1`` disables retries.
+        :param float backoff_base: Defaults to ``0.5``. Seconds of the first backoff, doubled on every further attempt.
+        :param float backoff_max: Defaults to ``30.0``. Max seconds to wait between two attempts. A ``Retry-After`` asking for longer than this is not waited for, and the error is raised instead.
+        :param bool jitter: Defaults to ``True``. If True, every backoff is a random time between ``0`` and its exponential value, so many clients that failed together do not retry together.
+        :param Iterable[int] retry_statuses: Defaults to ``(429, 500, 502, 503, 504)``. Response status codes that are retried.
+        :param Iterable[str] retry_methods: Defaults to ``('GET',)``. HTTP methods that are always safe to retry. Other requests are only retried when they carry an idempotency key.
+        :param bool respect_retry_after: Defaults to ``True``. If True, the ``Retry-After`` header of a response overrides the computed backoff.
+
+        """
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self._retry_statuses = frozenset(retry_statuses)
+        self._retry_methods = frozenset(method.upper() for method in retry_methods)
+        self._respect_retry_after = respect_retry_after
+
+    @property
+    def max_attempts(self) -> int:
+        """Max number of times a request is attempted, including the first attempt."""
+        return self._max_attempts
+
+    def should_retry(self, method: str, attempt: int, idempotent: bool, status_code: Optional[int] = None) -> bool:
+        """Whether a request that just failed on its ``attempt``-th attempt may be attempted again.
+
+        :param str method: HTTP method of the request.
+        :param int attempt: Number of attempts made so far, starting at ``1``.
+        :param bool idempotent: True if the request carries an idempotency key.
+        :param Optional[int] status_code: Status code of the response, ``None`` when the connection failed.
+
+        :rtype: bool
+
+        """
+        if attempt >= self._max_attempts:
+            return False
+        if status_code is not None and status_code not in self._retry_statuses:
+            return False
+        return idempotent or method.upper() in self._retry_methods
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before attempting a request again.
+
+        :param int attempt: Number of attempts made so far, starting at ``1``.
+        :param Optional[str] retry_after: Value of the response's ``Retry-After`` header, if any.
+
+        :return: The seconds to wait, or ``None`` when ``Retry-After`` asks for longer than ``backoff_max`` and the request should not be retried.
+        :rtype: Optional[float]
+
+        """
+        if self._respect_retry_after and retry_after:
+            seconds = _parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds if seconds <= self._backoff_max else None
+
+        backoff = min(self._backoff_max, self._backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, backoff) if self._jitter else backoff
+
+
+def _parse_retry_after(retry_after: str) -> Optional[float]:
+    # Retry-After is either a number of seconds or an HTTP date
+    retry_after = retry_after.strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
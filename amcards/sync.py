@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .amcards import AMcardsClient
+from .models import Card, CardChange, CardStatus
+
+
+# Card id -> (CardStatus value, date_last_modified in ISO 8601)
+CardStates = Dict[int, Tuple[int, str]]
+
+
+def _select_card_states(connection: sqlite3.Connection, table: str, ids: Iterable[int]) -> CardStates:
+    # Reads the states of the given cards from a table with id, status and last_modified columns
+    ids = list(ids)
+    states = {}
+    # Stay well below SQLite's limit on the number of query parameters
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows = connection.execute(f'SELECT id, status, last_modified FROM {table} WHERE id IN ({",".join("?" * len(chunk))})', chunk)
+        states.update((id, (status, last_modified)) for id, status, last_modified in rows)
+    return states
+
+
+class SyncStore:
+    """In-memory state of a :py:class:`CardSync`, lost when the process exits. Base class of the persistent stores.
+
+    A store holds the sync's watermark and the last seen status of every synced card. Subclass it and override :py:meth:`watermark`, :py:meth:`card_states` and :py:meth:`save` to keep the state somewhere else.
+    """
+    def __init__(self) -> None:
+        """In-memory state of a :py:class:`CardSync`."""
+        self._watermark = None
+        self._cards: CardStates = {}
+
+    def watermark(self) -> Optional[str]:
+        """Greatest ``date_last_modified`` seen by the last completed sync, in ISO 8601. ``None`` before the first sync.
+
+        :rtype: Optional[str]
+
+        """
+        return self._watermark
+
+    def card_states(self, ids: Iterable[int]) -> CardStates:
+        """Last seen state of the cards with the given ids, cards never seen are left out.
+
+        :param Iterable[int] ids: Ids of the cards to look up.
+
+        :return: ``(status, date_last_modified)`` per card id, the status as its :py:class:`CardStatus <amcards.models.CardStatus>` value.
+        :rtype: Dict[int, Tuple[int, str]]
+
+        """
+        return {id: self._cards[id] for id in ids if id in self._cards}
+
+    def save(self, watermark: Optional[str], card_states: CardStates) -> None:
+        """Stores the result of a completed sync. Must be atomic: either all of it is stored, or none of it.
+
+        :param Optional[str] watermark: New watermark.
+        :param Dict[int, Tuple[int, str]] card_states: New state of every card that changed.
+
+        """
+        self._cards.update(card_states)
+        self._watermark = watermark
+
+
+class JSONSyncStore(SyncStore):
+    """Sync state kept in a JSON file, loaded in memory when the store is created. Suits up to a few hundred thousand cards."""
+    def __init__(self, path: str) -> None:
+        """Sync state kept in a JSON file.
+
+        :param str path: File holding the state, created by the first :py:meth:`save`.
+
+        """
+        super().__init__()
+        self._path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self._watermark = state['watermark']
+            self._cards = {int(id): tuple(card_state) for id, card_state in state['cards'].items()}
+
+    def save(self, watermark: Optional[str], card_states: CardStates) -> None:
+        """Stores the result of a completed sync, replacing the file atomically."""
+        cards = self._cards | card_states
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'watermark': watermark, 'cards': cards}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+        self._cards = cards
+        self._watermark = watermark
+
+
+class SQLiteSyncStore(SyncStore):
+    """Sync state kept in a SQLite database, only the cards of the page being synced are read into memory."""
+    def __init__(self, path: str) -> None:
+        """Sync state kept in a SQLite database.
+
+        :param str path: Database file, created if it does not exist. May be shared with other tables.
+
+        """
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS amcards_sync (key TEXT PRIMARY KEY, value TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS amcards_sync_card (id INTEGER PRIMARY KEY, status INTEGER NOT NULL, last_modified TEXT NOT NULL)')
+
+    def watermark(self) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM amcards_sync WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def card_states(self, ids: Iterable[int]) -> CardStates:
+        return _select_card_states(self._connection, 'amcards_sync_card', ids)
+
+    def save(self, watermark: Optional[str], card_states: CardStates) -> None:
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO amcards_sync_card (id, status, last_modified) VALUES (?, ?, ?)',
+                ((id, status, last_modified) for id, (status, last_modified) in card_states.items()),
+            )
+            self._connection.execute("INSERT OR REPLACE INTO amcards_sync (key, value) VALUES ('watermark', ?)", (watermark,))
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+class CardSync:
+    """Incremental sync of a client's cards: every sync only fetches the cards modified since the previous one and reports their status changes.
+
+        .. code-block::
+
+            >>> from amcards import AMcardsClient
+            >>> from amcards.sync import CardSync, SQLiteSyncStore
+            >>> sync = CardSync(AMcardsClient('youraccesstoken'), SQLiteSyncStore('amcards.db'))
+            >>> for change in sync.changes():
+            ...     print(change.card.id, change.old_status, '->', change.new_status)
+            1522873 CardStatus.IN_THE_MAIL -> CardStatus.DELIVERED
+            1522874 None -> CardStatus.PROCESSING
+
+    The store is only updated once all changes have been iterated, so a sync that is interrupted (an exception, or stopping the iteration early) is repeated in full by the next one: every change is reported at least once.
+    """
+    def __init__(
+        self,
+        client,
+        store: Optional[SyncStore] = None,
+        overlap: timedelta = timedelta(minutes=10),
+        since: Optional[datetime] = None,
+        page_size: int = 100,
+    ) -> None:
+        """Incremental sync of a client's cards.
+
+        :param AMcardsClient client: The :py:class:`client <amcards.amcards.AMcardsClient>` whose cards are synced. :py:class:`AsyncAMcardsClient <amcards.aio.AsyncAMcardsClient>` is not supported.
+        :param Optional[SyncStore] store: Defaults to ``None``. Where the watermark and the cards' last seen statuses are kept, for example a :py:class:`JSONSyncStore` or a :py:class:`SQLiteSyncStore`. If not specified, the state is kept in memory.
+        :param timedelta overlap: Defaults to 10 minutes. Every sync also fetches the cards modified during this window before the watermark. Cards modified while a sync is paging through the results can be skipped by offset pagination, the overlap picks them up on the next sync. Cards fetched again without having changed are not reported twice.
+        :param Optional[datetime] since: Defaults to ``None``. Only used by the first sync, when the store has no watermark yet: the cards modified before ``since`` are not fetched. If not specified, the first sync fetches every card and reports each of them as new.
+        :param int page_size: Defaults to ``100``. Number of cards fetched per request.
+
+        :raises TypeError: When ``client`` is not an :py:class:`AMcardsClient <amcards.amcards.AMcardsClient>`.
+
+        """
+        if not isinstance(client, AMcardsClient):
+            raise TypeError(f'CardSync requires an AMcardsClient, got {type(client).__name__}')
+        self._client = client
+        self._store = store if store is not None else SyncStore()
+        self._overlap = overlap
+        self._since = since
+        self._page_size = page_size
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Greatest ``date_last_modified`` seen by the last completed sync. ``None`` before the first sync."""
+        watermark = self._store.watermark()
+        return datetime.fromisoformat(watermark) if watermark is not None else None
+
+    def changes(self, all_changes: bool = False) -> Iterator[CardChange]:
+        """Fetches the cards modified since the previous sync and yields their changes.
+
+        :param bool all_changes: Defaults to ``False``. If False, only cards whose status changed, and new cards, are yielded. If True, every modified card is yielded, even when only other fields changed.
+
+        :return: A :py:class:`change <amcards.models.CardChange>` per modified card. The cards are built lazily, only the fields that are read get decoded.
+        :rtype: Iterator[:py:class:`CardChange <amcards.models.CardChange>`]
+
+        :raises AuthenticationError: When the client's ``access_token`` is invalid.
+
+        """
+        watermark = self.watermark
+        start = watermark - self._overlap if watermark is not None else self._since
+        filters = {'last_modified__gte': start.isoformat()} if start is not None else None
+
+        objects = self._client._iter_pages(self._client._card_objects, self._page_size, 0, True, filters=filters)
+        updates: CardStates = {}
+        while page := list(islice(objects, self._page_size)):
+            known = self._store.card_states(object_json['id'] for object_json in page)
+            for object_json in page:
+                card = Card._from_json(object_json, lazy=True)
+                last_modified = card.date_last_modified
+                # The same card can be fetched twice, by the overlap or because pages shifted
+                previous = updates.get(card.id) or known.get(card.id)
+                if previous is not None and previous[1] == last_modified.isoformat():
+                    continue
+
+                updates[card.id] = (card.status.value, last_modified.isoformat())
+                if watermark is None or last_modified > watermark:
+                    watermark = last_modified
+                old_status = CardStatus(previous[0]) if previous is not None else None
+                if all_changes or old_status != card.status:
+                    yield CardChange(card, old_status)
+
+        self._store.save(watermark.isoformat() if watermark is not None else None, updates)
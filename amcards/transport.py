@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import weakref
+from typing import Optional, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import exceptions
+
+
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+
+class Transport:
+    """Pooled HTTP transport used by :py:class:`AMcardsClient <amcards.amcards.AMcardsClient>`.
+
+    Connections to a host are kept alive and reused between requests, so only the first request to a host pays for the TCP and TLS handshakes.
+
+    Any object with a compatible ``request(method, url, **kwargs)`` method returning a ``requests.Response``, and raising :py:class:`NetworkError <amcards.exceptions.NetworkError>` when the connection fails, may be used in place of a :py:class:`Transport`.
+    """
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ) -> None:
+        """Pooled HTTP transport used by :py:class:`AMcardsClient <amcards.amcards.AMcardsClient>`.
+
+        :param int pool_maxsize: Defaults to ``10``. Max number of connections kept open per host. Should be at least the number of threads sharing this transport.
+        :param bool pool_block: Defaults to ``False``. If ``True``, requests wait for a free connection once ``pool_maxsize`` connections are in use. If ``False``, extra connections are opened and discarded after use.
+        :param bool keep_alive: Defaults to ``True``. If ``False``, every connection is closed after its response is read.
+        :param Optional[float] connect_timeout: Defaults to ``5.0``. Seconds to wait for a connection to be established. ``None`` waits forever.
+        :param Optional[float] read_timeout: Defaults to ``60.0``. Seconds to wait for the server to send data. ``None`` waits forever.
+
+        """
+        self._timeout = (connect_timeout, read_timeout)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        if not keep_alive:
+            self._session.headers['Connection'] = 'close'
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request over one of the pooled connections.
+
+        :param str method: HTTP method, for example ``"GET"``.
+        :param str url: Absolute url of the request.
+        :param kwargs: Passed through to ``requests.Session.request``. ``timeout`` defaults to ``(connect_timeout, read_timeout)``.
+
+        :return: The server's response.
+        :rtype: ``requests.Response``
+
+        :raises NetworkError: When the connection fails or times out.
+
+        """
+        kwargs.setdefault('timeout', self._timeout)
+        try:
+            return self._session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise exceptions.NetworkError(f'Could not reach AMcards: {e}') from e
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+_shared_transports: Dict[str, Transport] = {}
+_shared_transports_lock = threading.Lock()
+
+def shared_transport(domain: str) -> Transport:
+    """Returns the :py:class:`Transport` shared by every client talking to ``domain``, creating it with default settings on first use.
+
+    :param str domain: Scheme and host of the API, for example ``"https://amcards.com"``.
+
+    :return: The shared transport for ``domain``.
+    :rtype: :py:class:`Transport`
+
+    """
+    with _shared_transports_lock:
+        transport = _shared_transports.get(domain)
+        if transport is None:
+            transport = _shared_transports[domain] = Transport()
+        return transport
+
+
+class AsyncTransport:
+    """Pooled asyncio HTTP transport used by :py:class:`AsyncAMcardsClient <amcards.aio.AsyncAMcardsClient>`.
+
+    Requires `httpx <https://www.python-httpx.org/>`_, install it with ``pip install python-amcards[async]``. A transport belongs to the event loop it is first used on.
+    """
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_POOL_MAXSIZE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ) -> None:
+        """Pooled asyncio HTTP transport used by :py:class:`AsyncAMcardsClient <amcards.aio.AsyncAMcardsClient>`.
+
+        :param int max_connections: Defaults to ``100``. Max number of connections open at once, requests beyond this wait for a free connection.
+        :param Optional[int] max_keepalive_connections: Defaults to ``10``. Max number of idle connections kept alive for reuse.
+        :param Optional[float] keepalive_expiry: Defaults to ``5.0``. Seconds an idle connection is kept alive for.
+        :param Optional[float] connect_timeout: Defaults to ``5.0``. Seconds to wait for a connection to be established. ``None`` waits forever.
+        :param Optional[float] read_timeout: Defaults to ``60.0``. Seconds to wait for the server to send data. ``None`` waits forever.
+
+        :raises ImportError: When ``httpx`` is not installed.
+
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError('AsyncTransport requires httpx, install it with: pip install python-amcards[async]') from e
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self._transport_error = httpx.TransportError
+
+    async def request(self, method: str, url: str, **kwargs):
+        """Sends a request over one of the pooled connections.
+
+        :param str method: HTTP method, for example ``"GET"``.
+        :param str url: Absolute url of the request.
+        :param kwargs: Passed through to ``httpx.AsyncClient.request``.
+
+        :return: The server's response.
+        :rtype: ``httpx.Response``
+
+        :raises NetworkError: When the connection fails or times out.
+
+        """
+        try:
+            return await self._client.request(method, url, **kwargs)
+        except self._transport_error as e:
+            raise exceptions.NetworkError(f'Could not reach AMcards: {e}') from e
+
+    async def aclose(self) -> None:
+        """Closes all pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+# Event loop -> [transports per domain, async generator closing them when the loop shuts down]
+_shared_async_transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+def shared_async_transport(domain: str) -> AsyncTransport:
+    """Returns the :py:class:`AsyncTransport` shared by every async client talking to ``domain`` on the running event loop, creating it with default settings on first use.
+
+    The shared transports of a loop are closed when the loop shuts down its async generators, which ``asyncio.run`` does before closing the loop.
+
+    :param str domain: Scheme and host of the API, for example ``"https://amcards.com"``.
+
+    :return: The shared async transport for ``domain``.
+    :rtype: :py:class:`AsyncTransport`
+
+    """
+    loop = asyncio.get_running_loop()
+    shared = _shared_async_transports.get(loop)
+    if shared is None:
+        shared = _shared_async_transports[loop] = [{}, None]
+        shared[1] = _close_at_shutdown(shared)
+        # Started on the running loop so the loop tracks it, loop.shutdown_asyncgens() then runs its finally block
+        try:
+            shared[1].asend(None).send(None)
+        except StopIteration:
+            pass
+    transports = shared[0]
+    transport = transports.get(domain)
+    if transport is None:
+        transport = transports[domain] = AsyncTransport()
+    return transport
+
+async def _close_at_shutdown(shared: list):
+    try:
+        yield
+    finally:
+        # The generator holds a reference to its loop, dropping it lets the loop's entry be collected
+        transports, shared[:] = shared[0], [{}, None]
+        for transport in transports.values():
+            await transport.aclose()
@@ -0,0 +1,327 @@
+import re
+from itertools import compress, count, repeat
+from operator import methodcaller, not_
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from . import __helpers as helpers
+
+
+# Fields in the order they are checked and reported, required ones first
+REQUIRED_FIELDS = tuple(sorted(helpers.REQUIRED_SHIPPING_ADDRESS_FIELDS))
+CARD_FIELDS = REQUIRED_FIELDS + tuple(sorted(helpers.CARD_OPTIONAL_SHIPPING_ADDRESS_FIELDS))
+CAMPAIGN_FIELDS = REQUIRED_FIELDS + tuple(sorted(helpers.CAMPAIGN_OPTIONAL_SHIPPING_ADDRESS_FIELDS))
+
+KINDS = {'card': CARD_FIELDS, 'campaign': CAMPAIGN_FIELDS}
+BACKENDS = ('python', 'numpy')
+
+# Messages shared with the checks of send_campaign, value quotes the rejected value or is empty
+_DATE_MESSAGE = 'Invalid {field} format{value}, please specify date as "YYYY-MM-DD", or omit it'
+_PHONE_MESSAGE = 'Invalid phone_number format, please specify phone as a 10 number string with no special formatting (ex. 15556667777), or omit it'
+
+# Optional fields validated when present, campaign sends only
+_CHECKS = {
+    'birth_date': (helpers.is_valid_birthdate, _DATE_MESSAGE.format(field='birth_date', value='')),
+    'anniversary_date': (helpers.is_valid_date, _DATE_MESSAGE.format(field='anniversary_date', value='')),
+    'phone_number': (helpers.is_valid_phone, _PHONE_MESSAGE),
+}
+
+_MISSING = 'Missing required shipping address field'
+
+# Stripped from phone numbers by normalization, "(555) 666-7777" becomes "5556667777"
+_PHONE_FORMATTING = ' ().-'
+_PHONE_FORMATTING_RE = re.compile(r'[ ().\-]')
+
+
+class AddressError(NamedTuple):
+    """A field of a shipping address that failed validation."""
+    index: int
+    """Position of the address in the batch."""
+    field: str
+    """Name of the field, for example ``"city"``."""
+    value: object
+    """Value of the field after normalization, ``None`` when it is missing."""
+    message: str
+    """What is wrong with the value."""
+
+
+class AddressBatch:
+    """Outcome of :py:func:`validate_addresses` or :py:func:`validate_address_columns`: the normalized addresses and an error report listing every invalid field of every address.
+
+        .. code-block::
+
+            >>> batch = validate_addresses(addresses, kind='campaign')
+            >>> len(batch), len(batch.invalid)
+            (100000, 2)
+            >>> batch.errors
+            [AddressError(index=512, field='city', value=None, message='Missing required shipping address field'), AddressError(index=8190, field='phone_number', value='555-0100', message='Invalid phone_number format, ...')]
+            >>> client.send_cards(template_id='123', initiator='myintegration123', shipping_addresses=batch.valid_addresses)
+
+    """
+    __slots__ = ('_fields', '_columns', '_errors', '_length')
+    def __init__(self, fields: tuple, columns: Dict[str, list], errors: List[AddressError], length: int) -> None:
+        self._fields = fields
+        self._columns = columns
+        self._errors = errors
+        self._length = length
+
+    def __repr__(self) -> str:
+        return f'AddressBatch(addresses={self._length}, invalid={len(self.invalid)}, errors={len(self._errors)})'
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def ok(self) -> bool:
+        """True if every address is valid."""
+        return not self._errors
+
+    @property
+    def errors(self) -> List[AddressError]:
+        """Every invalid field, ordered by address, then by field: required fields first, alphabetically."""
+        return self._errors
+
+    @property
+    def invalid(self) -> List[int]:
+        """Positions of the invalid addresses, in order."""
+        return sorted({error.index for error in self._errors})
+
+    @property
+    def columns(self) -> Dict[str, list]:
+        """Normalized values per field, one per address including the invalid ones, ``None`` where a field is missing. ``pandas.DataFrame(batch.columns)`` builds a data frame."""
+        return self._columns
+
+    @property
+    def addresses(self) -> List[Optional[dict]]:
+        """Normalized addresses, one per address in the batch, ``None`` for the invalid ones. Each holds the required fields and the optional fields that are not empty, ready for :py:meth:`send_card <amcards.amcards.AMcardsClient.send_card>`, :py:meth:`send_cards <amcards.amcards.AMcardsClient.send_cards>` or :py:meth:`send_campaign <amcards.amcards.AMcardsClient.send_campaign>`."""
+        # Optional fields empty in every address are left out up front, the others are removed where empty
+        optionals = tuple(field for field in self._fields[len(REQUIRED_FIELDS):] if any(self._columns[field]))
+        fields = REQUIRED_FIELDS + optionals
+        addresses = list(map(dict, map(zip, repeat(fields), zip(*(self._columns[field] for field in fields)))))
+        for field in optionals:
+            for index in compress(count(), map(not_, self._columns[field])):
+                del addresses[index][field]
+        for error in self._errors:
+            addresses[error.index] = None
+        return addresses
+
+    @property
+    def valid_addresses(self) -> List[dict]:
+        """Normalized valid addresses, in order, without the invalid ones."""
+        return [address for address in self.addresses if address is not None]
+
+    def errors_by_address(self) -> Dict[int, List[AddressError]]:
+        """Invalid fields grouped by position of the address.
+
+        :rtype: Dict[int, List[AddressError]]
+
+        """
+        report = {}
+        for error in self._errors:
+            report.setdefault(error.index, []).append(error)
+        return report
+
+
+def validate_addresses(shipping_addresses: Sequence[dict], kind: str = 'card', normalize: bool = True, backend: str = 'python') -> AddressBatch:
+    """Validates and normalizes a batch of shipping addresses field by field, rather than one address at a time, and reports every invalid field rather than stopping at the first one.
+
+    Each field is checked over the whole batch at once, and each distinct ``birth_date``, ``anniversary_date`` and ``country`` is parsed or fixed only once however many addresses share it.
+
+        .. code-block::
+
+            >>> from amcards.validation import validate_addresses
+            >>> batch = validate_addresses([
+            ...     {'first_name': ' Ralph ', 'last_name': 'Mullins', 'address_line_1': '2285 Reppert Road', 'city': 'Southfield', 'state': 'MI', 'postal_code': '48075', 'country': 'usa'},
+            ...     {'first_name': 'Keith', 'last_name': 'May', 'address_line_1': '364 Spruce Drive', 'state': 'PA', 'postal_code': '19107'},
+            ... ])
+            >>> batch.addresses
+            [{'address_line_1': '2285 Reppert Road', 'city': 'Southfield', 'first_name': 'Ralph', 'last_name': 'Mullins', 'postal_code': '48075', 'state': 'MI', 'country': 'US'}, None]
+            >>> batch.errors
+            [AddressError(index=1, field='city', value=None, message='Missing required shipping address field')]
+
+    :param Sequence[Mapping] shipping_addresses: Shipping addresses, with the keys of the ``shipping_address`` of :py:meth:`send_card <amcards.amcards.AMcardsClient.send_card>` or :py:meth:`send_campaign <amcards.amcards.AMcardsClient.send_campaign>`. Other keys are ignored.
+    :param str kind: Defaults to ``"card"``. ``"card"`` keeps the fields of a card send, ``"campaign"`` also keeps and validates ``phone_number``, ``birth_date`` and ``anniversary_date``.
+    :param bool normalize: Defaults to ``True``. If True, leading and trailing whitespace is trimmed from every field, country names AMcards does not accept are replaced by their code (``"United States"`` becomes ``"US"``), countries are upper-cased and formatting is removed from phone numbers (``"(555) 666-7777"`` becomes ``"5556667777"``). If False, values are validated and returned as they are.
+    :param str backend: Defaults to ``"python"``. ``"numpy"`` runs the checks as NumPy string operations, see :py:func:`validate_address_columns`. Building the arrays from dicts usually costs more than it saves, it pays off for addresses already held in columns.
+
+    :rtype: AddressBatch
+
+    :raises ValueError: When ``kind`` or ``backend`` is unknown.
+    :raises ImportError: When ``backend`` is ``"numpy"`` and ``numpy`` is not installed.
+
+    """
+    fields = _fields(kind)
+    columns = {field: _column(shipping_addresses, field) for field in fields}
+    return validate_address_columns(columns, kind, normalize, backend)
+
+
+def validate_address_columns(columns: Mapping[str, Sequence], kind: str = 'card', normalize: bool = True, backend: str = 'python') -> AddressBatch:
+    """Same as :py:func:`validate_addresses`, for addresses already held column by column, like the columns of a ``pandas.DataFrame`` or NumPy arrays.
+
+    With ``backend="numpy"``, trimming, missing fields, countries and phone numbers are checked with NumPy string operations over each column. It is the fastest option when the columns already are NumPy arrays of strings. Every value is then read as a string, ``str(value)``, and returned as one.
+
+        .. code-block::
+
+            >>> frame = pandas.read_csv('recipients.csv', dtype=str, keep_default_na=False)
+            >>> batch = validate_address_columns({name: frame[name].to_numpy(dtype=str) for name in frame.columns}, backend='numpy')
+
+    :param Mapping[str, Sequence] columns: Values per field, all of the same length. Fields not specified are missing from every address, other fields are ignored.
+    :param str kind: Defaults to ``"card"``. See :py:func:`validate_addresses`.
+    :param bool normalize: Defaults to ``True``. See :py:func:`validate_addresses`.
+    :param str backend: Defaults to ``"python"``. ``"python"`` or ``"numpy"``.
+
+    :rtype: AddressBatch
+
+    :raises ValueError: When ``kind`` or ``backend`` is unknown, or when the columns are not all of the same length.
+    :raises ImportError: When ``backend`` is ``"numpy"`` and ``numpy`` is not installed.
+
+    """
+    fields = _fields(kind)
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown backend "{backend}", use one of: ' + ', '.join(BACKENDS))
+    lengths = {len(columns[field]) for field in fields if field in columns}
+    if len(lengths) > 1:
+        raise ValueError('Address columns must all have the same length, got lengths: ' + ', '.join(map(str, sorted(lengths))))
+    length = lengths.pop() if lengths else 0
+
+    if backend == 'numpy':
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError('The numpy backend requires numpy, install it with: pip install python-amcards[numpy]') from e
+        validate = lambda field, values: _numpy_column(numpy, field, values, length, normalize)
+    else:
+        validate = lambda field, values: _python_column(field, values, length, normalize)
+
+    normalized, errors = {}, []
+    for position, field in enumerate(fields):
+        normalized[field], invalid, message = validate(field, columns.get(field))
+        errors.extend((index, position, field, message) for index in invalid)
+    # Ordered by address then field, the order fields are listed in
+    errors.sort(key=lambda error: (error[0], error[1]))
+    report = [AddressError(index, field, normalized[field][index], message) for index, _, field, message in errors]
+    return AddressBatch(fields, normalized, report, length)
+
+
+def _fields(kind: str) -> tuple:
+    try:
+        return KINDS[kind]
+    except KeyError:
+        raise ValueError(f'Unknown kind "{kind}", use one of: ' + ', '.join(KINDS)) from None
+
+
+def _column(shipping_addresses: Sequence[Mapping], field: str) -> list:
+    try:
+        # dict.get is the fastest way to read a field, other mappings make it raise and are read with their own get
+        return list(map(dict.get, shipping_addresses, repeat(field)))
+    except TypeError:
+        return list(map(methodcaller('get', field), shipping_addresses))
+
+
+def _python_column(field: str, values: Optional[Sequence], length: int, normalize: bool) -> tuple:
+    # Returns the normalized values, the positions of the invalid ones and what is wrong with them
+    values = list(values) if values is not None else [None] * length
+    if normalize:
+        values = _trimmed(values)
+        if field == 'country':
+            values = _map_distinct(values, lambda country: helpers.fix_country(country) if isinstance(country, str) else country)
+        elif field == 'phone_number':
+            values = _map_distinct(values, lambda phone: _PHONE_FORMATTING_RE.sub('', phone) if isinstance(phone, str) else phone)
+
+    if field in REQUIRED_FIELDS:
+        # Not stripped when normalize is False, a value of spaces still counts as missing
+        return values, _missing(values), _MISSING
+    if field in _CHECKS:
+        check, message = _CHECKS[field]
+        return values, _rejected(values, lambda value: not value or isinstance(value, str) and check(value)), message
+    return values, [], None
+
+
+def _missing(values: list) -> List[int]:
+    try:
+        # Columns of non-blank strings, the usual case, are checked without a Python level loop
+        if all(map(str.strip, values)):
+            return []
+    except TypeError:
+        pass
+    return _rejected(values, lambda value: value.strip() if isinstance(value, str) else value)
+
+
+def _trimmed(values: list) -> list:
+    try:
+        # Same fast path for columns of strings, blank ones become missing
+        trimmed = list(map(str.strip, values))
+    except TypeError:
+        return _map_distinct(values, lambda value: (value.strip() or None) if isinstance(value, str) else value)
+    return trimmed if all(trimmed) else [value or None for value in trimmed]
+
+
+def _distinct(values: list) -> Optional[set]:
+    # None when some values are not hashable, they are then handled one by one
+    try:
+        return set(values)
+    except TypeError:
+        return None
+
+
+def _map_distinct(values: list, fix: Callable[[object], object]) -> list:
+    # Applies fix once per distinct value, a mailing repeats the same cities, countries and dates many times
+    distinct = _distinct(values)
+    if distinct is None:
+        return [fix(value) for value in values]
+    fixed = {value: fixed for value in distinct if (fixed := fix(value)) is not value}
+    return list(map(fixed.get, values, values)) if fixed else values
+
+
+def _rejected(values: list, valid: Callable[[object], object]) -> List[int]:
+    # Positions of the values valid rejects, each distinct value is checked once
+    distinct = _distinct(values)
+    if distinct is None:
+        return [index for index, value in enumerate(values) if not valid(value)]
+    rejected = {value for value in distinct if not valid(value)}
+    if not rejected:
+        return []
+    return [index for index, value in enumerate(values) if value in rejected]
+
+
+def _numpy_column(numpy, field: str, values: Optional[Sequence], length: int, normalize: bool) -> tuple:
+    # Same as _python_column, with values read as strings, '' standing for a missing value
+    if values is None:
+        strings = numpy.full(length, '')
+    else:
+        strings = numpy.asarray(values)
+        if strings.dtype.kind != 'U':
+            objects = strings.astype(object)
+            strings = numpy.where(numpy.equal(objects, None), '', objects).astype(str)
+
+    stripped = numpy.char.strip(strings)
+    if normalize:
+        strings = stripped
+        if field == 'country':
+            distinct, inverse = numpy.unique(strings, return_inverse=True)
+            strings = numpy.array([helpers.fix_country(country) if country else '' for country in distinct.tolist()], dtype=str)[inverse]
+        elif field == 'phone_number':
+            for character in _PHONE_FORMATTING:
+                strings = numpy.char.replace(strings, character, '')
+
+    lengths = numpy.char.str_len(strings)
+    if field in REQUIRED_FIELDS:
+        invalid = numpy.flatnonzero(numpy.char.str_len(stripped) == 0)
+        message = _MISSING
+    elif field == 'phone_number':
+        invalid = numpy.flatnonzero((lengths > 0) & ((lengths != 10) | ~numpy.char.isdigit(strings)))
+        message = _CHECKS[field][1]
+    elif field in _CHECKS:
+        check, message = _CHECKS[field]
+        distinct, inverse = numpy.unique(strings, return_inverse=True)
+        valid = numpy.array([not value or check(value) for value in distinct.tolist()], dtype=bool)
+        invalid = numpy.flatnonzero(~valid[inverse.reshape(-1)])
+    else:
+        invalid, message = numpy.empty(0, dtype=numpy.intp), None
+
+    if not normalize and values is not None:
+        normalized = list(values)
+    else:
+        normalized = strings.astype(object)
+        normalized[lengths == 0] = None
+        normalized = normalized.tolist()
+    return normalized, invalid.tolist(), message
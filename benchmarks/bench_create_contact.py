@@ -0,0 +1,70 @@
+"""Contacts created/second against a local stub: fetching the user before every ``create_contact`` vs the memoized owner.
+
+    $ python benchmarks/bench_create_contact.py
+
+"before" passes ``owner_id=client.user().id`` on every call, which is what ``create_contact`` used to do
+internally. The stub adds ``LATENCY`` to every request to stand in for the round-trip to amcards.com, so
+halving the requests roughly doubles the throughput. ``create_contacts`` is shown for reference.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards import AMcardsClient
+from stub_server import StubServer
+
+
+N = 500
+THREADS = 8
+LATENCY = 0.005
+
+CONTACT = {
+    'first_name': 'Keith',
+    'last_name': 'May',
+    'address_line_1': '364 Spruce Drive',
+    'city': 'Philadelphia',
+    'state': 'PA',
+    'postal_code': '19107',
+    'phone': '5556667777',
+}
+
+
+def create_each(create, threads: int):
+    def job() -> None:
+        if threads == 1:
+            for i in range(N):
+                create(i)
+        else:
+            with ThreadPoolExecutor(threads) as pool:
+                list(pool.map(create, range(N)))
+    return job
+
+
+def run(label: str, stub: StubServer, job) -> None:
+    requests_before = stub.request_count
+    start = time.perf_counter()
+    job()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<40} {N / elapsed:>10.0f} contacts/s {(stub.request_count - requests_before) / N:>6.2f} requests/contact')
+
+
+def main() -> None:
+    with StubServer(latency=LATENCY) as stub:
+        client = AMcardsClient('token', domain=stub.url)
+        # Without coalescing, concurrent user() calls are not merged, as they were not before the memo either
+        uncoalesced = AMcardsClient('token', domain=stub.url, coalesce_requests=False)
+        before = lambda i: uncoalesced.create_contact(**CONTACT, email=f'contact{i}@example.com', owner_id=uncoalesced.user().id)
+        after = lambda i: client.create_contact(**CONTACT, email=f'contact{i}@example.com')
+        contacts = [CONTACT | {'email': f'contact{i}@example.com'} for i in range(N)]
+        run('before, 1 thread', stub, create_each(before, 1))
+        run('after, 1 thread', stub, create_each(after, 1))
+        run(f'before, {THREADS} threads', stub, create_each(before, THREADS))
+        run(f'after, {THREADS} threads', stub, create_each(after, THREADS))
+        run(f'create_contacts, {THREADS} workers', stub, lambda: list(client.create_contacts(contacts, max_workers=THREADS)))
+
+
+if __name__ == '__main__':
+    main()
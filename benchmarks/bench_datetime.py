@@ -0,0 +1,55 @@
+"""``helpers.to_datetime`` (fromisoformat fast path) vs the ``strptime`` parser it falls back to.
+
+    $ python benchmarks/bench_datetime.py
+
+Inputs cycle through the four layouts the stub (and AMcards) emits: ``T`` or space separated, no separator,
+with and without a fraction. Page rows swap ``helpers.to_datetime`` for the ``strptime`` parser to show the
+effect on ``Card._from_json`` and ``Contact._from_json``, which parse three dates each.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards import __helpers as helpers
+from amcards.models import Card, Contact
+from stub_server import DATES, card_json, contact_json
+
+
+N = 200_000
+PAGES = 40
+PAGE_SIZE = 250
+
+
+def run(label: str, fn, items: list, unit: str) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    rate = len(items) / (time.perf_counter() - start)
+    print(f'{label:<40} {rate:>12.0f} {unit}/s')
+    return rate
+
+
+def main() -> None:
+    dates = [DATES[i % len(DATES)] for i in range(N)]
+    assert all(helpers.to_datetime(date) == helpers._strptime_datetime(date) for date in DATES)
+    print(f'{N} dates')
+    slow = run('  strptime', helpers._strptime_datetime, dates, 'dates')
+    fast = run('  to_datetime', helpers.to_datetime, dates, 'dates')
+    print(f'  speedup {fast / slow:.1f}x')
+
+    fast_to_datetime = helpers.to_datetime
+    strptime_to_datetime = lambda date: None if date is None else helpers._strptime_datetime(date)
+    for model, make_json in ((Card, card_json), (Contact, contact_json)):
+        payloads = [make_json(i) for i in range(PAGES * PAGE_SIZE)]
+        print(f'{model.__name__}._from_json, {PAGES} pages of {PAGE_SIZE}')
+        helpers.to_datetime = strptime_to_datetime
+        slow = run('  strptime', model._from_json, payloads, 'objects')
+        helpers.to_datetime = fast_to_datetime
+        fast = run('  to_datetime', model._from_json, payloads, 'objects')
+        print(f'  speedup {fast / slow:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
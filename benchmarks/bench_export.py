@@ -0,0 +1,52 @@
+"""Exporting cards to columns vs holding the ``Card`` models ``bulk_cards`` returns.
+
+    $ python benchmarks/bench_export.py
+
+Both paths fetch the same pages from the local stub. Memory is the tracemalloc peak while building the
+result, timings include the HTTP round trips to the stub.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards import AMcardsClient
+from stub_server import StubServer
+
+
+N = 50_000
+PAGE_SIZE = 500
+
+
+def models(client: AMcardsClient) -> list:
+    return list(client.bulk_cards(page_size=PAGE_SIZE))
+
+
+def columns(client: AMcardsClient):
+    return client.export_cards(page_size=PAGE_SIZE)
+
+
+def run(label: str, fn, client: AMcardsClient) -> None:
+    start = time.perf_counter()
+    result = fn(client)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = fn(client)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<32} {N / elapsed:>10.0f} cards/s {size / 2 ** 20:>8.1f} MiB held {peak / 2 ** 20:>8.1f} MiB peak')
+
+
+def main() -> None:
+    with StubServer(total_count=N) as stub:
+        client = AMcardsClient('token', domain=stub.url)
+        print(f'{N} cards, pages of {PAGE_SIZE}')
+        run('bulk_cards (Card models)', models, client)
+        run('export_cards (Columns)', columns, client)
+
+
+if __name__ == '__main__':
+    main()
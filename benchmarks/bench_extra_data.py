@@ -0,0 +1,56 @@
+"""Parsing ``extra_data`` with ``ast.literal_eval`` vs the JSON / repr fast path, over realistic card pages.
+
+    $ python benchmarks/bench_extra_data.py
+
+Pages mix the two formats AMcards returns (JSON and Python-repr dicts) the way the stub does. "distinct"
+gives every card its own payload so the cache never hits, "repeated" reuses a handful of payloads, as
+cards sent by one integration usually do.
+"""
+import ast
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards import __helpers as helpers
+from amcards.models import Card
+from stub_server import card_json
+
+
+PAGES = 40
+PAGE_SIZE = 250
+
+
+def distinct_cards() -> list:
+    cards = []
+    for i in range(PAGES * PAGE_SIZE):
+        card = card_json(i)
+        extra_data = {'carMake': 'Honda', 'carModel': f'Civic {i}', 'dealer': f'Southfield #{i % 97}', 'note': "it's due"}
+        card['extra_data'] = repr(extra_data) if i % 2 else json.dumps(extra_data)
+        cards.append(card)
+    return cards
+
+
+def run(label: str, fn, payloads: list) -> None:
+    start = time.perf_counter()
+    for payload in payloads:
+        fn(payload)
+    elapsed = time.perf_counter() - start
+    print(f'{label:<44} {len(payloads) / elapsed:>12.0f} cards/s')
+
+
+def main() -> None:
+    for name, cards in (('distinct', distinct_cards()), ('repeated', [card_json(i) for i in range(PAGES * PAGE_SIZE)])):
+        payloads = [card['extra_data'] for card in cards]
+        helpers._parse_extra_data.cache_clear()
+        print(f'{name} extra_data, {PAGES} pages of {PAGE_SIZE} cards')
+        run('  ast.literal_eval', lambda s: ast.literal_eval(s or '{}'), payloads)
+        run('  parse_extra_data, uncached', helpers._parse_extra_data.__wrapped__, payloads)
+        run('  parse_extra_data', helpers.parse_extra_data, payloads)
+        run('  Card._from_json', Card._from_json, cards)
+
+
+if __name__ == '__main__':
+    main()
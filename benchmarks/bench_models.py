@@ -0,0 +1,59 @@
+"""Memory and construction time of the ``__slots__`` models vs the same classes with a per-instance ``__dict__``.
+
+    $ python benchmarks/bench_models.py
+
+The ``__dict__`` variants are built from the shipped classes at runtime (same ``__init__``, properties and
+``_from_json``, only ``__slots__`` removed), so the comparison is the instance layout and nothing else.
+Memory is the tracemalloc growth for holding every object, payload dicts excluded.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards.models import Card, Contact, CreditTransaction
+from stub_server import card_json, contact_json, credit_transaction_json
+
+
+N = 20_000
+
+
+def dict_layout(cls: type) -> type:
+    namespace = {key: value for key, value in vars(cls).items() if key not in cls.__slots__ and key != '__slots__'}
+    return type(f'Dict{cls.__name__}', cls.__bases__, namespace)
+
+
+def measure(cls: type, payloads: list) -> tuple:
+    # timed and traced separately, tracemalloc slows allocation down several times
+    gc.collect()
+    start = time.perf_counter()
+    objects = [cls._from_json(payload) for payload in payloads]
+    elapsed = time.perf_counter() - start
+    del objects
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls._from_json(payload) for payload in payloads]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size, elapsed
+
+
+def main() -> None:
+    print(f'{N} objects each, built with _from_json')
+    print(f'{"model":<34} {"MiB":>8} {"bytes/obj":>10} {"seconds":>8}')
+    for cls, make_json in ((Card, card_json), (Contact, contact_json), (CreditTransaction, credit_transaction_json)):
+        payloads = [make_json(i) for i in range(N)]
+        for variant in (dict_layout(cls), cls):
+            # untimed warm up so both variants start from the same interpreter state
+            measure(variant, payloads[:1000])
+            size, elapsed = measure(variant, payloads)
+            label = f'{cls.__name__} ({"__dict__" if variant is not cls else "__slots__"})'
+            print(f'{label:<34} {size / 2 ** 20:>8.1f} {size / N:>10.0f} {elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
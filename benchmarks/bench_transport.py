@@ -0,0 +1,52 @@
+"""Requests/second against a local stub: module-level ``requests`` (one connection per call) vs the pooled Transport.
+
+    $ python benchmarks/bench_transport.py
+
+The stub speaks plain HTTP on localhost, so this only measures TCP setup and Python overhead. Against
+amcards.com each unpooled request also pays a TLS handshake and the gap is considerably wider.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amcards import AMcardsClient, Transport
+from stub_server import StubServer
+
+
+N = 2000
+THREADS = 16
+
+
+def unpooled(url: str) -> None:
+    res = requests.get(f'{url}/.api/v1/user/', headers={'Authorization': 'Bearer token'})
+    res.json()
+
+
+def run(label: str, fn, threads: int) -> None:
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(N):
+            fn()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda _: fn(), range(N)))
+    elapsed = time.perf_counter() - start
+    print(f'{label:<40} {N / elapsed:>10.0f} req/s')
+
+
+def main() -> None:
+    with StubServer() as stub:
+        client = AMcardsClient('token', domain=stub.url, transport=Transport(pool_maxsize=THREADS))
+        run('requests.get, 1 thread', lambda: unpooled(stub.url), 1)
+        run('pooled Transport, 1 thread', client.user, 1)
+        run(f'requests.get, {THREADS} threads', lambda: unpooled(stub.url), THREADS)
+        run(f'pooled Transport, {THREADS} threads', client.user, THREADS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Shipping addresses validated/second: one address at a time, as ``send_cards`` used to, vs the column-wise batch engine.
+
+    $ python benchmarks/bench_validation.py
+
+"per address" runs the validation and sanitization helpers on each dict in turn. The batch engine
+checks each field over the whole batch and parses every distinct date once. "numpy, columns" starts
+from NumPy string arrays, as read from a data frame, the case the numpy backend is meant for.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+
+from amcards import __helpers as helpers
+from amcards.amcards import _validate_shipping_address, _validate_campaign_recipient
+from amcards.exceptions import AMcardsException
+from amcards.validation import CAMPAIGN_FIELDS, validate_addresses, validate_address_columns
+
+
+N = 100_000
+CITIES = ['Southfield', 'Detroit ', 'Philadelphia', ' Ann Arbor', 'Lansing']
+COUNTRIES = ['US', 'usa', 'United States', 'US ', 'CA']
+
+
+def address(i: int) -> dict:
+    address = {
+        'first_name': ' Ralph',
+        'last_name': 'Mullins',
+        'address_line_1': f'{i} Reppert Road',
+        'city': CITIES[i % len(CITIES)],
+        'state': 'MI',
+        'postal_code': f'{48000 + i % 1000}',
+        'country': COUNTRIES[i % len(COUNTRIES)],
+        'third_party_contact_id': f'crm{i}',
+        'phone_number': f'555{i % 10_000_000:07d}',
+        'birth_date': f'{1940 + i % 60}-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+    }
+    if i % 1000 == 0:
+        del address['city']
+    return address
+
+
+def per_address(addresses: list, kind: str) -> None:
+    sanitize = helpers.sanitize_shipping_address_for_card_send if kind == 'card' else helpers.sanitize_shipping_address_for_campaign_send
+    for idx, shipping_address in enumerate(addresses):
+        try:
+            _validate_shipping_address(shipping_address, f' at shipping_addresses[{idx}]')
+            sanitized = sanitize(shipping_address)
+            if kind == 'campaign':
+                _validate_campaign_recipient(sanitized, quote_values=True)
+        except AMcardsException:
+            pass
+
+
+def run(label: str, fn, repeat: int = 5) -> None:
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f'{label:<32} {N / elapsed:>12.0f} addresses/s')
+
+
+def main() -> None:
+    addresses = [address(i) for i in range(N)]
+    columns = {field: numpy.array([a.get(field, '') for a in addresses], dtype=str) for field in CAMPAIGN_FIELDS}
+    for kind in ('card', 'campaign'):
+        print(f'{kind}:')
+        run('per address', lambda: per_address(addresses, kind))
+        run('batch, python', lambda: validate_addresses(addresses, kind, normalize=False).addresses)
+        run('batch, python, normalized', lambda: validate_addresses(addresses, kind).addresses)
+        run('batch, numpy, normalized', lambda: validate_addresses(addresses, kind, backend='numpy').addresses)
+        run('numpy, columns, normalized', lambda: validate_address_columns(columns, kind, backend='numpy').columns)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""Local stand-in for the AMcards API used by the benchmarks.
+
+Serves canned, realistically shaped payloads over HTTP/1.1 keep-alive connections so
+benchmarks measure the client rather than amcards.com.
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+
+DATES = ('2022-11-01T13:45:12.123456', '2022-11-02 09:01:44', '2022-11-03T17:30:00', '2022-11-0408:15:59.5')
+
+
+def user_json() -> dict:
+    return {
+        'resource_uri': '/.api/v1/user/4127/',
+        'first_name': 'Ralph',
+        'last_name': 'Mullins',
+        'credits': 125000,
+        'email': 'example@example.com',
+        'phone': '5556667777',
+        'date_joined': '2021-03-14T10:22:31.004512',
+        'address_line_1': '2285 Reppert Road',
+        'city': 'Southfield',
+        'state': 'MI',
+        'postal': '48075',
+        'country': 'US',
+        'postage': {'domestic_cost': 66, 'international_cost': 150, 'domestic_countries': ['US']},
+        'product_pricing_info': {'5x7greetingcard': 376},
+    }
+
+
+def card_json(i: int) -> dict:
+    return {
+        'id': 1500000 + i,
+        'amount_charged': 4.42,
+        'status': i % 14,
+        'initiator': 'myintegration123',
+        'send_date': '2022-11-05',
+        'created': DATES[i % 4],
+        'last_modified': DATES[(i + 1) % 4],
+        'fulfilled': None if i % 3 else DATES[(i + 2) % 4],
+        'is_international': False,
+        'template_name': 'Thank You',
+        'thumbnail': 'https://amcards.com/media/thumbs/123.png',
+        'campaign_pk': None if i % 2 else 77,
+        'ship_to_first_name': 'Ralph',
+        'ship_to_last_name': f'Mullins{i}',
+        'ship_to_line_1': '2285 Reppert Road',
+        'ship_to_city': 'Southfield',
+        'ship_to_state': 'MI',
+        'ship_to_postal': '48075',
+        'ship_to_country': 'US',
+        'ship_to_organization': '',
+        'return_to_first_name': 'Keith',
+        'return_to_last_name': 'May',
+        'return_to_line_1': '364 Spruce Drive',
+        'return_to_city': 'Philadelphia',
+        'return_to_state': 'PA',
+        'return_to_postal': '19107',
+        'return_to_country': 'US',
+        'third_party_contact_id': f'crm{i}',
+        'gifts': [{'name': 'Starbucks Card', 'price': 1000, 'shipping_and_handling': 0}] if i % 5 == 0 else [],
+        'extra_data': "{'carMake': 'Honda', 'carModel': 'Civic'}" if i % 2 else '{"carMake": "Honda"}',
+    }
+
+
+def contact_json(i: int) -> dict:
+    return {
+        'id': str(900000 + i),
+        'added': DATES[i % 4],
+        'updated': DATES[(i + 1) % 4],
+        'last_card_send_date': None if i % 2 else DATES[(i + 2) % 4],
+        'notes': '',
+        'email_address': f'contact{i}@example.com',
+        'first_name': 'Keith',
+        'last_name': f'May{i}',
+        'address_line_1': '364 Spruce Drive',
+        'city': 'Philadelphia',
+        'state': 'PA',
+        'postal_code': '19107',
+        'country': 'US',
+        'organization': '',
+        'phone_number': '5556667777',
+        'birth_year': '1980',
+        'birth_month': '04',
+        'birth_day': '12',
+        'anniversary_year': '',
+        'anniversary_month': '',
+        'anniversary_day': '',
+    }
+
+
+def template_json(i: int) -> dict:
+    return {
+        'id': 100 + i,
+        'name': f'Template {i}',
+        'has_message_on_default_panel': 'False',
+        'thumbnail': 'https://amcards.com/media/thumbs/123.png',
+        'gifts': [{'gift_name': 'Starbucks Card', 'image': '', 'price': 1000, 'shipping_and_handling': 0}],
+    }
+
+
+def campaign_json(i: int) -> dict:
+    return {
+        'id': 70 + i,
+        'title': f'Campaign {i}',
+        'drip_count': 3,
+        'send_even_if_duplicate': False,
+        'has_anniversary_drip': False,
+        'has_birthday_drip': True,
+    }
+
+
+def credit_transaction_json(i: int) -> dict:
+    return {
+        'id': str(300000 + i),
+        'wallet_id': 'w-4127',
+        'grant_volume': 0,
+        'before_int': 125000 + i,
+        'after_int': 124558 + i,
+        'amount_paid_int': 0,
+        'amount_int': -442,
+        'description': 'Card send',
+        'credit_card_details': '',
+        'date_time': DATES[i % 4],
+    }
+
+
+LISTINGS = {
+    'card': card_json,
+    'contact': contact_json,
+    'template': template_json,
+    'quicksendtemplate': template_json,
+    'campaign': campaign_json,
+    'credittransaction': credit_transaction_json,
+    'mailing': lambda i: {'id': 29000 + i},
+}
+
+_LISTING = re.compile(r'^/\.api/v1/(\w+)/$')
+_DETAIL = re.compile(r'^/\.api/v1/(\w+)/(\d+)/$')
+
+
+class StubServer:
+    """Runs the stub API on a background thread.
+
+        >>> with StubServer(total_count=1000, latency=0.005) as stub:
+        ...     client = AMcardsClient('token', domain=stub.url)
+    """
+    def __init__(self, total_count: int = 1000, latency: float = 0.0) -> None:
+        self.total_count = total_count
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            wbufsize = -1
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, payload, headers: Optional[dict] = None) -> None:
+                body = json.dumps(payload).encode() if status not in (204, 304) else b''
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _count(self) -> None:
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+            def do_GET(self) -> None:
+                self._count()
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                if url.path == '/.api/v1/user/':
+                    return self._reply(200, {'meta': {'total_count': 1}, 'objects': [user_json()]})
+                match = _DETAIL.match(url.path)
+                if match and match.group(1) in LISTINGS:
+                    payload = LISTINGS[match.group(1)](int(match.group(2)) % 1000)
+                    etag = '"%08x"' % zlib.crc32(json.dumps(payload, sort_keys=True).encode())
+                    if self.headers.get('If-None-Match') == etag:
+                        return self._reply(304, None, {'ETag': etag})
+                    return self._reply(200, payload, {'ETag': etag})
+                match = _LISTING.match(url.path)
+                if match and match.group(1) in LISTINGS:
+                    limit = int(query.get('limit', ['25'])[0])
+                    offset = int(query.get('offset', ['0'])[0])
+                    end = min(offset + limit, stub.total_count)
+                    objects = [LISTINGS[match.group(1)](i) for i in range(offset, end)]
+                    return self._reply(200, {'meta': {'total_count': stub.total_count, 'limit': limit, 'offset': offset}, 'objects': objects})
+                self._reply(404, {})
+
+            def do_POST(self) -> None:
+                self._count()
+                raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if self.path == '/oauth2/token/':
+                    return self._reply(200, {'access_token': 'new-access', 'refresh_token': 'new-refresh', 'expires_in': 36000})
+                body = json.loads(raw or b'{}')
+                if self.path == '/.api/v1/contact/':
+                    return self._reply(201, {})
+                if self.path == '/cards/open-card-form-oa/':
+                    return self._reply(200, {'card': 1522873, 'total_cost': 442, 'user': 'example@example.com', 'message': 'Card created successfully!'})
+                if self.path == '/cards/open-mailing-form/':
+                    return self._reply(200, {'mailing_uri': '/.api/v1/mailing/29694/', 'user': 'example@example.com', 'message': 'Mailing created'})
+                if self.path == '/campaigns/open-campaign-form/':
+                    return self._reply(200, {'mailing': 29693, 'cards': [1528871, 1528872], 'user': 'example@example.com', 'message': 'Thanks!'})
+                if self.path == '/campaigns/calculate-campaign-price/':
+                    return self._reply(200, {'pricing': {'total_cost': 442 * len(body.get('recipients', [])) * 3}})
+                self._reply(404, {})
+
+            def do_DELETE(self) -> None:
+                self._count()
+                self._reply(204 if _DETAIL.match(self.path) else 404, {})
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -25,4 +25,9 @@ setup(
         'Programming Language :: Python :: 3.10',
     ],
     install_requires=['requests>=2'],
+    extras_require={
+        'async': ['httpx>=0.23'],
+        'numpy': ['numpy'],
+        'arrow': ['pyarrow'],
+    },
 )
@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient
+from amcards.cache import ResponseCache
+
+
+TEMPLATE = {'id': 123, 'name': 'Thank you', 'has_message_on_default_panel': True, 'thumbnail': 'https://amcards.com/thumbnail.png', 'gifts': []}
+KEY = 'https://amcards.com/.api/v1/template/123/'
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None, headers: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = headers or {}
+        self._json = json
+
+    def json(self) -> dict:
+        if self._json is None:
+            raise ValueError('No body')
+        return self._json
+
+
+class FakeTemplateApi:
+    """Answers with a 304 when the ETag sent matches, calling on_revalidate first, and with the template otherwise."""
+    def __init__(self, on_revalidate=None, not_modified: int = 0) -> None:
+        self.requests = []
+        self._on_revalidate = on_revalidate
+        self._not_modified = not_modified
+
+    def response(self, headers: dict) -> FakeResponse:
+        self.requests.append(headers or {})
+        if self._not_modified:
+            # Like a proxy answering for a client that sent no validators
+            self._not_modified -= 1
+            return FakeResponse(304)
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            if self._on_revalidate is not None:
+                self._on_revalidate()
+            return FakeResponse(304)
+        return FakeResponse(200, TEMPLATE, {'ETag': '"v1"'})
+
+    def request(self, method: str, path: str, headers: dict = None, **kwargs) -> FakeResponse:
+        return self.response(headers)
+
+    async def async_request(self, method: str, path: str, headers: dict = None, **kwargs) -> FakeResponse:
+        return self.response(headers)
+
+
+class ResponseCacheRevalidationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResponseCache()
+
+    def fetch(self, api: FakeTemplateApi) -> list:
+        # Fetches the template twice, the entry expiring in between, with the sync and the async client
+        client = AMcardsClient('token', cache=self.cache)
+        client._request = api.request
+        templates = [client.template(123)]
+        self.expire()
+        templates.append(client.template(123))
+        return [template.id for template in templates]
+
+    def async_fetch(self, api: FakeTemplateApi) -> list:
+        async def fetch() -> list:
+            client = AsyncAMcardsClient('token', cache=self.cache)
+            client._request = api.async_request
+            templates = [await client.template(123)]
+            self.expire()
+            templates.append(await client.template(123))
+            return [template.id for template in templates]
+        return asyncio.run(fetch())
+
+    def expire(self) -> None:
+        entry = self.cache.store.get(KEY)
+        if entry is not None:
+            self.cache.store.set(KEY, entry._replace(expires=0))
+
+    def test_not_modified_with_entry(self) -> None:
+        for fetch in (self.fetch, self.async_fetch):
+            with self.subTest(fetch=fetch.__name__):
+                self.cache.clear()
+                api = FakeTemplateApi()
+                self.assertEqual(fetch(api), [123, 123])
+                self.assertEqual(api.requests, [{}, {'If-None-Match': '"v1"'}])
+                self.assertEqual(self.cache.revalidations, 1)
+                self.assertGreater(self.cache.store.get(KEY).expires, 0)
+
+    def test_not_modified_after_entry_evicted(self) -> None:
+        for fetch in (self.fetch, self.async_fetch):
+            with self.subTest(fetch=fetch.__name__):
+                self.cache.clear()
+                api = FakeTemplateApi(on_revalidate=self.cache.store.clear)
+                self.assertEqual(fetch(api), [123, 123])
+                self.assertEqual(len(api.requests), 2)
+                # The entry revalidated is stored again
+                self.assertEqual(self.cache.store.get(KEY).body, TEMPLATE)
+
+    def test_not_modified_without_entry_is_a_miss(self) -> None:
+        for fetch in (self.fetch, self.async_fetch):
+            with self.subTest(fetch=fetch.__name__):
+                self.cache.clear()
+                api = FakeTemplateApi(not_modified=1)
+                self.assertEqual(fetch(api), [123, 123])
+                # The 304 is followed by a full GET without validators, the next lookup revalidates as usual
+                self.assertEqual(api.requests, [{}, {}, {'If-None-Match': '"v1"'}])
+                self.assertEqual(self.cache.revalidations, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
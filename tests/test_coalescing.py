@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient, exceptions
+from amcards.retry import RetryPolicy
+
+
+PATH = '/.api/v1/template/123/'
+
+
+class FakeResponse:
+    status_code = 200
+    text = ''
+    headers = {}
+
+    def json(self) -> dict:
+        return {}
+
+
+class BlockingTransport:
+    """Holds every request until ``release`` is set, then answers it or raises ``error``."""
+    def __init__(self, error: Exception = None) -> None:
+        self.requests = 0
+        self.called = threading.Event()
+        self.release = threading.Event()
+        self._error = error
+
+    def request(self, method: str, url: str, **kwargs) -> FakeResponse:
+        self.requests += 1
+        self.called.set()
+        self.release.wait(timeout=5)
+        if self._error is not None:
+            raise self._error
+        return FakeResponse()
+
+
+class AsyncBlockingTransport:
+    def __init__(self, error: Exception = None) -> None:
+        self.requests = 0
+        self.release = asyncio.Event()
+        self._error = error
+
+    async def request(self, method: str, url: str, **kwargs) -> FakeResponse:
+        self.requests += 1
+        await self.release.wait()
+        if self._error is not None:
+            raise self._error
+        return FakeResponse()
+
+
+class CoalescingTest(unittest.TestCase):
+    def get_concurrently(self, transport: BlockingTransport, callers: int = 5) -> list:
+        client = AMcardsClient('token', transport=transport, retry_policy=RetryPolicy(max_attempts=1))
+        outcomes = []
+
+        def get() -> None:
+            try:
+                outcomes.append(client._request('GET', PATH))
+            except exceptions.AMcardsException as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=get) for _ in range(callers)]
+        threads[0].start()
+        transport.called.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        # Let the other callers join the request in flight
+        time.sleep(0.1)
+        transport.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(client._in_flight, {})
+        return outcomes
+
+    def test_identical_gets_share_one_request(self) -> None:
+        transport = BlockingTransport()
+        outcomes = self.get_concurrently(transport)
+        self.assertEqual(transport.requests, 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(outcome is outcomes[0] for outcome in outcomes))
+
+    def test_error_reaches_every_caller(self) -> None:
+        transport = BlockingTransport(exceptions.NetworkError('Could not reach AMcards: connection reset'))
+        outcomes = self.get_concurrently(transport)
+        self.assertEqual(transport.requests, 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(isinstance(outcome, exceptions.NetworkError) for outcome in outcomes))
+
+
+class AsyncCoalescingTest(unittest.TestCase):
+    def run_with(self, transport_error: Exception, test) -> None:
+        async def run() -> None:
+            transport = AsyncBlockingTransport(transport_error)
+            client = AsyncAMcardsClient('token', transport=transport, retry_policy=RetryPolicy(max_attempts=1))
+            tasks = [asyncio.ensure_future(client._request('GET', PATH)) for _ in range(5)]
+            # Every task reaches the shared request before it is answered
+            await asyncio.sleep(0.01)
+            await test(transport, tasks)
+            self.assertEqual(client._in_flight, {})
+        asyncio.run(run())
+
+    def test_identical_gets_share_one_request(self) -> None:
+        async def test(transport: AsyncBlockingTransport, tasks: list) -> None:
+            transport.release.set()
+            responses = await asyncio.gather(*tasks)
+            self.assertEqual(transport.requests, 1)
+            self.assertTrue(all(response is responses[0] for response in responses))
+        self.run_with(None, test)
+
+    def test_error_reaches_every_caller(self) -> None:
+        async def test(transport: AsyncBlockingTransport, tasks: list) -> None:
+            transport.release.set()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            self.assertEqual(transport.requests, 1)
+            self.assertTrue(all(isinstance(outcome, exceptions.NetworkError) for outcome in outcomes))
+        self.run_with(exceptions.NetworkError('Could not reach AMcards: connection reset'), test)
+
+    def test_cancelled_caller_leaves_the_request_to_the_others(self) -> None:
+        async def test(transport: AsyncBlockingTransport, tasks: list) -> None:
+            # The first task started the shared request
+            tasks[0].cancel()
+            tasks[1].cancel()
+            transport.release.set()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            self.assertEqual(transport.requests, 1)
+            self.assertIsInstance(outcomes[0], asyncio.CancelledError)
+            self.assertIsInstance(outcomes[1], asyncio.CancelledError)
+            self.assertTrue(all(isinstance(outcome, FakeResponse) for outcome in outcomes[2:]))
+        self.run_with(None, test)
+
+    def test_every_caller_cancelled(self) -> None:
+        async def test(transport: AsyncBlockingTransport, tasks: list) -> None:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            transport.release.set()
+            # The shared request still completes and is forgotten
+            await asyncio.sleep(0.01)
+            self.assertEqual(transport.requests, 1)
+        self.run_with(exceptions.NetworkError('Could not reach AMcards: connection reset'), test)
+
+
+if __name__ == '__main__':
+    unittest.main()
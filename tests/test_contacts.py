@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient
+from amcards.models import ContactImportStatus
+
+
+CONTACT = {
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal_code': '48075',
+    'email': 'ralph@example.com',
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+
+    def json(self) -> dict:
+        return {}
+
+
+class FakeContactApi:
+    """Answers contact creates with the given status codes in turn, then 201."""
+    def __init__(self, status_codes: list) -> None:
+        self.requests = 0
+        self._status_codes = list(status_codes)
+        self._lock = threading.Lock()
+
+    def status_code(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self._status_codes.pop(0) if self._status_codes else 201
+
+    def request(self, method: str, path: str, **kwargs) -> FakeResponse:
+        status_code = self.status_code()
+        time.sleep(0.02)
+        return FakeResponse(status_code)
+
+    async def async_request(self, method: str, path: str, **kwargs) -> FakeResponse:
+        status_code = self.status_code()
+        await asyncio.sleep(0.02)
+        return FakeResponse(status_code)
+
+
+class CreateContactsTest(unittest.TestCase):
+    contacts = [CONTACT, CONTACT | {'notes': 'second row'}, CONTACT | {'notes': 'third row'}]
+
+    def create_contacts(self, api: FakeContactApi) -> list:
+        client = AMcardsClient('token')
+        client._request = api.request
+        return [result.status for result in client.create_contacts(self.contacts, owner_id=1)]
+
+    def async_create_contacts(self, api: FakeContactApi) -> list:
+        async def create_contacts() -> list:
+            client = AsyncAMcardsClient('token')
+            client._request = api.async_request
+            return [result.status async for result in client.create_contacts(self.contacts, owner_id=1)]
+        return asyncio.run(create_contacts())
+
+    def test_failed_contact_does_not_make_later_rows_duplicates(self) -> None:
+        for create_contacts in (self.create_contacts, self.async_create_contacts):
+            api = FakeContactApi([500])
+            statuses = create_contacts(api)
+            self.assertEqual(statuses, [ContactImportStatus.FAILED, ContactImportStatus.CREATED, ContactImportStatus.DUPLICATE])
+            self.assertEqual(api.requests, 2)
+
+    def test_created_contact_makes_later_rows_duplicates(self) -> None:
+        for create_contacts in (self.create_contacts, self.async_create_contacts):
+            api = FakeContactApi([])
+            statuses = create_contacts(api)
+            self.assertEqual(statuses, [ContactImportStatus.CREATED, ContactImportStatus.DUPLICATE, ContactImportStatus.DUPLICATE])
+            self.assertEqual(api.requests, 1)
+
+    def test_duplicate_waiting_for_a_contact_does_not_hold_a_worker(self) -> None:
+        other_sent = threading.Event()
+
+        def request(method: str, path: str, json: dict = None, **kwargs) -> FakeResponse:
+            if json['email_address'] == CONTACT['email']:
+                # Only created once the third contact was sent while this one is in flight, with its duplicate waiting behind it
+                return FakeResponse(201 if other_sent.wait(timeout=2) else 500)
+            other_sent.set()
+            return FakeResponse(201)
+
+        client = AMcardsClient('token')
+        client._request = request
+        contacts = [CONTACT, CONTACT | {'notes': 'second row'}, CONTACT | {'email': 'keith@example.com'}]
+        statuses = [result.status for result in client.create_contacts(contacts, max_workers=2, owner_id=1)]
+        self.assertEqual(statuses, [ContactImportStatus.CREATED, ContactImportStatus.DUPLICATE, ContactImportStatus.CREATED])
+
+
+if __name__ == '__main__':
+    unittest.main()
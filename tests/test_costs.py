@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient, exceptions
+
+
+USER = {
+    'resource_uri': '/.api/v1/user/4127/',
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'credits': 125000,
+    'email': 'example@example.com',
+    'phone': '5556667777',
+    'date_joined': '2021-03-14T10:22:31.004512',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal': '48075',
+    'country': 'US',
+    'postage': {'domestic_cost': 66, 'international_cost': 150, 'domestic_countries': ['US']},
+    'product_pricing_info': {'5x7greetingcard': 376},
+}
+
+US = {'first_name': 'Ralph', 'last_name': 'Mullins', 'address_line_1': '2285 Reppert Road', 'city': 'Southfield', 'state': 'MI', 'postal_code': '48075', 'country': 'US'}
+CA = US | {'city': 'Toronto', 'state': 'ON', 'postal_code': 'M5H 2N2', 'country': 'CA'}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class FakePricingApi:
+    """Answers user fetches and campaign pricing, 1326 cents for US recipients and 1578 otherwise."""
+    def __init__(self, forbidden: bool = False) -> None:
+        self.user_requests = 0
+        self.pricing_requests = 0
+        self.in_flight = self.max_in_flight = 0
+        self._forbidden = forbidden
+        self._lock = threading.Lock()
+
+    def start(self, path: str) -> None:
+        with self._lock:
+            if path == '/.api/v1/user/':
+                self.user_requests += 1
+            else:
+                self.pricing_requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def response(self, path: str, json: dict) -> FakeResponse:
+        with self._lock:
+            self.in_flight -= 1
+        if path == '/.api/v1/user/':
+            return FakeResponse(200, {'objects': [USER]})
+        if self._forbidden:
+            return FakeResponse(403)
+        return FakeResponse(200, {'pricing': {'total_cost': 1326 if json['recipients'][0].get('country') == 'US' else 1578}})
+
+    def request(self, method: str, path: str, json: dict = None, **kwargs) -> FakeResponse:
+        self.start(path)
+        time.sleep(0.02)
+        return self.response(path, json)
+
+    async def async_request(self, method: str, path: str, json: dict = None, **kwargs) -> FakeResponse:
+        self.start(path)
+        await asyncio.sleep(0.02)
+        return self.response(path, json)
+
+
+class BatchCostTest(unittest.TestCase):
+    def client(self, api: FakePricingApi) -> AMcardsClient:
+        client = AMcardsClient('token')
+        client._request = api.request
+        return client
+
+    def test_send_cards_cost_matches_single_quotes_from_one_user_fetch(self) -> None:
+        api = FakePricingApi()
+        client = self.client(api)
+        addresses = [US, CA, US, US | {'country': 'United States'}]
+        cost = client.send_cards_cost('123', addresses)
+        self.assertEqual(cost.costs, [client.send_card_cost('123', address) for address in addresses])
+        self.assertEqual(cost.costs, [442, 526, 442, 442])
+        self.assertEqual(cost.total_cost, 1852)
+        self.assertEqual(api.user_requests, 1)
+
+    def test_send_cards_cost_validates_every_address_first(self) -> None:
+        api = FakePricingApi()
+        with self.assertRaisesRegex(exceptions.ShippingAddressError, r'shipping_addresses\[1\]'):
+            self.client(api).send_cards_cost('123', [US, {'first_name': 'Ralph'}])
+        self.assertEqual(api.user_requests, 0)
+
+    def test_send_campaign_cost_many_prices_each_distinct_recipient_once(self) -> None:
+        api = FakePricingApi()
+        recipients = [US, CA, US, US | {'first_name': 'Keith'}, CA, US | {'last_name': 'May'}]
+        cost = self.client(api).send_campaign_cost_many('77', recipients, max_workers=2)
+        self.assertEqual(cost.costs, [1326, 1578, 1326, 1326, 1578, 1326])
+        self.assertEqual(cost.total_cost, sum(cost.costs))
+        self.assertEqual(api.pricing_requests, 4)
+        self.assertEqual(api.max_in_flight, 2)
+
+    def test_send_campaign_cost_many_raises_pricing_errors(self) -> None:
+        with self.assertRaises(exceptions.ForbiddenCampaignError):
+            self.client(FakePricingApi(forbidden=True)).send_campaign_cost_many('77', [US, CA])
+
+    def test_async_batch_costs(self) -> None:
+        api = FakePricingApi()
+
+        async def costs() -> tuple:
+            client = AsyncAMcardsClient('token')
+            client._request = api.async_request
+            cards = await client.send_cards_cost('123', [US, CA])
+            campaigns = await client.send_campaign_cost_many('77', [US, CA, US], max_workers=2)
+            return cards.costs, campaigns.costs
+
+        self.assertEqual(asyncio.run(costs()), ([442, 526], [1326, 1578, 1326]))
+        self.assertEqual(api.user_requests, 1)
+        self.assertEqual(api.pricing_requests, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
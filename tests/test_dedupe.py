@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, exceptions
+from amcards.dedupe import DuplicateIndex
+
+
+SHIPPING_ADDRESS = {
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal_code': '48075',
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class DuplicateReservationTest(unittest.TestCase):
+    def client(self, status_code: int = 200) -> AMcardsClient:
+        client = AMcardsClient('token', duplicate_index=DuplicateIndex())
+        self.requests = 0
+        lock = threading.Lock()
+
+        def request(method: str, path: str, **kwargs) -> FakeResponse:
+            with lock:
+                self.requests += 1
+            time.sleep(0.05)
+            return FakeResponse(status_code, {'card': 1522873, 'total_cost': 442, 'user': 'example@example.com', 'message': 'Card created'})
+        client._request = request
+        return client
+
+    def send_concurrently(self, client: AMcardsClient, threads: int = 8) -> list:
+        outcomes = []
+
+        def send() -> None:
+            try:
+                client.send_card('123', 'crm', SHIPPING_ADDRESS)
+                outcomes.append('sent')
+            except exceptions.AMcardsException as e:
+                outcomes.append(type(e).__name__)
+        workers = [threading.Thread(target=send) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return outcomes
+
+    def test_concurrent_sends_are_sent_once(self) -> None:
+        client = self.client()
+        outcomes = self.send_concurrently(client)
+        self.assertEqual(self.requests, 1)
+        self.assertEqual(outcomes.count('sent'), 1)
+        self.assertEqual(outcomes.count('DuplicateCardError'), 7)
+        with self.assertRaises(exceptions.DuplicateCardError):
+            client.send_card('123', 'other-initiator', SHIPPING_ADDRESS)
+
+    def test_rejected_send_is_released(self) -> None:
+        client = self.client(status_code=402)
+        with self.assertRaises(exceptions.InsufficientCreditsError):
+            client.send_card('123', 'crm', SHIPPING_ADDRESS)
+        with self.assertRaises(exceptions.InsufficientCreditsError):
+            client.send_card('123', 'crm', SHIPPING_ADDRESS)
+        self.assertEqual(self.requests, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
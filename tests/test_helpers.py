@@ -0,0 +1,100 @@
+import ast
+import datetime
+import unittest
+
+from amcards import __helpers as helpers
+
+
+class ParseExtraDataTest(unittest.TestCase):
+    accepted = [
+        '{"carMake": "Honda", "carModel": "Civic"}',
+        "{'carMake': 'Honda', 'note': \"it's due\"}",
+        "{'carMake': 'Honda', 'year': 2020, 'tags': ['a', 'b']}",
+        '{"nested": {"b": 1}, "list": [1, 2.5, -3]}',
+        '{"escaped": "caf\\u00e9 \\"quoted\\""}',
+        '{"note": "true or null, not a name"}',
+        "{'flag': True, 'missing': None}",
+        '{}',
+    ]
+    rejected = [
+        '{"flag": true}',
+        '{"missing": null}',
+        '{"value": NaN}',
+        '{"value": Infinity}',
+        '{"carMake": Honda}',
+    ]
+
+    def test_accepts_what_literal_eval_accepts(self) -> None:
+        for extra_data in self.accepted:
+            with self.subTest(extra_data=extra_data):
+                self.assertEqual(helpers.parse_extra_data(extra_data), ast.literal_eval(extra_data))
+
+    def test_rejects_what_literal_eval_rejects(self) -> None:
+        for extra_data in self.rejected:
+            with self.subTest(extra_data=extra_data):
+                with self.assertRaises(ValueError):
+                    ast.literal_eval(extra_data)
+                with self.assertRaises(ValueError):
+                    helpers.parse_extra_data(extra_data)
+
+    def test_empty_extra_data(self) -> None:
+        self.assertEqual(helpers.parse_extra_data(None), {})
+        self.assertEqual(helpers.parse_extra_data(''), {})
+
+    def test_mutations_do_not_reach_other_cards(self) -> None:
+        for extra_data in ('{"a": {"b": 1}}', '{"a": "b"}'):
+            parsed = helpers.parse_extra_data(extra_data)
+            if isinstance(parsed['a'], dict):
+                parsed['a']['b'] = 2
+            parsed['c'] = 'd'
+            self.assertEqual(helpers.parse_extra_data(extra_data), ast.literal_eval(extra_data))
+
+
+def strptime_datetime(datetime_str: str) -> datetime.datetime:
+    # to_datetime before the fromisoformat fast path
+    if 'T' in datetime_str:
+        if '.' in datetime_str:
+            return datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S.%f')
+        return datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S')
+    if ' ' in datetime_str:
+        if '.' in datetime_str:
+            return datetime.datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S.%f')
+        return datetime.datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+    if '.' in datetime_str:
+        return datetime.datetime.strptime(datetime_str, '%Y-%m-%d%H:%M:%S.%f')
+    return datetime.datetime.strptime(datetime_str, '%Y-%m-%d%H:%M:%S')
+
+
+class ToDatetimeTest(unittest.TestCase):
+    timestamps = [
+        # The layouts AMcards returns
+        '2022-11-01T13:45:12', '2022-11-02 09:01:44', '2022-11-0408:15:59',
+        '2022-11-01T13:45:12.123456', '2022-11-02 09:01:44.5', '2022-11-0408:15:59.50',
+        '2022-11-01T13:45:12.1', '2022-11-01T13:45:12.12', '2022-11-01T13:45:12.123', '2022-11-01T13:45:12.12345',
+        '2024-02-29T00:00:00', '1999-12-31 23:59:59.999999',
+        # Shapes strptime rejected, and must still be rejected
+        '2022-11-01T13:45:12Z', '2022-11-01T13:45:12+00:00', '2022-11-01T13:45:12.123456Z', '2022-11-01T13:45:12.123-05:00',
+        '2022-11-01T13:45:12.1234567', '2022-11-01T13:45:12.', '2022-11-01T13:45', '2022-11-01',
+        '2023-02-29T00:00:00', '2022-11-01T24:00:00', '2022-11-01T 3:45:12', '2022-11-01T13:45:1a',
+        '2022-11-01T\uff11\uff13:45:12', '2022-11-01X13:45:12', '',
+    ]
+
+    def test_matches_strptime(self) -> None:
+        for timestamp in self.timestamps:
+            with self.subTest(timestamp=timestamp):
+                try:
+                    expected = strptime_datetime(timestamp)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        helpers.to_datetime(timestamp)
+                    continue
+                parsed = helpers.to_datetime(timestamp)
+                self.assertEqual(parsed, expected)
+                self.assertIsNone(parsed.tzinfo, 'timestamps are parsed as naive datetimes')
+
+    def test_none(self) -> None:
+        self.assertIsNone(helpers.to_datetime(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
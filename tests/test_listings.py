@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient
+
+
+class FakeResponse:
+    def __init__(self, json: dict) -> None:
+        self.status_code = 200
+        self.text = ''
+        self.headers = {}
+        self._json = json
+
+    def json(self) -> dict:
+        return self._json
+
+
+class FakeCardListing:
+    """Pages through ``total`` cards, at most ``max_limit`` at a time, and records the offset and limit of every page request."""
+    def __init__(self, total: int, delay=lambda offset: 0.0, max_limit: int = 1000) -> None:
+        self.cards = [{'id': id} for id in range(total)]
+        self.pages = []
+        self.in_flight = self.max_in_flight = 0
+        self._delay = delay
+        self._max_limit = max_limit
+        self._lock = threading.Lock()
+
+    def start(self, params: dict) -> float:
+        with self._lock:
+            self.pages.append((params['offset'], params['limit']))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return self._delay(params['offset'])
+
+    def response(self, params: dict) -> FakeResponse:
+        if 'offset' not in params:
+            return FakeResponse({'meta': {'total_count': len(self.cards)}, 'objects': self.cards[:1]})
+        with self._lock:
+            self.in_flight -= 1
+        offset = params['offset']
+        return FakeResponse({'objects': self.cards[offset:offset + min(params['limit'], self._max_limit)]})
+
+    def request(self, method: str, path: str, params: dict = None, **kwargs) -> FakeResponse:
+        if 'offset' in params:
+            time.sleep(self.start(params))
+        return self.response(params)
+
+    async def async_request(self, method: str, path: str, params: dict = None, **kwargs) -> FakeResponse:
+        if 'offset' in params:
+            await asyncio.sleep(self.start(params))
+        return self.response(params)
+
+    def client(self) -> AMcardsClient:
+        client = AMcardsClient('token', lazy_models=True)
+        client._request = self.request
+        return client
+
+    def async_client(self) -> AsyncAMcardsClient:
+        client = AsyncAMcardsClient('token', lazy_models=True)
+        client._request = self.async_request
+        return client
+
+
+class IterPagesTest(unittest.TestCase):
+    def test_every_card_in_order(self) -> None:
+        for prefetch in (True, False):
+            with self.subTest(prefetch=prefetch):
+                listing = FakeCardListing(50)
+                ids = [card.id for card in listing.client().iter_cards(page_size=7, prefetch=prefetch)]
+                self.assertEqual(ids, list(range(50)))
+                # Pages until the first empty one
+                self.assertEqual(sorted(listing.pages), [(offset, 7) for offset in range(0, 50, 7)] + [(50, 7)])
+
+    def test_skip(self) -> None:
+        listing = FakeCardListing(20)
+        self.assertEqual([card.id for card in listing.client().iter_cards(page_size=7, skip=5)], list(range(5, 20)))
+
+    def test_prefetch_keeps_one_page_ahead(self) -> None:
+        listing = FakeCardListing(50)
+        cards = listing.client().iter_cards(page_size=7)
+        self.assertEqual([next(cards).id for _ in range(7)], list(range(7)))
+        time.sleep(0.05)
+        # The first page and the one prefetched while it is consumed
+        self.assertEqual(listing.pages, [(0, 7), (7, 7)])
+        cards.close()
+        time.sleep(0.05)
+        self.assertEqual(len(listing.pages), 2)
+
+    def test_async_every_card_in_order(self) -> None:
+        async def ids(prefetch: bool) -> list:
+            return [card.id async for card in listing.async_client().iter_cards(page_size=7, prefetch=prefetch)]
+        for prefetch in (True, False):
+            with self.subTest(prefetch=prefetch):
+                listing = FakeCardListing(50)
+                self.assertEqual(asyncio.run(ids(prefetch)), list(range(50)))
+                self.assertEqual(len(listing.pages), 9)
+
+
+def slow_first_pages(offset: int) -> float:
+    # The first pages answer last
+    return max(0.0, 0.05 - offset / 1000)
+
+
+class BulkPagesTest(unittest.TestCase):
+    def test_ordered_keeps_the_page_order(self) -> None:
+        listing = FakeCardListing(100, slow_first_pages)
+        ids = [card.id for card in listing.client().bulk_cards(page_size=10, max_workers=4)]
+        self.assertEqual(ids, list(range(100)))
+        self.assertEqual(len(listing.pages), 10)
+
+    def test_unordered_yields_every_card_once(self) -> None:
+        listing = FakeCardListing(100, slow_first_pages)
+        ids = [card.id for card in listing.client().bulk_cards(page_size=10, max_workers=4, ordered=False)]
+        self.assertEqual(sorted(ids), list(range(100)))
+        self.assertNotEqual(ids[:10], list(range(10)), 'pages are yielded as they arrive')
+
+    def test_at_most_max_workers_pages_in_flight(self) -> None:
+        listing = FakeCardListing(200, lambda offset: 0.01)
+        self.assertEqual(len(list(listing.client().bulk_cards(page_size=10, max_workers=3))), 200)
+        self.assertEqual(listing.max_in_flight, 3)
+
+    def test_capped_limit_is_fetched_in_several_requests(self) -> None:
+        listing = FakeCardListing(45, max_limit=4)
+        ids = [card.id for card in listing.client().bulk_cards(page_size=10, max_workers=2)]
+        self.assertEqual(ids, list(range(45)))
+        self.assertIn((0, 10), listing.pages)
+        self.assertIn((4, 6), listing.pages)
+
+    def test_async_ordered_and_bounded(self) -> None:
+        async def ids(ordered: bool) -> list:
+            return [card.id async for card in listing.async_client().bulk_cards(page_size=10, max_workers=3, ordered=ordered)]
+        for ordered in (True, False):
+            with self.subTest(ordered=ordered):
+                listing = FakeCardListing(100, slow_first_pages)
+                result = asyncio.run(ids(ordered))
+                self.assertEqual(result if ordered else sorted(result), list(range(100)))
+                self.assertLessEqual(listing.max_in_flight, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from amcards import AMcardsClient
+from amcards.mirror import Mirror
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class MirrorRefreshTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        client = AMcardsClient('token')
+        templates = [{'id': id, 'name': f'Template {id}'} for id in range(1, 6)]
+
+        def request(method: str, path: str, params: dict = None, **kwargs) -> FakeResponse:
+            page = templates[params['offset']:params['offset'] + params['limit']]
+            return FakeResponse(200, {'objects': page})
+        client._request = request
+        self.mirror = Mirror(client, os.path.join(directory.name, 'mirror.db'), page_size=2)
+        self.addCleanup(self.mirror.close)
+
+    def mirrored_templates(self) -> int:
+        return self.mirror._connection.execute('SELECT COUNT(*) FROM amcards_template').fetchone()[0]
+
+    def test_refresh_accepts_a_generator(self) -> None:
+        self.mirror.refresh(resource for resource in ['templates'])
+        self.assertEqual(self.mirrored_templates(), 5)
+
+    def test_unknown_resource_refreshes_nothing(self) -> None:
+        with self.assertRaises(ValueError):
+            self.mirror.refresh(resource for resource in ['templates', 'gifts'])
+        self.assertEqual(self.mirrored_templates(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
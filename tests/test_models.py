@@ -0,0 +1,102 @@
+import copy
+import unittest
+
+from amcards.models import Card, Contact
+
+
+CARD = {
+    'id': 1522873,
+    'amount_charged': 4.42,
+    'status': 3,
+    'initiator': 'myintegration123',
+    'send_date': '2022-11-05',
+    'created': '2022-11-01T13:45:12.123456',
+    'last_modified': '2022-11-02 09:01:44',
+    'fulfilled': None,
+    'is_international': False,
+    'template_name': 'Thank You',
+    'thumbnail': 'https://amcards.com/media/thumbs/123.png',
+    'campaign_pk': 77,
+    'ship_to_first_name': 'Ralph',
+    'ship_to_last_name': 'Mullins',
+    'ship_to_line_1': '2285 Reppert Road',
+    'ship_to_city': 'Southfield',
+    'ship_to_state': 'MI',
+    'ship_to_postal': '48075',
+    'ship_to_country': 'US',
+    'ship_to_organization': '',
+    'return_to_first_name': 'Keith',
+    'return_to_last_name': 'May',
+    'return_to_line_1': '364 Spruce Drive',
+    'return_to_city': 'Philadelphia',
+    'return_to_state': 'PA',
+    'return_to_postal': '19107',
+    'return_to_country': 'US',
+    'third_party_contact_id': 'crm1',
+    'gifts': [{'name': 'Starbucks Card', 'price': 1000, 'shipping_and_handling': 0}],
+    'extra_data': "{'carMake': 'Honda', 'carModel': 'Civic'}",
+}
+
+CONTACT = {
+    'id': '900001',
+    'added': '2022-11-01T13:45:12',
+    'updated': '2022-11-0408:15:59.5',
+    'last_card_send_date': None,
+    'notes': '',
+    'email_address': 'keith@example.com',
+    'first_name': 'Keith',
+    'last_name': 'May',
+    'address_line_1': '364 Spruce Drive',
+    'city': 'Philadelphia',
+    'state': 'PA',
+    'postal_code': '19107',
+    'country': 'US',
+    'organization': '',
+    'phone_number': '5556667777',
+    'birth_year': '1980',
+    'birth_month': '04',
+    'birth_day': '12',
+    'anniversary_year': '',
+    'anniversary_month': '',
+    'anniversary_day': '',
+}
+
+
+def fields(model) -> dict:
+    # Every public property of the model, nested models compared by their repr
+    names = [name for name, value in vars(type(model)).items() if isinstance(value, property)]
+    return {name: repr(getattr(model, name)) for name in names}
+
+
+class LazyModelTest(unittest.TestCase):
+    models = [(Card, CARD), (Contact, CONTACT)]
+
+    def test_lazy_matches_eager(self) -> None:
+        for model, json in self.models:
+            with self.subTest(model=model.__name__):
+                eager = fields(model._from_json(json))
+                self.assertGreater(len(eager), 5)
+                self.assertEqual(fields(model._from_json(json, lazy=True)), eager)
+                self.assertEqual(repr(model._from_json(json, lazy=True)), repr(model._from_json(json)))
+
+    def test_unknown_attribute_raises_attribute_error(self) -> None:
+        for model, json in self.models:
+            for instance in (model._from_json(json), model._from_json(json, lazy=True)):
+                for name in ('unknown', '_unknown', '__unknown__', '_json_'):
+                    with self.subTest(model=model.__name__, name=name):
+                        with self.assertRaises(AttributeError):
+                            getattr(instance, name)
+                self.assertFalse(hasattr(instance, 'unknown'))
+
+    def test_lazy_model_without_json_does_not_recurse(self) -> None:
+        for model, json in self.models:
+            with self.subTest(model=model.__name__):
+                # No _json yet, as during unpickling or copying
+                instance = model.__new__(model)
+                with self.assertRaises(AttributeError):
+                    instance.id
+                self.assertEqual(fields(copy.copy(model._from_json(json, lazy=True))), fields(model._from_json(json)))
+
+
+if __name__ == '__main__':
+    unittest.main()
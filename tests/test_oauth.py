@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class StubTransport:
+    """Answers token refreshes with a new access token once ``refresh_after`` requests were sent, and records the token of every other request."""
+    def __init__(self, refresh_after: int = 0, failures: int = 0) -> None:
+        self.refreshes = 0
+        self.tokens = []
+        self._refresh_after = refresh_after
+        self._failures = failures
+        self._sent = threading.Condition()
+
+    def token_response(self) -> FakeResponse:
+        with self._sent:
+            self.refreshes += 1
+            # Hold the refresh open until the requests expected to go ahead of it were sent
+            self._sent.wait_for(lambda: len(self.tokens) >= self._refresh_after, timeout=2)
+            if self._failures:
+                self._failures -= 1
+                return FakeResponse(400)
+            return FakeResponse(200, {'access_token': f'new-{self.refreshes}', 'refresh_token': 'refresh-2', 'expires_in': 36000})
+
+    def record(self, headers: dict) -> FakeResponse:
+        with self._sent:
+            self.tokens.append(headers['Authorization'].removeprefix('Bearer '))
+            self._sent.notify_all()
+        return FakeResponse(200)
+
+    def request(self, method: str, url: str, headers: dict = None, **kwargs) -> FakeResponse:
+        if url.endswith('/oauth2/token/'):
+            time.sleep(0.05)
+            return self.token_response()
+        return self.record(headers)
+
+
+class AsyncStubTransport(StubTransport):
+    async def request(self, method: str, url: str, headers: dict = None, **kwargs) -> FakeResponse:
+        if url.endswith('/oauth2/token/'):
+            await asyncio.sleep(0.05)
+            return self.token_response()
+        return self.record(headers)
+
+
+def oauth_config(expires_in: float) -> dict:
+    return {
+        'refresh_token': 'refresh-1',
+        'expiration': int((time.time() + expires_in) * 1000),
+        'client_id': 'client',
+        'client_secret': 'secret',
+    }
+
+
+class TokenRefreshTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.callbacks = []
+
+    def callback(self, **kwargs) -> None:
+        self.callbacks.append(kwargs)
+
+    def client(self, transport: StubTransport, expires_in: float) -> AMcardsClient:
+        return AMcardsClient('old', oauth_config=oauth_config(expires_in), callback=self.callback, transport=transport)
+
+    def send_concurrently(self, client: AMcardsClient, count: int) -> None:
+        barrier = threading.Barrier(count)
+
+        def send(i: int) -> None:
+            barrier.wait()
+            client._request('GET', f'/.api/v1/card/{i}/')
+        threads = [threading.Thread(target=send, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_expired_token_is_refreshed_once_for_concurrent_requests(self) -> None:
+        transport = StubTransport()
+        self.send_concurrently(self.client(transport, expires_in=-1), 8)
+        self.assertEqual(transport.refreshes, 1)
+        self.assertEqual(transport.tokens, ['new-1'] * 8)
+        self.assertEqual([callback['access_token'] for callback in self.callbacks], ['new-1'])
+
+    def test_requests_keep_the_current_token_while_it_is_refreshed_early(self) -> None:
+        # The refresh only completes once the seven other requests were sent, so none of them may wait for it
+        transport = StubTransport(refresh_after=7)
+        client = self.client(transport, expires_in=30)
+        self.send_concurrently(client, 8)
+        self.assertEqual(transport.refreshes, 1)
+        self.assertEqual(sorted(transport.tokens), ['new-1'] + ['old'] * 7)
+        self.assertEqual(len(self.callbacks), 1)
+        self.assertEqual(client._oauth_config['refresh_token'], 'refresh-2')
+
+    def test_failed_early_refresh_is_tried_again_by_the_next_request(self) -> None:
+        transport = StubTransport(failures=1)
+        client = self.client(transport, expires_in=30)
+        client._request('GET', '/.api/v1/card/1/')
+        client._request('GET', '/.api/v1/card/2/')
+        self.assertEqual(transport.refreshes, 2)
+        self.assertEqual(transport.tokens, ['old', 'new-2'])
+
+    def test_async_expired_token_is_refreshed_once_for_concurrent_tasks(self) -> None:
+        transport = AsyncStubTransport()
+
+        async def send() -> None:
+            client = AsyncAMcardsClient('old', oauth_config=oauth_config(-1), callback=self.callback, transport=transport)
+            await asyncio.gather(*(client._request('GET', f'/.api/v1/card/{i}/') for i in range(8)))
+        asyncio.run(send())
+        self.assertEqual(transport.refreshes, 1)
+        self.assertEqual(transport.tokens, ['new-1'] * 8)
+        self.assertEqual(len(self.callbacks), 1)
+
+    def test_async_tasks_keep_the_current_token_while_it_is_refreshed_early(self) -> None:
+        transport = AsyncStubTransport()
+
+        async def send() -> None:
+            client = AsyncAMcardsClient('old', oauth_config=oauth_config(30), callback=self.callback, transport=transport)
+            await asyncio.gather(*(client._request('GET', f'/.api/v1/card/{i}/') for i in range(8)))
+        asyncio.run(send())
+        self.assertEqual(transport.refreshes, 1)
+        self.assertEqual(sorted(transport.tokens), ['new-1'] + ['old'] * 7)
+        self.assertEqual(len(self.callbacks), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from amcards import exceptions
+from amcards.models import OutboxState
+from amcards.outbox import Outbox
+
+
+SHIPPING_ADDRESS = {
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal_code': '48075',
+}
+
+
+class FakeCardResponse:
+    def __init__(self, card_id: int) -> None:
+        self.card_id = card_id
+
+
+class FakeClient:
+    """Records the cards it sends, raises AuthenticationError from the ``fail_at``-th send on."""
+    def __init__(self, fail_at: int = None) -> None:
+        self.sent = []
+        self._fail_at = fail_at
+        self._lock = threading.Lock()
+
+    def send_card(self, idempotency_key: str, **request) -> FakeCardResponse:
+        with self._lock:
+            if self._fail_at is not None and len(self.sent) + 1 >= self._fail_at:
+                raise exceptions.AuthenticationError('Access token provided to client is unauthorized')
+            self.sent.append(idempotency_key)
+            card_id = len(self.sent)
+        time.sleep(0.01)
+        return FakeCardResponse(card_id)
+
+
+class OutboxDrainTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def outbox(self, client: FakeClient, entries: int = 20) -> Outbox:
+        outbox = Outbox(client, os.path.join(self._directory.name, 'outbox.db'))
+        self.addCleanup(outbox.close)
+        for i in range(entries):
+            outbox.enqueue_card('123', 'test', SHIPPING_ADDRESS | {'address_line_1': f'{i} Reppert Road'})
+        return outbox
+
+    def assert_unsent_pending(self, outbox: Outbox, client: FakeClient) -> None:
+        for entry in outbox.entries():
+            if entry.key in client.sent:
+                self.assertEqual(entry.state, OutboxState.DONE)
+            else:
+                self.assertEqual(entry.state, OutboxState.PENDING, 'an entry never sent must stay PENDING')
+
+    def test_break_leaves_unsent_entries_pending(self) -> None:
+        client = FakeClient()
+        outbox = self.outbox(client)
+        drain = outbox.drain(max_workers=2)
+        for i, _ in enumerate(drain):
+            if i == 2:
+                break
+        drain.close()
+
+        self.assert_unsent_pending(outbox, client)
+        self.assertEqual(outbox.entries(OutboxState.IN_FLIGHT), [])
+
+        # The next drain sends every remaining entry exactly once
+        list(outbox.drain(max_workers=2))
+        self.assertEqual(len(client.sent), 20)
+        self.assertEqual(len(set(client.sent)), 20)
+        self.assertEqual(len(outbox.entries(OutboxState.DONE)), 20)
+
+    def test_authentication_error_leaves_unsent_entries_pending(self) -> None:
+        client = FakeClient(fail_at=3)
+        outbox = self.outbox(client)
+        with self.assertRaises(exceptions.AuthenticationError):
+            list(outbox.drain(max_workers=2))
+
+        self.assert_unsent_pending(outbox, client)
+        self.assertEqual(outbox.entries(OutboxState.IN_FLIGHT), [])
+        self.assertEqual(len(outbox.entries(OutboxState.PENDING)), 20 - len(client.sent))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from amcards import AMcardsClient
+from amcards.ratelimit import FileTokenBucket, RateLimiter, TokenBucket, endpoint_family
+from amcards.retry import RetryPolicy
+
+
+class FakeClock:
+    """Stands in for the time module, sleeping moves the clock forward instead of blocking."""
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+
+    def json(self) -> dict:
+        return {}
+
+
+class StubTransport:
+    """Answers every request with the next of ``responses``."""
+    def __init__(self, *responses) -> None:
+        self.requests = 0
+        self._responses = list(responses)
+
+    def request(self, method: str, url: str, **kwargs) -> FakeResponse:
+        self.requests += 1
+        return self._responses.pop(0)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = mock.patch('amcards.ratelimit.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_of_capacity_then_waits_at_rate(self) -> None:
+        bucket = TokenBucket(rate=2, capacity=2)
+        delays = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(delays, [0.0, 0.0, 0.5, 0.5, 0.5])
+        self.assertEqual(self.clock.now, 1001.5)
+        self.assertEqual((bucket.acquired, bucket.throttled, bucket.wait_time), (5, 3, 1.5))
+
+    def test_reservations_queue_behind_each_other(self) -> None:
+        bucket = TokenBucket(rate=4)
+        self.assertEqual([bucket.reserve() for _ in range(8)], [0.0, 0.0, 0.0, 0.0, 0.25, 0.5, 0.75, 1.0])
+
+    def test_refill_stops_at_capacity(self) -> None:
+        bucket = TokenBucket(rate=1, capacity=2)
+        bucket.reserve(), bucket.reserve()
+        self.clock.sleep(60)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 1.0])
+
+    def test_clock_going_backwards_does_not_drain_the_bucket(self) -> None:
+        bucket = TokenBucket(rate=1, capacity=2)
+        self.clock.now -= 30
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 1.0])
+
+    def test_rate_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_acquire_async_awaits_its_delay(self) -> None:
+        bucket = TokenBucket(rate=2, capacity=1)
+        with mock.patch('amcards.ratelimit.asyncio.sleep', mock.AsyncMock()) as sleep:
+            delays = asyncio.run(self.acquire_async(bucket, 3))
+        self.assertEqual(delays, [0.0, 0.5, 1.0])
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 1.0])
+
+    async def acquire_async(self, bucket: TokenBucket, count: int) -> list:
+        return list(await asyncio.gather(*(bucket.acquire_async() for _ in range(count))))
+
+
+@unittest.skipIf(os.name != 'posix', 'FileTokenBucket requires fcntl')
+class FileTokenBucketTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = mock.patch('amcards.ratelimit.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'sends.bucket')
+
+    def bucket(self) -> FileTokenBucket:
+        bucket = FileTokenBucket(self.path, rate=2, capacity=2)
+        self.addCleanup(bucket.close)
+        return bucket
+
+    def test_buckets_on_the_same_file_share_one_budget(self) -> None:
+        first, second = self.bucket(), self.bucket()
+        self.assertEqual([first.reserve(), second.reserve(), first.reserve(), second.reserve()], [0.0, 0.0, 0.5, 1.0])
+        self.clock.sleep(1.0)
+        self.assertEqual(self.bucket().reserve(), 0.5)
+
+    def test_metrics_are_per_process(self) -> None:
+        first, second = self.bucket(), self.bucket()
+        first.acquire(), first.acquire(), second.acquire()
+        self.assertEqual((first.acquired, first.throttled), (2, 0))
+        self.assertEqual((second.acquired, second.throttled, second.wait_time), (1, 1, 0.5))
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_endpoint_family(self) -> None:
+        self.assertEqual(endpoint_family('get', '/.api/v1/card/'), 'listing')
+        self.assertEqual(endpoint_family('POST', '/cards/open-card-form-oa/'), 'sends')
+        self.assertEqual(endpoint_family('POST', '/campaigns/calculate-campaign-price/'), 'pricing')
+        self.assertEqual(endpoint_family('DELETE', '/.api/v1/contact/1/'), 'other')
+
+    @mock.patch('amcards.ratelimit.time', FakeClock())
+    def test_only_limited_families_take_tokens(self) -> None:
+        sends = TokenBucket(rate=1)
+        limiter = RateLimiter(sends=sends)
+        self.assertEqual(limiter.acquire('GET', '/.api/v1/card/'), 0.0)
+        self.assertEqual(limiter.acquire('POST', '/cards/open-card-form-oa/'), 0.0)
+        self.assertEqual(limiter.acquire('POST', '/cards/open-mailing-form/'), 1.0)
+        self.assertEqual(sends.acquired, 2)
+        self.assertEqual(limiter.wait_times, {'sends': 1.0})
+
+    @mock.patch('amcards.amcards.time.sleep')
+    @mock.patch('amcards.ratelimit.time', FakeClock())
+    def test_every_attempt_of_a_retried_request_takes_a_token(self, sleep: mock.Mock) -> None:
+        listing = TokenBucket(rate=1)
+        transport = StubTransport(FakeResponse(503), FakeResponse(503), FakeResponse(200))
+        client = AMcardsClient('token', transport=transport, retry_policy=RetryPolicy(), rate_limiter=RateLimiter(listing=listing))
+        client._request('GET', '/.api/v1/template/')
+        self.assertEqual(transport.requests, 3)
+        self.assertEqual(listing.acquired, 3)
+        self.assertEqual(listing.wait_time, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from amcards import AMcardsClient, AsyncAMcardsClient, exceptions
+from amcards.retry import RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = headers or {}
+
+    def json(self) -> dict:
+        return {}
+
+
+class StubTransport:
+    """Answers every request with the next of ``outcomes``, a response or a NetworkError to raise, and records the requests."""
+    def __init__(self, *outcomes) -> None:
+        self.requests = []
+        self._outcomes = list(outcomes)
+
+    def request(self, method: str, url: str, headers: dict = None, **kwargs) -> FakeResponse:
+        self.requests.append((method, dict(headers or {})))
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class AsyncStubTransport(StubTransport):
+    async def request(self, method: str, url: str, headers: dict = None, **kwargs) -> FakeResponse:
+        return StubTransport.request(self, method, url, headers, **kwargs)
+
+
+def network_error() -> exceptions.NetworkError:
+    return exceptions.NetworkError('Could not reach AMcards: connection reset')
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff_doubles_up_to_backoff_max(self) -> None:
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0, jitter=False)
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 6)], [0.5, 1.0, 2.0, 3.0, 3.0])
+
+    def test_full_jitter_stays_below_backoff(self) -> None:
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0)
+        for attempt in range(1, 6):
+            for _ in range(50):
+                self.assertTrue(0 <= policy.delay(attempt) <= min(3.0, 0.5 * 2 ** (attempt - 1)))
+
+    def test_retry_after_overrides_backoff(self) -> None:
+        policy = RetryPolicy(backoff_max=30.0)
+        self.assertEqual(policy.delay(1, '7'), 7.0)
+        self.assertIsNone(policy.delay(1, '120'), 'a Retry-After longer than backoff_max is not waited for')
+        self.assertLessEqual(policy.delay(1, 'soon'), 0.5, 'an unparsable Retry-After falls back to the backoff')
+
+    def test_should_retry(self) -> None:
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.should_retry('GET', 1, False, 503))
+        self.assertTrue(policy.should_retry('GET', 2, False))
+        self.assertFalse(policy.should_retry('GET', 3, False, 503))
+        self.assertFalse(policy.should_retry('GET', 1, False, 400))
+        self.assertFalse(policy.should_retry('POST', 1, False, 503))
+        self.assertTrue(policy.should_retry('POST', 1, True, 503))
+
+
+@mock.patch('amcards.amcards.time.sleep')
+class RetryingRequestTest(unittest.TestCase):
+    def client(self, transport: StubTransport, **policy) -> AMcardsClient:
+        return AMcardsClient('token', transport=transport, retry_policy=RetryPolicy(**policy))
+
+    def test_get_is_retried_until_it_succeeds(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(FakeResponse(503), network_error(), FakeResponse(200))
+        res = self.client(transport)._request('GET', '/.api/v1/template/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(transport.requests), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_retry_after_is_slept_instead_of_the_backoff(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(FakeResponse(429, {'Retry-After': '7'}), FakeResponse(200))
+        self.client(transport, backoff_base=0.5)._request('GET', '/.api/v1/template/')
+        sleep.assert_called_once_with(7.0)
+
+    def test_server_error_once_retries_run_out(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(*(FakeResponse(502) for _ in range(3)))
+        with self.assertRaises(exceptions.ServerError):
+            self.client(transport, max_attempts=3)._request('GET', '/.api/v1/template/')
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_network_error_once_retries_run_out(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(*(network_error() for _ in range(2)))
+        with self.assertRaises(exceptions.NetworkError):
+            self.client(transport, max_attempts=2)._request('GET', '/.api/v1/template/')
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_rate_limit_error_once_retries_run_out(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(FakeResponse(429, {'Retry-After': '120'}))
+        with self.assertRaises(exceptions.RateLimitError):
+            self.client(transport)._request('GET', '/.api/v1/template/')
+        self.assertEqual(len(transport.requests), 1)
+        sleep.assert_not_called()
+
+    def test_post_without_idempotency_key_is_not_retried(self, sleep: mock.Mock) -> None:
+        for outcome in (FakeResponse(503), network_error()):
+            transport = StubTransport(outcome, FakeResponse(200))
+            with self.assertRaises((exceptions.ServerError, exceptions.NetworkError)):
+                self.client(transport)._request('POST', '/cards/open-card-form-oa/', json={})
+            self.assertEqual(len(transport.requests), 1)
+        sleep.assert_not_called()
+
+    def test_post_with_idempotency_key_is_retried_with_the_same_key(self, sleep: mock.Mock) -> None:
+        transport = StubTransport(FakeResponse(503), network_error(), FakeResponse(200))
+        self.client(transport)._request('POST', '/cards/open-card-form-oa/', idempotency_key='send-1', json={})
+        self.assertEqual([headers['Idempotency-Key'] for _, headers in transport.requests], ['send-1'] * 3)
+
+
+class AsyncRetryingRequestTest(unittest.TestCase):
+    def request(self, transport: AsyncStubTransport, method: str, **kwargs):
+        async def request():
+            client = AsyncAMcardsClient('token', transport=transport, retry_policy=RetryPolicy())
+            return await client._request(method, '/.api/v1/template/', **kwargs)
+        with mock.patch('amcards.aio.asyncio.sleep', mock.AsyncMock()) as sleep:
+            try:
+                return asyncio.run(request())
+            finally:
+                self.sleeps = [call.args[0] for call in sleep.call_args_list]
+
+    def test_get_is_retried_with_retry_after(self) -> None:
+        transport = AsyncStubTransport(FakeResponse(503, {'Retry-After': '2'}), network_error(), FakeResponse(200))
+        self.assertEqual(self.request(transport, 'GET').status_code, 200)
+        self.assertEqual(len(transport.requests), 3)
+        self.assertEqual(self.sleeps[0], 2.0)
+
+    def test_post_without_idempotency_key_is_not_retried(self) -> None:
+        transport = AsyncStubTransport(FakeResponse(503), FakeResponse(200))
+        with self.assertRaises(exceptions.ServerError):
+            self.request(transport, 'POST', json={})
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_network_error_once_retries_run_out(self) -> None:
+        transport = AsyncStubTransport(*(network_error() for _ in range(3)))
+        with self.assertRaises(exceptions.NetworkError):
+            self.request(transport, 'GET')
+        self.assertEqual(len(transport.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient, exceptions
+from amcards.dedupe import DuplicateIndex
+
+
+SHIPPING_ADDRESS = {
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal_code': '48075',
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class FakeSendApi:
+    """Answers card sends, the ``n``-th of ``count`` cards taking ``count - n`` ticks so later cards complete first."""
+    def __init__(self, count: int, status_code: int = 200) -> None:
+        self.sent = []
+        self.in_flight = self.max_in_flight = 0
+        self._count = count
+        self._status_code = status_code
+        self._lock = threading.Lock()
+
+    def start(self, idempotency_key: str) -> float:
+        with self._lock:
+            self.sent.append(idempotency_key)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return 0.01 * (self._count - int(idempotency_key.removeprefix('evt_')))
+
+    def response(self) -> FakeResponse:
+        with self._lock:
+            self.in_flight -= 1
+        return FakeResponse(self._status_code, {'card': 1522873, 'total_cost': 442, 'user': 'example@example.com', 'message': 'Card created'})
+
+    def request(self, method: str, path: str, idempotency_key: str = None, **kwargs) -> FakeResponse:
+        time.sleep(self.start(idempotency_key))
+        return self.response()
+
+    async def async_request(self, method: str, path: str, idempotency_key: str = None, **kwargs) -> FakeResponse:
+        await asyncio.sleep(self.start(idempotency_key))
+        return self.response()
+
+
+def cards(count: int) -> list:
+    return [{'template_id': '123', 'initiator': 'crm', 'shipping_address': SHIPPING_ADDRESS | {'first_name': f'Ralph {i}'}, 'idempotency_key': f'evt_{i}'} for i in range(count)]
+
+
+class SendCardStreamTest(unittest.TestCase):
+    def stream(self, api: FakeSendApi, cards, duplicate_index: DuplicateIndex = None, **kwargs) -> list:
+        client = AMcardsClient('token', duplicate_index=duplicate_index)
+        client._request = api.request
+        return list(client.send_card_stream(cards, **kwargs))
+
+    def async_stream(self, api: FakeSendApi, cards, duplicate_index: DuplicateIndex = None, **kwargs) -> list:
+        async def stream() -> list:
+            client = AsyncAMcardsClient('token', duplicate_index=duplicate_index)
+            client._request = api.async_request
+            return [result async for result in client.send_card_stream(cards, **kwargs)]
+        return asyncio.run(stream())
+
+    def test_every_card_is_sent_with_at_most_max_in_flight_requests(self) -> None:
+        for stream in (self.stream, self.async_stream):
+            api = FakeSendApi(12)
+            results = stream(api, cards(12), max_in_flight=3)
+            self.assertEqual(sorted(result.index for result in results), list(range(12)))
+            self.assertTrue(all(result.ok and result.response.card_id == 1522873 for result in results))
+            self.assertEqual(sorted(api.sent), sorted(card['idempotency_key'] for card in cards(12)))
+            self.assertEqual(api.max_in_flight, 3)
+
+    def test_results_are_yielded_as_completed_unless_ordered(self) -> None:
+        for stream in (self.stream, self.async_stream):
+            unordered = [result.index for result in stream(FakeSendApi(6), cards(6), max_in_flight=6)]
+            self.assertEqual(unordered, [5, 4, 3, 2, 1, 0])
+            ordered = [result.index for result in stream(FakeSendApi(6), cards(6), max_in_flight=6, ordered=True)]
+            self.assertEqual(ordered, [0, 1, 2, 3, 4, 5])
+
+    def test_invalid_cards_fail_without_a_request(self) -> None:
+        rows = cards(4)
+        rows[1] = rows[1] | {'shipping_address': SHIPPING_ADDRESS | {'city': ''}}
+        rows[2] = {key: value for key, value in rows[2].items() if key != 'initiator'}
+        rows[3] = rows[3] | {'colour': 'blue'}
+        for stream in (self.stream, self.async_stream):
+            api = FakeSendApi(4)
+            errors = {result.index: type(result.error) for result in stream(api, rows)}
+            self.assertEqual(errors, {0: type(None), 1: exceptions.ShippingAddressError, 2: exceptions.CardSendError, 3: exceptions.CardSendError})
+            self.assertEqual(api.sent, ['evt_0'])
+
+    def test_duplicate_in_flight_is_not_sent(self) -> None:
+        rows = cards(3)
+        rows[2] = rows[0] | {'idempotency_key': 'evt_2'}
+        for stream in (self.stream, self.async_stream):
+            api = FakeSendApi(3)
+            errors = {result.index: type(result.error) for result in stream(api, rows, duplicate_index=DuplicateIndex())}
+            self.assertEqual(errors, {0: type(None), 1: type(None), 2: exceptions.DuplicateCardError})
+            self.assertEqual(sorted(api.sent), ['evt_0', 'evt_1'])
+
+    def test_cards_are_read_as_results_are_consumed(self) -> None:
+        read = []
+
+        def rows():
+            for card in cards(40):
+                read.append(card)
+                yield card
+        client = AMcardsClient('token')
+        client._request = FakeSendApi(40).request
+        stream = client.send_card_stream(rows(), max_in_flight=2)
+        next(stream)
+        self.assertLessEqual(len(read), 5)
+        stream.close()
+
+    def test_authentication_error_stops_the_stream(self) -> None:
+        for stream in (self.stream, self.async_stream):
+            with self.assertRaises(exceptions.AuthenticationError):
+                stream(FakeSendApi(4, status_code=401), cards(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from amcards import AMcardsClient, AsyncAMcardsClient
+from amcards.models import CardStatus
+from amcards.sync import CardSync, JSONSyncStore, SQLiteSyncStore
+
+
+def card_json(id: int, status: int, last_modified: str) -> dict:
+    return {'id': id, 'status': status, 'created': '2022-11-01T13:45:12', 'last_modified': last_modified, 'fulfilled': None, 'extra_data': '{}'}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, json: dict = None) -> None:
+        self.status_code = status_code
+        self.text = ''
+        self.headers = {}
+        self._json = json or {}
+
+    def json(self) -> dict:
+        return self._json
+
+
+class SyncStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def assert_round_trip(self, open_store) -> None:
+        store = open_store()
+        self.assertIsNone(store.watermark())
+        store.save('2022-11-03T17:30:00', {1: (CardStatus.DELIVERED.value, '2022-11-03T17:30:00'), 2: (CardStatus.PROCESSING.value, '2022-11-02T09:01:44')})
+        store.save('2022-11-04T08:15:59.500000', {2: (CardStatus.IN_THE_MAIL.value, '2022-11-04T08:15:59.500000')})
+        getattr(store, 'close', lambda: None)()
+
+        store = open_store()
+        self.assertEqual(store.watermark(), '2022-11-04T08:15:59.500000')
+        self.assertEqual(store.card_states([1, 2, 3]), {
+            1: (CardStatus.DELIVERED.value, '2022-11-03T17:30:00'),
+            2: (CardStatus.IN_THE_MAIL.value, '2022-11-04T08:15:59.500000'),
+        })
+        getattr(store, 'close', lambda: None)()
+
+    def test_json_store_round_trip(self) -> None:
+        self.assert_round_trip(lambda: JSONSyncStore(os.path.join(self.directory, 'sync.json')))
+
+    def test_sqlite_store_round_trip(self) -> None:
+        self.assert_round_trip(lambda: SQLiteSyncStore(os.path.join(self.directory, 'sync.db')))
+
+
+class CardSyncTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cards = [card_json(1, CardStatus.PROCESSING.value, '2022-11-01T13:45:12'), card_json(2, CardStatus.PROCESSING.value, '2022-11-02 09:01:44')]
+        self.filters = []
+        client = AMcardsClient('token')
+
+        def request(method: str, path: str, params: dict = None, **kwargs) -> FakeResponse:
+            self.filters.append(params.get('last_modified__gte'))
+            return FakeResponse(200, {'objects': self.cards[params['offset']:params['offset'] + params['limit']]})
+        client._request = request
+        self.sync = CardSync(client, page_size=1)
+
+    def changes(self) -> list:
+        return [(change.card.id, change.old_status, change.new_status) for change in self.sync.changes()]
+
+    def test_only_changes_since_the_watermark_are_reported(self) -> None:
+        self.assertEqual(self.changes(), [(1, None, CardStatus.PROCESSING), (2, None, CardStatus.PROCESSING)])
+        self.assertEqual(self.sync.watermark.isoformat(), '2022-11-02T09:01:44')
+
+        self.cards[1] = card_json(2, CardStatus.IN_THE_MAIL.value, '2022-11-03T17:30:00')
+        self.filters.clear()
+        self.assertEqual(self.changes(), [(2, CardStatus.PROCESSING, CardStatus.IN_THE_MAIL)])
+        self.assertEqual(self.filters[0], '2022-11-02T08:51:44')
+        self.assertEqual(self.sync.watermark.isoformat(), '2022-11-03T17:30:00')
+
+    def test_async_client_is_rejected(self) -> None:
+        with self.assertRaises(TypeError):
+            CardSync(AsyncAMcardsClient('token'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import asyncio
+import gc
+import unittest
+
+from amcards.transport import shared_async_transport, _shared_async_transports
+
+
+class SharedAsyncTransportTest(unittest.TestCase):
+    def test_shared_per_loop_and_closed_with_it(self) -> None:
+        async def main():
+            transport = shared_async_transport('https://amcards.com')
+            self.assertIs(shared_async_transport('https://amcards.com'), transport)
+            self.assertIsNot(shared_async_transport('https://example.com'), transport)
+            self.assertFalse(transport._client.is_closed)
+            return transport
+
+        first, second = asyncio.run(main()), asyncio.run(main())
+        self.assertIsNot(first, second)
+        self.assertTrue(first._client.is_closed)
+        self.assertTrue(second._client.is_closed)
+        # Nothing keeps the closed loops alive
+        gc.collect()
+        self.assertEqual(len(_shared_async_transports), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from types import MappingProxyType
+
+from amcards import __helpers as helpers, exceptions
+from amcards.amcards import _validate_shipping_address, _validate_campaign_recipient
+from amcards.validation import validate_addresses
+
+
+VALID = {
+    'first_name': 'Ralph',
+    'last_name': 'Mullins',
+    'address_line_1': '2285 Reppert Road',
+    'city': 'Southfield',
+    'state': 'MI',
+    'postal_code': '48075',
+}
+
+ADDRESSES = [
+    VALID,
+    VALID | {'country': 'US', 'phone_number': '5556667777', 'birth_date': '12-25', 'anniversary_date': '2003-12-25'},
+    {key: value for key, value in VALID.items() if key != 'city'},
+    VALID | {'state': '   ', 'postal_code': None},
+    VALID | {'birth_date': '2003-13-25'},
+    VALID | {'anniversary_date': '12-25'},
+    VALID | {'phone_number': '555-666-7777'},
+    VALID | {'phone_number': '', 'birth_date': None},
+    VALID | {'city': '', 'birth_date': 'Christmas', 'phone_number': '555'},
+]
+
+
+def per_address_errors(addresses: list, kind: str) -> dict:
+    # Validates the addresses one by one, the way send_card and send_campaign do
+    errors = {}
+    sanitize = helpers.sanitize_shipping_address_for_card_send if kind == 'card' else helpers.sanitize_shipping_address_for_campaign_send
+    for index, address in enumerate(addresses):
+        try:
+            _validate_shipping_address(address)
+            if kind == 'campaign':
+                _validate_campaign_recipient(sanitize(address), quote_values=False)
+        except exceptions.AMcardsException as e:
+            errors[index] = e
+    return errors
+
+
+class ValidateAddressesTest(unittest.TestCase):
+    def test_matches_per_address_validation(self) -> None:
+        for kind in ('card', 'campaign'):
+            with self.subTest(kind=kind):
+                expected = per_address_errors(ADDRESSES, kind)
+                batch = validate_addresses(ADDRESSES, kind, normalize=False)
+                self.assertEqual(batch.invalid, sorted(expected))
+                for index, error in expected.items():
+                    errors = [error for error in batch.errors if error.index == index]
+                    if isinstance(error, exceptions.ShippingAddressError):
+                        missings = [error.field for error in errors if error.field in helpers.REQUIRED_SHIPPING_ADDRESS_FIELDS]
+                        # Listed in the iteration order of a set
+                        prefix, fields = str(error).split(': ')
+                        self.assertEqual(prefix, 'Missing the following required shipping address fields')
+                        self.assertEqual(sorted(fields.split(', ')), sorted(missings))
+                    else:
+                        self.assertIn(str(error), [error.message for error in errors])
+
+    def test_accepts_any_mapping(self) -> None:
+        batch = validate_addresses([MappingProxyType(address) for address in ADDRESSES], 'campaign', normalize=False)
+        self.assertEqual(batch.errors, validate_addresses(ADDRESSES, 'campaign', normalize=False).errors)
+
+
+if __name__ == '__main__':
+    unittest.main()